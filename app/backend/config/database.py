@@ -4,8 +4,16 @@ from sqlalchemy.orm import sessionmaker
 
 from app.backend.config.settings import settings
 
-# Criar engine do SQLAlchemy
-engine = create_engine(settings.DATABASE_URL)
+
+def _engine_options() -> dict:
+    # O SQLite (testes e desenvolvimento) não usa pool de conexões
+    if settings.database.url.startswith("sqlite"):
+        return {}
+    return {"pool_size": settings.database.pool_size, "max_overflow": settings.database.max_overflow}
+
+
+# Criar engine do SQLAlchemy (um pool por worker: o engine é recriado após o fork)
+engine = create_engine(settings.database.url, **_engine_options())
 
 # Criar sessão
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
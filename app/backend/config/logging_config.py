@@ -0,0 +1,131 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+from app.backend.config.settings import settings
+from app.backend.services.tracing_service import TRACE_LOGGER_NAME, current_request_id
+
+# Atributos padrão de LogRecord; os demais (passados via extra=) vão para o JSON
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener = None
+_listener_pid = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formata cada registro como uma linha JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.utcfromtimestamp(record.created).isoformat(timespec="milliseconds") + "Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "pid": record.process,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Mantém apenas uma fração dos eventos DEBUG, descartados antes de entrar na fila."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.DEBUG or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+class RequestIdFilter(logging.Filter):
+    """Anexa o id da requisição atual ao registro (lido na thread de origem, antes da fila)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        request_id = current_request_id()
+        if request_id is not None:
+            record.request_id = request_id
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler que não formata a mensagem na thread da requisição.
+
+    O QueueHandler padrão chama format() em prepare(); aqui o registro é
+    enfileirado com msg/args intactos e toda a formatação (inclusive de
+    tracebacks) é feita pela thread do QueueListener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _configured_level_name() -> str:
+    return (settings.logging.level or "").strip().upper()
+
+
+def _log_level() -> int:
+    """Nível de LOG_LEVEL; um nome desconhecido vale INFO (e é avisado em setup_logging)."""
+    name = _configured_level_name()
+    if name:
+        return logging._nameToLevel.get(name, logging.INFO)
+    return logging.DEBUG if settings.debug else logging.INFO
+
+
+def setup_logging():
+    """
+    Configura o logging da aplicação com escrita fora do caminho da requisição.
+
+    Idempotente por processo: após um fork (workers do gunicorn com preload)
+    a thread do listener não existe no filho, então fila e listener são recriados.
+    """
+    global _listener, _listener_pid
+    if _listener is not None and _listener_pid == os.getpid():
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    if settings.logging.json_format:
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+
+    handlers = [output]
+    if settings.tracing.file:
+        # Spans vão apenas para o arquivo de traces, fora da saída padrão
+        trace_output = logging.FileHandler(settings.tracing.file)
+        trace_output.setFormatter(JsonFormatter())
+        trace_output.addFilter(logging.Filter(TRACE_LOGGER_NAME))
+        output.addFilter(lambda record: record.name != TRACE_LOGGER_NAME)
+        handlers.append(trace_output)
+
+    log_queue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    handler.addFilter(DebugSamplingFilter(settings.logging.debug_sample_rate))
+    handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(_log_level())
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    _listener_pid = os.getpid()
+    atexit.register(_listener.stop)
+
+    if _configured_level_name() and _configured_level_name() not in logging._nameToLevel:
+        logging.getLogger(__name__).warning("LOG_LEVEL desconhecido: %s; usando INFO", settings.logging.level)
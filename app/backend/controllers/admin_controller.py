@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, Dict, List
+
+from app.backend.middleware.auth_middleware import check_permission
+from app.backend.services.profiling_service import list_profiles
+
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["admin"],
+    responses={401: {"description": "Não autorizado"}},
+)
+
+
+@router.get("/profiles")
+def read_profiles(_ = Depends(check_permission("admin"))) -> List[Dict[str, Any]]:
+    """Lista os perfis de requisição mais recentes (sem o relatório completo)."""
+    return [
+        {key: value for key, value in entry.items() if key != "stats"}
+        for entry in list_profiles()
+    ]
+
+
+@router.get("/profiles/{profile_id}")
+def read_profile(profile_id: str, _ = Depends(check_permission("admin"))) -> Dict[str, Any]:
+    """Retorna um perfil de requisição com o relatório do cProfile."""
+    for entry in list_profiles():
+        if entry["id"] == profile_id:
+            return entry
+    raise HTTPException(status_code=404, detail="Perfil de requisição não encontrado")
@@ -0,0 +1,80 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.backend.database.session import get_db
+from app.backend.middleware.auth_middleware import check_permission
+from app.backend.models.audit_log import AuditLog
+from app.backend.schemas.audit import AuditEntry
+from app.backend.utils.pagination import decode_cursor, encode_cursor
+from app.backend.utils.serialization import audit_to_dict, list_response
+
+router = APIRouter(
+    prefix="/api/audit",
+    tags=["audit"],
+    responses={401: {"description": "Não autorizado"}},
+)
+
+AUDIT_SORT_KEY = "created_at:desc"
+
+
+@router.get("/", response_model=List[AuditEntry])
+def read_audit_log(
+    actor: Optional[str] = None,
+    target_type: Optional[str] = None,
+    target_id: Optional[str] = None,
+    action: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    _ = Depends(check_permission("audit:read"))
+):
+    """
+    Consulta a trilha de auditoria, do registro mais recente para o mais antigo.
+
+    Os filtros por autor e por alvo usam os índices (actor, created_at) e
+    (target_type, target_id, created_at); since/until limitam as partições lidas.
+    O cursor da próxima página é devolvido no cabeçalho X-Next-Cursor.
+    """
+    if target_id and not target_type:
+        # O índice é (target_type, target_id, created_at): o id sozinho não identifica o alvo
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="O filtro target_id exige target_type",
+        )
+
+    query = db.query(AuditLog)
+    if actor:
+        query = query.filter(AuditLog.actor == actor)
+    if target_type:
+        query = query.filter(AuditLog.target_type == target_type)
+    if target_id:
+        query = query.filter(AuditLog.target_id == target_id)
+    if action:
+        query = query.filter(AuditLog.action == action)
+    if since:
+        query = query.filter(AuditLog.created_at >= since)
+    if until:
+        query = query.filter(AuditLog.created_at < until)
+
+    if cursor:
+        position = decode_cursor(cursor, AUDIT_SORT_KEY)
+        query = query.filter(or_(
+            AuditLog.created_at < position["v"],
+            and_(AuditLog.created_at == position["v"], AuditLog.id < position["id"])
+        ))
+
+    entries = query.order_by(AuditLog.created_at.desc(), AuditLog.id.desc()).limit(limit + 1).all()
+
+    headers = {}
+    if len(entries) > limit:
+        entries = entries[:limit]
+        last = entries[-1]
+        headers["X-Next-Cursor"] = encode_cursor(AUDIT_SORT_KEY, last.created_at, last.id)
+
+    return list_response(entries, audit_to_dict, "read_audit_log", headers=headers)
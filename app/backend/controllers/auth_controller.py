@@ -1,20 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from datetime import timedelta
 from typing import Dict, Any
-from jose import JWTError, jwt
 import logging
-import traceback
 
 from app.backend.config.database import get_db
 from app.backend.config.settings import settings
 from app.backend.services.auth_service import (
     authenticate_user,
     create_access_token,
+    decode_token,
     get_current_active_user,
     get_user_permissions
 )
+from app.backend.middleware.auth_middleware import check_permission
+from app.backend.services.bootstrap_service import InactiveUser, build_bootstrap
+from app.backend.services.introspection_service import introspect_tokens
+from app.backend.services.login_telemetry_service import record_login
+from app.backend.services.revocation_service import revocation_list
+from app.backend.services.rate_limit_service import (
+    DirectoryOverloaded, directory_limiter, login_retry_after, record_login_failure
+)
+from app.backend.services.tracing_service import span
 from app.backend.models.user import User
 from app.backend.schemas.user import Token, User as UserSchema
 
@@ -32,23 +42,46 @@ router = APIRouter(
 
 def log_exception(e: Exception, context: str = ""):
     """Registra exceção com traceback completo"""
-    logger.error(f"ERRO no controlador de auth em {context}: {str(e)}")
-    logger.error(f"TRACEBACK: {''.join(traceback.format_exception(None, e, e.__traceback__))}")
+    logger.error("ERRO no controlador de auth em %s: %s", context, e, exc_info=e)
 
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
     """Endpoint para obter token de acesso via login."""
-    logger.debug(f"Tentativa de login para usuário: {form_data.username}")
+    logger.debug("Tentativa de login para usuário: %s", form_data.username)
+    client_ip = request.client.host if request.client else None
+
+    # Recusa o excesso antes de qualquer chamada ao AD ou ao bcrypt (Redis no pool de threads)
+    retry_after = await run_in_threadpool(login_retry_after, form_data.username, client_ip)
+    if retry_after is not None:
+        logger.warning("Login de %s (%s) recusado pelo limite de tentativas", form_data.username, client_ip)
+        record_login(form_data.username, success=False, client_ip=client_ip, error="rate_limited")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Muitas tentativas de login. Tente novamente mais tarde.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
     try:
         logger.debug("Chamando authenticate_user")
-        auth_result = authenticate_user(form_data.username, form_data.password)
-        logger.debug(f"Resultado da autenticação: {auth_result}")
+        async with directory_limiter.slot():
+            with span("auth.authenticate_user"):
+                # AD e bcrypt são bloqueantes: rodam no pool de threads, fora do event loop
+                auth_result = await run_in_threadpool(authenticate_user, form_data.username, form_data.password)
+        logger.debug("Resultado da autenticação: %s", auth_result)
         
         if not auth_result or not auth_result.get("authenticated", False):
-            logger.warning(f"Falha na autenticação para usuário: {form_data.username}")
+            logger.warning("Falha na autenticação para usuário: %s", form_data.username)
+            await run_in_threadpool(record_login_failure, form_data.username)
+            record_login(
+                form_data.username,
+                success=False,
+                client_ip=client_ip,
+                error=auth_result.get("error") if auth_result else None,
+            )
             error_message = auth_result.get("error", "Nome de usuário ou senha incorretos") if auth_result else "Nome de usuário ou senha incorretos"
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -56,7 +89,8 @@ async def login_for_access_token(
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        logger.info(f"Usuário {form_data.username} autenticado com sucesso via {auth_result.get('auth_type')}")
+        logger.info("Usuário %s autenticado com sucesso via %s", form_data.username, auth_result.get('auth_type'))
+        record_login(auth_result["username"], success=True, auth_type=auth_result.get("auth_type"), client_ip=client_ip)
         
         # Cria o payload do token
         logger.debug("Criando token de acesso")
@@ -69,7 +103,7 @@ async def login_for_access_token(
             },
             expires_delta=access_token_expires
         )
-        logger.debug(f"Token criado para usuário {form_data.username}")
+        logger.debug("Token criado para usuário %s", form_data.username)
         
         return {
             "access_token": access_token,
@@ -84,9 +118,16 @@ async def login_for_access_token(
     except HTTPException as he:
         # Repassa exceções HTTP
         raise he
+    except DirectoryOverloaded:
+        logger.warning("Login de %s recusado: limite de autenticações simultâneas atingido", form_data.username)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Serviço de autenticação sobrecarregado. Tente novamente em instantes.",
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         log_exception(e, f"login para {form_data.username}")
-        logger.error(f"Erro não tratado durante login: {str(e)}")
+        logger.error("Erro não tratado durante login: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Erro interno durante autenticação",
@@ -99,12 +140,14 @@ async def read_users_me(
 ):
     """Retorna informações do usuário atual."""
     logger.debug("Solicitação para /me recebida")
+    from jose import JWTError
+
     try:
         # Decodifica o token
         logger.debug("Decodificando token JWT")
-        payload = jwt.decode(token, settings.auth.secret_key, algorithms=[settings.auth.algorithm])
+        payload = decode_token(token)
         username = payload.get("sub")
-        logger.debug(f"Token decodificado para usuário: {username}")
+        logger.debug("Token decodificado para usuário: %s", username)
         
         # Retorna as informações do usuário
         user_info = {
@@ -113,10 +156,10 @@ async def read_users_me(
             "email": "admin@omnicorp.com" if username == "administrator" else f"{username}@omnicorp.com",
             "groups": payload.get("groups", ["Usuários"])
         }
-        logger.debug(f"Retornando informações do usuário: {user_info}")
+        logger.debug("Retornando informações do usuário: %s", user_info)
         return user_info
     except JWTError as e:
-        logger.error(f"Erro JWT: {str(e)}")
+        logger.error("Erro JWT: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token inválido",
@@ -128,4 +171,115 @@ async def read_users_me(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Erro interno ao processar o token",
             headers={"WWW-Authenticate": "Bearer"},
-        ) 
\ No newline at end of file
+        )
+
+@router.get("/bootstrap")
+async def bootstrap(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    """
+    Dados iniciais do frontend em uma única chamada: usuário, permissões
+    efetivas, módulos acessíveis e versões dos catálogos.
+
+    Substitui a sequência /me, /api/modules/ e lista de perfis após o login;
+    o token é decodificado uma única vez.
+    """
+    from jose import JWTError
+
+    try:
+        payload = decode_token(token)
+    except JWTError as e:
+        logger.error("Erro JWT: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if not payload.get("sub"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    try:
+        data = await build_bootstrap(db, payload)
+    except InactiveUser:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuário inativo ou inexistente",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except Exception as e:
+        log_exception(e, "endpoint /bootstrap")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao carregar os dados iniciais",
+        )
+    return ORJSONResponse(data, headers={"Cache-Control": "private, no-store"})
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(token: str = Depends(oauth2_scheme)):
+    """Revoga o token atual; ele deixa de ser aceito em todos os workers."""
+    from jose import JWTError
+
+    try:
+        payload = decode_token(token)
+    except JWTError:
+        # Token já inválido, expirado ou revogado: nada a fazer
+        return None
+
+    jti = payload.get("jti")
+    if not jti:
+        # Tokens emitidos antes da inclusão do jti expiram naturalmente
+        logger.info("Logout de %s com token sem jti", payload.get("sub"))
+        return None
+
+    try:
+        revocation_list.revoke(jti, payload.get("exp"))
+    except Exception as e:
+        log_exception(e, "endpoint /logout")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Não foi possível revogar o token",
+        )
+    logger.info("Token de %s revogado", payload.get("sub"))
+    return None
+
+# Limite de tokens por chamada de introspecção em lote
+MAX_INTROSPECTION_TOKENS = 100
+
+@router.post("/introspect")
+async def introspect(
+    request: Request,
+    db: Session = Depends(get_db),
+    _ = Depends(check_permission("auth:introspect"))
+):
+    """
+    Introspecção de tokens no formato da RFC 7662, para serviços que não validam o JWT localmente.
+
+    Aceita o formulário padrão (token=...) ou JSON com "token" (resposta única)
+    ou "tokens" (lista; resposta {"results": [...]} na mesma ordem).
+    """
+    if request.headers.get("content-type", "").startswith("application/json"):
+        body = await request.json()
+    else:
+        body = dict(await request.form())
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=400, detail="Corpo da requisição inválido")
+
+    tokens = body.get("tokens")
+    if tokens is not None:
+        if not isinstance(tokens, list) or not all(isinstance(token, str) for token in tokens):
+            raise HTTPException(status_code=400, detail="'tokens' deve ser uma lista de strings")
+        if len(tokens) > MAX_INTROSPECTION_TOKENS:
+            raise HTTPException(status_code=400, detail=f"Máximo de {MAX_INTROSPECTION_TOKENS} tokens por chamada")
+        results = await run_in_threadpool(introspect_tokens, db, tokens)
+        return ORJSONResponse({"results": results}, headers={"Cache-Control": "no-store"})
+
+    token = body.get("token")
+    if not isinstance(token, str) or not token:
+        raise HTTPException(status_code=400, detail="Parâmetro 'token' obrigatório")
+    results = await run_in_threadpool(introspect_tokens, db, [token])
+    return ORJSONResponse(results[0], headers={"Cache-Control": "no-store"})
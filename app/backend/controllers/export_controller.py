@@ -0,0 +1,127 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Iterator, List
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.backend.config.database import SessionLocal
+from app.backend.models.user import User
+from app.backend.models.profile import Profile
+from app.backend.models.permission import Permission
+from app.backend.models.user_profiles import user_profiles
+from app.backend.models.profile_permission import profile_permissions
+from app.backend.middleware.auth_middleware import check_permission
+
+router = APIRouter(
+    prefix="/api/export",
+    tags=["export"],
+    responses={401: {"description": "Não autorizado"}},
+)
+
+# Quantidade de linhas lidas do cursor do servidor e enviadas por bloco
+EXPORT_CHUNK_SIZE = 1000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _stream_rows(statement, columns: List[str], fmt: str) -> Iterator[str]:
+    """
+    Executa a consulta com cursor no servidor e gera a saída em blocos.
+
+    A sessão é aberta dentro do gerador para durar exatamente o tempo da
+    transmissão; apenas um bloco de linhas fica em memória por vez.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(statement.execution_options(stream_results=True))
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == "csv":
+            writer.writerow(columns)
+
+        for rows in result.partitions(EXPORT_CHUNK_SIZE):
+            if fmt == "csv":
+                writer.writerows(rows)
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(dict(zip(columns, row)), default=_json_default))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+        # Garante o cabeçalho do CSV mesmo quando não há linhas
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
+
+
+def _export_response(statement, columns: List[str], fmt: str, name: str) -> StreamingResponse:
+    filename = f"{name}-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.{fmt}"
+    return StreamingResponse(
+        _stream_rows(statement, columns, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/users")
+def export_users(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    _ = Depends(check_permission("user:read"))
+):
+    """Exporta todos os usuários em NDJSON ou CSV."""
+    columns = [
+        "id", "username", "email", "full_name", "is_active", "is_ad_user",
+        "last_login", "created_at", "updated_at"
+    ]
+    statement = select(*[getattr(User, column) for column in columns]).order_by(User.id)
+    return _export_response(statement, columns, format, "users")
+
+
+@router.get("/profile-members")
+def export_profile_members(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    _ = Depends(check_permission("profile:read"))
+):
+    """Exporta a associação entre perfis e usuários."""
+    columns = ["profile_id", "profile_name", "user_id", "username"]
+    statement = (
+        select(Profile.id, Profile.name, User.id, User.username)
+        .select_from(user_profiles)
+        .join(Profile, Profile.id == user_profiles.c.profile_id)
+        .join(User, User.id == user_profiles.c.user_id)
+        .order_by(user_profiles.c.profile_id, user_profiles.c.user_id)
+    )
+    return _export_response(statement, columns, format, "profile-members")
+
+
+@router.get("/permission-grants")
+def export_permission_grants(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    _ = Depends(check_permission("permission:read"))
+):
+    """Exporta as permissões concedidas a cada perfil."""
+    columns = ["profile_id", "profile_name", "permission_id", "permission_name"]
+    statement = (
+        select(Profile.id, Profile.name, Permission.id, Permission.name)
+        .select_from(profile_permissions)
+        .join(Profile, Profile.id == profile_permissions.c.profile_id)
+        .join(Permission, Permission.id == profile_permissions.c.permission_id)
+        .order_by(profile_permissions.c.profile_id, profile_permissions.c.permission_id)
+    )
+    return _export_response(statement, columns, format, "permission-grants")
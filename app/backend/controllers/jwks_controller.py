@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+
+from app.backend.services.auth_service import uses_asymmetric_signing
+from app.backend.services.key_service import JWKS_MAX_AGE_SECONDS, key_store
+
+router = APIRouter(tags=["auth"])
+
+# Consumidores podem manter o JWKS em cache; uma chave nova é publicada antes de passar a assinar
+JWKS_CACHE_CONTROL = f"public, max-age={JWKS_MAX_AGE_SECONDS}"
+
+
+@router.get("/.well-known/jwks.json")
+def read_jwks(request: Request):
+    """Chaves públicas para validação local dos tokens por outros serviços."""
+    if not uses_asymmetric_signing():
+        return Response(b'{"keys":[]}', media_type="application/json")
+
+    body, etag = key_store.jwks()
+    headers = {"Cache-Control": JWKS_CACHE_CONTROL, "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
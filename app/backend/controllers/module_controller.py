@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.backend.config.database import get_db
-from app.backend.models.user import Module, Permission, User
+from app.backend.models.user import Module, Permission
 from app.backend.schemas.user import Module as ModuleSchema, ModuleCreate
-from app.backend.services.auth_service import (
-    get_current_active_user, 
-    get_user_permissions
-)
+from app.backend.middleware.auth_middleware import get_current_user, grants, resolve_permissions
+from app.backend.middleware.etag_middleware import bump_catalogs, cache_headers, catalog_etag
+from app.backend.services.identity_service import Identity
+from app.backend.services.audit_service import record_audit_async, snapshot
+from app.backend.services.module_service import get_accessible_modules, invalidate_module_menus
+from app.backend.utils.serialization import list_response
 
 router = APIRouter(
     prefix="/api/modules",
@@ -17,10 +19,9 @@ router = APIRouter(
 )
 
 
-def check_admin_permission(current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)):
+def check_admin_permission(current_user: Identity = Depends(get_current_user), db: Session = Depends(get_db)):
     """Verifica se o usuário tem permissão de administrador."""
-    permissions = get_user_permissions(db, current_user)
-    if "admin:all" not in permissions and "modules:write" not in permissions:
+    if not grants(resolve_permissions(current_user, db), "modules:write"):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Permissão negada para esta operação",
@@ -30,34 +31,20 @@ def check_admin_permission(current_user: User = Depends(get_current_active_user)
 
 @router.get("/", response_model=List[ModuleSchema])
 async def read_modules(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Identity = Depends(get_current_user),
+    etag: Optional[str] = Depends(catalog_etag("modules", get_current_user, per_user=True)),
+    db: Session = Depends(get_db)
 ):
-    """Retorna todos os módulos disponíveis."""
-    # Obtém as permissões do usuário
-    user_permissions = get_user_permissions(db, current_user)
-    
-    # Se for admin, retorna todos os módulos
-    if "admin:all" in user_permissions:
-        return db.query(Module).filter(Module.is_active == True).all()
-    
-    # Caso contrário, filtra por permissões
-    accessible_modules = []
-    modules = db.query(Module).filter(Module.is_active == True).all()
-    
-    for module in modules:
-        permission = db.query(Permission).filter(Permission.id == module.required_permission_id).first()
-        if permission and permission.name in user_permissions:
-            accessible_modules.append(module)
-    
-    return accessible_modules
+    """Retorna os módulos ativos liberados para o usuário (mesmas permissões de check_permission)."""
+    modules = get_accessible_modules(db, resolve_permissions(current_user, db))
+    return list_response(modules, dict, "read_modules", headers=cache_headers(etag))
 
 
 @router.post("/", response_model=ModuleSchema)
 async def create_module(
     module: ModuleCreate, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(check_admin_permission)
+    current_user: Identity = Depends(check_admin_permission)
 ):
     """Cria um novo módulo."""
     # Verifica se o nome do módulo já existe
@@ -83,6 +70,9 @@ async def create_module(
     db.add(new_module)
     db.commit()
     db.refresh(new_module)
+    invalidate_module_menus()
+    bump_catalogs("modules")
+    await record_audit_async(current_user, "create", "module", new_module.id, after=snapshot(new_module))
     return new_module
 
 
@@ -91,12 +81,13 @@ async def update_module(
     module_id: int, 
     module_data: ModuleCreate, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(check_admin_permission)
+    current_user: Identity = Depends(check_admin_permission)
 ):
     """Atualiza um módulo existente."""
     db_module = db.query(Module).filter(Module.id == module_id).first()
     if not db_module:
         raise HTTPException(status_code=404, detail="Módulo não encontrado")
+    before = snapshot(db_module)
     
     # Verifica se o nome já existe em outro módulo
     name_exists = db.query(Module).filter(Module.name == module_data.name, Module.id != module_id).first()
@@ -118,6 +109,9 @@ async def update_module(
     
     db.commit()
     db.refresh(db_module)
+    invalidate_module_menus()
+    bump_catalogs("modules")
+    await record_audit_async(current_user, "update", "module", module_id, before=before, after=snapshot(db_module))
     return db_module
 
 
@@ -125,13 +119,17 @@ async def update_module(
 async def delete_module(
     module_id: int, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(check_admin_permission)
+    current_user: Identity = Depends(check_admin_permission)
 ):
     """Remove um módulo existente."""
     db_module = db.query(Module).filter(Module.id == module_id).first()
     if not db_module:
         raise HTTPException(status_code=404, detail="Módulo não encontrado")
     
+    before = snapshot(db_module)
     db.delete(db_module)
     db.commit()
+    invalidate_module_menus()
+    bump_catalogs("modules")
+    await record_audit_async(current_user, "delete", "module", module_id, before=before)
     return None 
\ No newline at end of file
@@ -1,11 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.backend.database.session import get_db
 from app.backend.models.permission import Permission
+from app.backend.models.profile_permission import profile_permissions
+from app.backend.models.user_profiles import user_profiles
 from app.backend.schemas.permission import PermissionCreate, PermissionResponse
 from app.backend.middleware.auth_middleware import check_permission
+from app.backend.middleware.etag_middleware import bump_catalogs, cache_headers, catalog_etag
+from app.backend.services.audit_service import record_audit, snapshot
 from app.backend.services.redis_service import redis_service
+from app.backend.utils.serialization import list_response, permission_to_dict
 
 router = APIRouter()
 
@@ -13,7 +19,7 @@ router = APIRouter()
 def create_permission(
     permission: PermissionCreate,
     db: Session = Depends(get_db),
-    _ = Depends(check_permission("permission:create"))
+    current_user = Depends(check_permission("permission:create"))
 ):
     db_permission = Permission(
         name=permission.name,
@@ -22,14 +28,22 @@ def create_permission(
     db.add(db_permission)
     db.commit()
     db.refresh(db_permission)
+    bump_catalogs("permissions")
+    record_audit(current_user, "create", "permission", db_permission.id, after=snapshot(db_permission))
     return db_permission
 
+# Instância única: o FastAPI executa a verificação uma vez para o endpoint e para a ETag
+can_read_permissions = check_permission("permission:read")
+
 @router.get("/permissions", response_model=List[PermissionResponse])
 def list_permissions(
-    db: Session = Depends(get_db),
-    _ = Depends(check_permission("permission:read"))
+    _ = Depends(can_read_permissions),
+    etag: Optional[str] = Depends(catalog_etag("permissions", can_read_permissions)),
+    db: Session = Depends(get_db)
 ):
-    return db.query(Permission).all()
+    return list_response(
+        db.query(Permission).all(), permission_to_dict, "list_permissions", headers=cache_headers(etag)
+    )
 
 @router.get("/permissions/{permission_id}", response_model=PermissionResponse)
 def get_permission(
@@ -46,15 +60,28 @@ def get_permission(
 def delete_permission(
     permission_id: int,
     db: Session = Depends(get_db),
-    _ = Depends(check_permission("permission:delete"))
+    current_user = Depends(check_permission("permission:delete"))
 ):
     permission = db.query(Permission).filter(Permission.id == permission_id).first()
     if not permission:
         raise HTTPException(status_code=404, detail="Permissão não encontrada")
         
-    # Limpa o cache de permissões
-    redis_service.delete_permission(permission_id)
+    # Perfis que concedem a permissão e os usuários que os possuem
+    profile_ids = list(db.execute(
+        select(profile_permissions.c.profile_id).where(profile_permissions.c.permission_id == permission_id)
+    ).scalars())
+    members = list(db.execute(
+        select(user_profiles.c.user_id).where(user_profiles.c.profile_id.in_(profile_ids)).distinct()
+    ).scalars()) if profile_ids else []
         
+    before = snapshot(permission)
     db.delete(permission)
     db.commit()
+
+    # Limpa o cache de permissões dos perfis afetados e dos seus membros
+    redis_service.delete_many_profile_permissions(profile_ids)
+    redis_service.delete_many_user_permissions(members)
+    # Perfis listam suas permissões, então os dois catálogos mudam
+    bump_catalogs("permissions", "profiles")
+    record_audit(current_user, "delete", "permission", permission_id, before=before)
     return {"message": "Permissão excluída com sucesso"} 
\ No newline at end of file
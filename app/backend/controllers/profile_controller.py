@@ -1,22 +1,43 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from typing import Iterable, List, Optional, Set
 from app.backend.database.session import get_db
 from app.backend.models.profile import Profile
 from app.backend.models.permission import Permission
 from app.backend.models.user import User
-from app.backend.schemas.profile import ProfileCreate, ProfileUpdate, ProfileResponse
+from app.backend.models.user_profiles import user_profiles
+from app.backend.models.profile_permission import profile_permissions
+from app.backend.schemas.profile import (
+    ProfileCreate, ProfileUpdate, ProfileResponse, ProfileIdList, ProfileIdDiff, ProfileBulkResult
+)
 from app.backend.schemas.permission import PermissionCreate, PermissionResponse
 from app.backend.middleware.auth_middleware import check_permission
+from app.backend.middleware.etag_middleware import bump_catalogs, cache_headers, catalog_etag
+from app.backend.services.audit_service import record_audit, snapshot
+from app.backend.services.identity_service import invalidate_identities
 from app.backend.services.redis_service import redis_service
+from app.backend.utils.serialization import list_response, profile_to_dict
 
 router = APIRouter()
 
+def _profile_members(db: Session, profile_id: int) -> List[int]:
+    return list(db.execute(
+        select(user_profiles.c.user_id).where(user_profiles.c.profile_id == profile_id)
+    ).scalars())
+
+def _invalidate_profile_permissions(profile_id: int, members: List[int]):
+    """Limpa o cache de permissões do perfil e as permissões e identidades dos seus membros."""
+    redis_service.delete_profile_permissions(profile_id)
+    redis_service.delete_many_user_permissions(members)
+    invalidate_identities(members)
+    bump_catalogs("profiles")
+
 @router.post("/profiles", response_model=ProfileResponse)
 def create_profile(
     profile: ProfileCreate,
     db: Session = Depends(get_db),
-    _ = Depends(check_permission("profile:create"))
+    current_user = Depends(check_permission("profile:create"))
 ):
     db_profile = Profile(
         name=profile.name,
@@ -25,14 +46,21 @@ def create_profile(
     db.add(db_profile)
     db.commit()
     db.refresh(db_profile)
+    bump_catalogs("profiles")
+    record_audit(current_user, "create", "profile", db_profile.id, after=snapshot(db_profile))
     return db_profile
 
+# Instância única: o FastAPI executa a verificação uma vez para o endpoint e para a ETag
+can_read_profiles = check_permission("profile:read")
+
 @router.get("/profiles", response_model=List[ProfileResponse])
 def list_profiles(
-    db: Session = Depends(get_db),
-    _ = Depends(check_permission("profile:read"))
+    _ = Depends(can_read_profiles),
+    etag: Optional[str] = Depends(catalog_etag("profiles", can_read_profiles)),
+    db: Session = Depends(get_db)
 ):
-    return db.query(Profile).all()
+    profiles = db.query(Profile).options(selectinload(Profile.permissions)).all()
+    return list_response(profiles, profile_to_dict, "list_profiles", headers=cache_headers(etag))
 
 @router.get("/profiles/{profile_id}", response_model=ProfileResponse)
 def get_profile(
@@ -50,13 +78,16 @@ def update_profile(
     profile_id: int,
     profile: ProfileUpdate,
     db: Session = Depends(get_db),
-    _ = Depends(check_permission("profile:update"))
+    current_user = Depends(check_permission("profile:update"))
 ):
     db_profile = db.query(Profile).filter(Profile.id == profile_id).first()
     if not db_profile:
         raise HTTPException(status_code=404, detail="Perfil não encontrado")
         
-    for field, value in profile.dict(exclude_unset=True).items():
+    before = snapshot(db_profile)
+    changes = profile.dict(exclude_unset=True)
+    renamed = "name" in changes and changes["name"] != db_profile.name
+    for field, value in changes.items():
         setattr(db_profile, field, value)
         
     db.commit()
@@ -64,6 +95,11 @@ def update_profile(
     
     # Limpa o cache do perfil
     redis_service.delete_profile_permissions(profile_id)
+    bump_catalogs("profiles")
+    # O nome do perfil faz parte da identidade dos seus membros
+    if renamed:
+        invalidate_identities(_profile_members(db, profile_id))
+    record_audit(current_user, "update", "profile", profile_id, before=before, after=snapshot(db_profile))
     
     return db_profile
 
@@ -71,7 +107,7 @@ def update_profile(
 def delete_profile(
     profile_id: int,
     db: Session = Depends(get_db),
-    _ = Depends(check_permission("profile:delete"))
+    current_user = Depends(check_permission("profile:delete"))
 ):
     profile = db.query(Profile).filter(Profile.id == profile_id).first()
     if not profile:
@@ -79,9 +115,15 @@ def delete_profile(
         
     # Limpa o cache de permissões do perfil
     redis_service.delete_profile_permissions(profile_id)
+    members = _profile_members(db, profile_id)
+    before = snapshot(profile)
     
     db.delete(profile)
     db.commit()
+    bump_catalogs("profiles")
+    redis_service.delete_many_user_permissions(members)
+    invalidate_identities(members)
+    record_audit(current_user, "delete", "profile", profile_id, before={**before, "members": members})
     return {"message": "Perfil excluído com sucesso"}
 
 @router.post("/profiles/{profile_id}/permissions/{permission_id}")
@@ -89,7 +131,7 @@ def add_permission_to_profile(
     profile_id: int,
     permission_id: int,
     db: Session = Depends(get_db),
-    _ = Depends(check_permission("permission:manage"))
+    current_user = Depends(check_permission("permission:manage"))
 ):
     profile = db.query(Profile).filter(Profile.id == profile_id).first()
     if not profile:
@@ -101,10 +143,12 @@ def add_permission_to_profile(
         
     if permission not in profile.permissions:
         profile.permissions.append(permission)
+        members = _profile_members(db, profile_id)
         db.commit()
         
-        # Limpa o cache do perfil
-        redis_service.delete_profile_permissions(profile_id)
+        # O cache de permissões dos membros foi montado com o conjunto anterior
+        _invalidate_profile_permissions(profile_id, members)
+        record_audit(current_user, "grant_permission", "profile", profile_id, changes={"permission_id": permission_id})
         
     return {"message": "Permissão adicionada ao perfil com sucesso"}
 
@@ -113,7 +157,7 @@ def remove_permission_from_profile(
     profile_id: int,
     permission_id: int,
     db: Session = Depends(get_db),
-    _ = Depends(check_permission("permission:manage"))
+    current_user = Depends(check_permission("permission:manage"))
 ):
     profile = db.query(Profile).filter(Profile.id == profile_id).first()
     if not profile:
@@ -125,10 +169,12 @@ def remove_permission_from_profile(
         
     if permission in profile.permissions:
         profile.permissions.remove(permission)
+        members = _profile_members(db, profile_id)
         db.commit()
         
-        # Limpa o cache do perfil
-        redis_service.delete_profile_permissions(profile_id)
+        # O cache de permissões dos membros foi montado com o conjunto anterior
+        _invalidate_profile_permissions(profile_id, members)
+        record_audit(current_user, "revoke_permission", "profile", profile_id, changes={"permission_id": permission_id})
         
     return {"message": "Permissão removida do perfil com sucesso"}
 
@@ -137,7 +183,7 @@ def add_user_to_profile(
     profile_id: int,
     user_id: int,
     db: Session = Depends(get_db),
-    _ = Depends(check_permission("permission:manage"))
+    current_user = Depends(check_permission("permission:manage"))
 ):
     profile = db.query(Profile).filter(Profile.id == profile_id).first()
     if not profile:
@@ -151,8 +197,10 @@ def add_user_to_profile(
         user.profiles.append(profile)
         db.commit()
         
-        # Limpa o cache do usuário
+        # Limpa o cache e a identidade do usuário
         redis_service.delete_user_permissions(user_id)
+        invalidate_identities([user_id])
+        record_audit(current_user, "add_member", "profile", profile_id, changes={"user_id": user_id})
         
     return {"message": "Usuário adicionado ao perfil com sucesso"}
 
@@ -161,7 +209,7 @@ def remove_user_from_profile(
     profile_id: int,
     user_id: int,
     db: Session = Depends(get_db),
-    _ = Depends(check_permission("permission:manage"))
+    current_user = Depends(check_permission("permission:manage"))
 ):
     profile = db.query(Profile).filter(Profile.id == profile_id).first()
     if not profile:
@@ -175,7 +223,130 @@ def remove_user_from_profile(
         user.profiles.remove(profile)
         db.commit()
         
-        # Limpa o cache do usuário
+        # Limpa o cache e a identidade do usuário
         redis_service.delete_user_permissions(user_id)
+        invalidate_identities([user_id])
+        record_audit(current_user, "remove_member", "profile", profile_id, changes={"user_id": user_id})
         
-    return {"message": "Usuário removido do perfil com sucesso"} 
\ No newline at end of file
+    return {"message": "Usuário removido do perfil com sucesso"}
+
+def _lock_profile(db: Session, profile_id: int) -> Profile:
+    """Carrega o perfil com bloqueio de linha, serializando alterações concorrentes do conjunto."""
+    profile = db.query(Profile).filter(Profile.id == profile_id).with_for_update().first()
+    if not profile:
+        raise HTTPException(status_code=404, detail="Perfil não encontrado")
+    return profile
+
+def _ensure_exist(db: Session, model, ids: Iterable[int], detail: str):
+    ids = set(ids)
+    if not ids:
+        return
+    found = set(db.execute(select(model.id).where(model.id.in_(ids))).scalars())
+    missing = sorted(ids - found)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"{detail}: {missing}")
+
+def _apply_profile_set(
+    db: Session,
+    table,
+    column: str,
+    profile_id: int,
+    target: Optional[Set[int]] = None,
+    add: Iterable[int] = (),
+    remove: Iterable[int] = ()
+):
+    """
+    Aplica a diferença entre o conjunto atual e o desejado com INSERT/DELETE em lote.
+
+    Com target, o conjunto é substituído; caso contrário, add/remove são aplicados.
+    Retorna (ids adicionados, ids removidos).
+    """
+    current = set(db.execute(
+        select(table.c[column]).where(table.c.profile_id == profile_id)
+    ).scalars())
+
+    if target is not None:
+        to_add = target - current
+        to_remove = current - target
+    else:
+        to_add = set(add) - current
+        to_remove = (set(remove) & current) - set(add)
+
+    if to_add:
+        db.execute(table.insert(), [{"profile_id": profile_id, column: item} for item in sorted(to_add)])
+    if to_remove:
+        db.execute(table.delete().where(
+            table.c.profile_id == profile_id,
+            table.c[column].in_(to_remove)
+        ))
+    return to_add, to_remove
+
+def _update_profile_users(db: Session, profile_id: int, actor, **changes) -> dict:
+    _lock_profile(db, profile_id)
+    _ensure_exist(db, User, changes.get("target") or changes.get("add") or (), "Usuários não encontrados")
+    added, removed = _apply_profile_set(db, user_profiles, "user_id", profile_id, **changes)
+    db.commit()
+
+    # Limpa o cache e a identidade de todos os usuários afetados de uma só vez
+    redis_service.delete_many_user_permissions(added | removed)
+    invalidate_identities(added | removed)
+    if added or removed:
+        record_audit(actor, "update_members", "profile", profile_id, changes={
+            "added": sorted(added), "removed": sorted(removed)
+        })
+    return {"added": len(added), "removed": len(removed)}
+
+def _update_profile_permissions(db: Session, profile_id: int, actor, **changes) -> dict:
+    _lock_profile(db, profile_id)
+    _ensure_exist(db, Permission, changes.get("target") or changes.get("add") or (), "Permissões não encontradas")
+    added, removed = _apply_profile_set(db, profile_permissions, "permission_id", profile_id, **changes)
+    members = _profile_members(db, profile_id)
+    db.commit()
+
+    # Limpa o cache do perfil e dos usuários que o possuem
+    if added or removed:
+        _invalidate_profile_permissions(profile_id, members)
+        record_audit(actor, "update_permissions", "profile", profile_id, changes={
+            "added": sorted(added), "removed": sorted(removed)
+        })
+    return {"added": len(added), "removed": len(removed)}
+
+@router.put("/profiles/{profile_id}/users", response_model=ProfileBulkResult)
+def replace_profile_users(
+    profile_id: int,
+    payload: ProfileIdList,
+    db: Session = Depends(get_db),
+    current_user = Depends(check_permission("permission:manage"))
+):
+    """Substitui todos os usuários do perfil pela lista informada."""
+    return _update_profile_users(db, profile_id, current_user, target=set(payload.ids))
+
+@router.patch("/profiles/{profile_id}/users", response_model=ProfileBulkResult)
+def update_profile_users(
+    profile_id: int,
+    payload: ProfileIdDiff,
+    db: Session = Depends(get_db),
+    current_user = Depends(check_permission("permission:manage"))
+):
+    """Adiciona e remove usuários do perfil em uma única transação."""
+    return _update_profile_users(db, profile_id, current_user, add=payload.add, remove=payload.remove)
+
+@router.put("/profiles/{profile_id}/permissions", response_model=ProfileBulkResult)
+def replace_profile_permissions(
+    profile_id: int,
+    payload: ProfileIdList,
+    db: Session = Depends(get_db),
+    current_user = Depends(check_permission("permission:manage"))
+):
+    """Substitui todas as permissões do perfil pela lista informada."""
+    return _update_profile_permissions(db, profile_id, current_user, target=set(payload.ids))
+
+@router.patch("/profiles/{profile_id}/permissions", response_model=ProfileBulkResult)
+def update_profile_permissions(
+    profile_id: int,
+    payload: ProfileIdDiff,
+    db: Session = Depends(get_db),
+    current_user = Depends(check_permission("permission:manage"))
+):
+    """Adiciona e remove permissões do perfil em uma única transação."""
+    return _update_profile_permissions(db, profile_id, current_user, add=payload.add, remove=payload.remove)
@@ -4,6 +4,7 @@ from typing import List
 
 from app.backend.database.session import get_db
 from app.backend.models.role import Role, Permission
+from app.backend.middleware.etag_middleware import bump_catalogs
 from app.backend.schemas.role import RoleCreate, RoleUpdate, RoleOut, PermissionCreate, PermissionOut
 from app.backend.services.role_service import (
     create_role,
@@ -23,7 +24,9 @@ router = APIRouter(
 
 @router.post("/", response_model=RoleOut, status_code=status.HTTP_201_CREATED)
 def create_new_role(role: RoleCreate, db: Session = Depends(get_db)):
-    return create_role(db=db, role=role)
+    db_role = create_role(db=db, role=role)
+    bump_catalogs("roles")
+    return db_role
 
 @router.get("/", response_model=List[RoleOut])
 def read_roles(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
@@ -39,11 +42,14 @@ def read_role(role_id: int, db: Session = Depends(get_db)):
 
 @router.put("/{role_id}", response_model=RoleOut)
 def update_existing_role(role_id: int, role: RoleUpdate, db: Session = Depends(get_db)):
-    return update_role(db=db, role_id=role_id, role=role)
+    db_role = update_role(db=db, role_id=role_id, role=role)
+    bump_catalogs("roles", "modules")
+    return db_role
 
 @router.delete("/{role_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_existing_role(role_id: int, db: Session = Depends(get_db)):
     delete_role(db=db, role_id=role_id)
+    bump_catalogs("roles", "modules")
     return
 
 @router.post("/permissions/", response_model=PermissionOut, status_code=status.HTTP_201_CREATED)
@@ -1,17 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional
 
 from app.backend.config.database import get_db
 from app.backend.models.user import User, Role
-from app.backend.schemas.user import User as UserSchema, UserCreate, UserUpdate, Role as RoleSchema
-from app.backend.services.auth_service import (
-    get_current_active_user, 
-    get_password_hash, 
-    get_user_permissions
+from app.backend.models.user_profiles import user_profiles
+from app.backend.schemas.user import (
+    User as UserSchema, UserCreate, UserUpdate, Role as RoleSchema, UserImportResult
 )
-from app.backend.middleware.auth_middleware import check_permission
+from app.backend.services.auth_service import get_password_hash
+from app.backend.middleware.auth_middleware import (
+    ALL_PERMISSIONS,
+    check_permission,
+    get_current_user,
+    grants,
+    resolve_permissions
+)
+from app.backend.middleware.etag_middleware import bump_catalogs, cache_headers, catalog_etag
+from app.backend.repositories.user_repository import search_users as search_users_query, user_prefix_filter
+from app.backend.services.audit_service import record_audit, record_audit_async, snapshot
+from app.backend.services.identity_service import Identity, invalidate_identities
 from app.backend.services.redis_service import redis_service
+from app.backend.services.user_import_service import import_users
+from app.backend.utils.pagination import encode_cursor, decode_cursor
+from app.backend.utils.serialization import list_response, role_to_dict, user_to_dict
 
 router = APIRouter(
     prefix="/api/users",
@@ -20,10 +33,9 @@ router = APIRouter(
 )
 
 
-def check_admin_permission(current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)):
+def check_admin_permission(current_user: Identity = Depends(get_current_user), db: Session = Depends(get_db)):
     """Verifica se o usuário tem permissão de administrador."""
-    permissions = get_user_permissions(db, current_user)
-    if "admin:all" not in permissions and current_user.username != "administrator":
+    if not grants(resolve_permissions(current_user, db), ALL_PERMISSIONS):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Permissão negada para esta operação",
@@ -31,23 +43,98 @@ def check_admin_permission(current_user: User = Depends(get_current_active_user)
     return current_user
 
 
+# Colunas aceitas como chave de ordenação da listagem (todas indexadas)
+USER_SORT_COLUMNS = {
+    "id": User.id,
+    "username": User.username,
+    "created_at": User.created_at,
+}
+
+
 @router.get("/", response_model=List[UserSchema])
 async def read_users(
-    skip: int = 0, 
-    limit: int = 100, 
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    sort: str = Query("id", regex="^(id|username|created_at)$"),
+    order: str = Query("asc", regex="^(asc|desc)$"),
+    is_active: Optional[bool] = None,
+    is_ad_user: Optional[bool] = None,
+    profile_id: Optional[int] = None,
+    q: Optional[str] = Query(None, min_length=1, max_length=100),
+    db: Session = Depends(get_db),
+    current_user: Identity = Depends(check_permission("user:read"))
+):
+    """
+    Retorna a lista de usuários paginada por cursor (keyset).
+
+    O parâmetro q filtra por prefixo de username, email ou nome completo.
+
+    O cursor da próxima página é devolvido no cabeçalho X-Next-Cursor;
+    a ausência do cabeçalho indica que esta é a última página.
+    """
+    sort_column = USER_SORT_COLUMNS[sort]
+    sort_key = f"{sort}:{order}"
+    descending = order == "desc"
+
+    query = db.query(User).options(joinedload(User.role))
+    if is_active is not None:
+        query = query.filter(User.is_active == is_active)
+    if is_ad_user is not None:
+        query = query.filter(User.is_ad_user == is_ad_user)
+    if profile_id is not None:
+        query = query.join(user_profiles, user_profiles.c.user_id == User.id).filter(
+            user_profiles.c.profile_id == profile_id
+        )
+    if q:
+        query = query.filter(user_prefix_filter(q.strip()))
+
+    # Continua a partir da última linha da página anterior, sem OFFSET
+    if cursor:
+        position = decode_cursor(cursor, sort_key)
+        if sort_column is User.id:
+            query = query.filter(User.id < position["id"] if descending else User.id > position["id"])
+        elif descending:
+            query = query.filter(or_(
+                sort_column < position["v"],
+                and_(sort_column == position["v"], User.id < position["id"])
+            ))
+        else:
+            query = query.filter(or_(
+                sort_column > position["v"],
+                and_(sort_column == position["v"], User.id > position["id"])
+            ))
+
+    # O id desempata a ordenação, garantindo uma sequência estável
+    if descending:
+        query = query.order_by(sort_column.desc(), User.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), User.id.asc())
+
+    users = query.limit(limit + 1).all()
+    headers = {}
+    if len(users) > limit:
+        users = users[:limit]
+        last_user = users[-1]
+        headers["X-Next-Cursor"] = encode_cursor(sort_key, getattr(last_user, sort), last_user.id)
+    return list_response(users, user_to_dict, "read_users", headers=headers)
+
+
+@router.get("/search", response_model=List[UserSchema])
+async def search_users(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db),
-    current_user: User = Depends(check_admin_permission)
+    current_user: Identity = Depends(check_permission("user:read"))
 ):
-    """Retorna a lista de usuários."""
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+    """Busca usuários por relevância (autocompletar)."""
+    return list_response(search_users_query(db, q, limit), user_to_dict, "search_users")
 
 
 @router.get("/{user_id}", response_model=UserSchema)
 async def read_user(
     user_id: int, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(check_admin_permission)
+    current_user: Identity = Depends(check_admin_permission)
 ):
     """Retorna um usuário específico pelo ID."""
     user = db.query(User).filter(User.id == user_id).first()
@@ -60,7 +147,7 @@ async def read_user(
 async def create_user(
     user: UserCreate, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(check_admin_permission)
+    current_user: Identity = Depends(check_admin_permission)
 ):
     """Cria um novo usuário local."""
     db_user = db.query(User).filter(User.username == user.username).first()
@@ -90,21 +177,50 @@ async def create_user(
     
     # Limpa o cache de permissões do usuário
     redis_service.delete_user_permissions(new_user.id)
+    await record_audit_async(current_user, "create", "user", new_user.id, after=snapshot(new_user))
     
     return new_user
 
 
+@router.post("/import", response_model=UserImportResult)
+def import_users_file(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, regex="^(ndjson|csv)$"),
+    db: Session = Depends(get_db),
+    current_user: Identity = Depends(check_permission("user:create"))
+):
+    """Importa usuários em lote a partir de um arquivo CSV ou NDJSON."""
+    fmt = format or ("csv" if (file.filename or "").lower().endswith(".csv") else "ndjson")
+
+    viewer_role = db.query(Role).filter(Role.name == "viewer").first()
+    if not viewer_role:
+        raise HTTPException(status_code=500, detail="Perfil padrão 'viewer' não encontrado")
+
+    result = import_users(db, file.file, fmt, viewer_role.id)
+    record_audit(current_user, "import", "user", changes={
+        "file": file.filename,
+        "format": fmt,
+        "processed": result["processed"],
+        "imported": result["imported"],
+        "created": result["created"],
+        "updated": result["updated"],
+        "failed": result["failed"],
+    })
+    return result
+
+
 @router.put("/{user_id}", response_model=UserSchema)
 async def update_user(
     user_id: int, 
     user_update: UserUpdate, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(check_admin_permission)
+    current_user: Identity = Depends(check_admin_permission)
 ):
     """Atualiza um usuário existente."""
     db_user = db.query(User).filter(User.id == user_id).first()
     if db_user is None:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
+    before = snapshot(db_user)
     
     # Atualiza os campos
     if user_update.email is not None:
@@ -118,13 +234,20 @@ async def update_user(
         role = db.query(Role).filter(Role.id == user_update.role_id).first()
         if not role:
             raise HTTPException(status_code=400, detail="Perfil inválido")
+        role_changed = db_user.role_id != user_update.role_id
         db_user.role_id = user_update.role_id
     
     db.commit()
     db.refresh(db_user)
     
-    # Limpa o cache de permissões do usuário
+    # O menu de módulos depende do perfil do usuário
+    if user_update.role_id is not None and role_changed:
+        bump_catalogs("modules")
+    
+    # Limpa o cache de permissões e a identidade do usuário
     redis_service.delete_user_permissions(db_user.id)
+    invalidate_identities([db_user.id])
+    await record_audit_async(current_user, "update", "user", db_user.id, before=before, after=snapshot(db_user))
     
     return db_user
 
@@ -133,7 +256,7 @@ async def update_user(
 async def delete_user(
     user_id: int, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(check_admin_permission)
+    current_user: Identity = Depends(check_admin_permission)
 ):
     """Remove um usuário."""
     # Impede a exclusão do usuário administrador
@@ -149,17 +272,24 @@ async def delete_user(
     
     # Limpa o cache de permissões do usuário
     redis_service.delete_user_permissions(db_user.id)
+    before = snapshot(db_user)
     
     db.delete(db_user)
     db.commit()
+    invalidate_identities([user_id])
+    await record_audit_async(current_user, "delete", "user", user_id, before=before)
     return None
 
 
+# Instância única: o FastAPI executa a verificação uma vez para o endpoint e para a ETag
+can_read_roles = check_permission("user:read")
+
+
 @router.get("/roles/", response_model=List[RoleSchema])
 async def read_roles(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Identity = Depends(can_read_roles),
+    etag: Optional[str] = Depends(catalog_etag("roles", can_read_roles)),
+    db: Session = Depends(get_db)
 ):
     """Retorna a lista de perfis disponíveis."""
-    roles = db.query(Role).all()
-    return roles 
\ No newline at end of file
+    return list_response(db.query(Role).all(), role_to_dict, "read_roles", headers=cache_headers(etag))
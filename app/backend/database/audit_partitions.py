@@ -0,0 +1,77 @@
+"""
+Manutenção das partições mensais da tabela audit_log (MySQL).
+
+A tabela é particionada por RANGE (TO_DAYS(created_at)), com uma partição
+por mês (pAAAAMM) e a partição p_future recebendo o restante. As partições dos
+próximos meses são criadas a cada execução do comando de migração, e as
+anteriores ao período de retenção são removidas (DROP PARTITION é instantâneo,
+ao contrário de um DELETE).
+"""
+import logging
+from datetime import date
+from typing import List, Set
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+AUDIT_TABLE = "audit_log"
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"p{month:%Y%m}"
+
+
+def _existing_partitions(connection) -> Set[str]:
+    rows = connection.execute(text(
+        "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL"
+    ), {"table": AUDIT_TABLE})
+    return {row[0] for row in rows}
+
+
+def ensure_audit_partitions(connection, months_ahead: int = 3, today: date = None):
+    """Cria as partições do mês atual e dos próximos months_ahead meses."""
+    if connection.dialect.name != "mysql":
+        return
+    current = (today or date.today()).replace(day=1)
+    existing = _existing_partitions(connection)
+    if not existing:
+        # Tabela ainda sem particionamento (criada pela migração ou por create_all em bancos novos)
+        connection.execute(text(
+            f"ALTER TABLE {AUDIT_TABLE} PARTITION BY RANGE (TO_DAYS(created_at)) "
+            f"(PARTITION p_future VALUES LESS THAN MAXVALUE)"
+        ))
+        existing = {"p_future"}
+    for offset in range(months_ahead + 1):
+        month = _add_months(current, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        upper = _add_months(month, 1)
+        connection.execute(text(
+            f"ALTER TABLE {AUDIT_TABLE} REORGANIZE PARTITION p_future INTO ("
+            f"PARTITION {name} VALUES LESS THAN (TO_DAYS('{upper.isoformat()}')), "
+            f"PARTITION p_future VALUES LESS THAN MAXVALUE)"
+        ))
+        logger.info("Partição %s criada em %s", name, AUDIT_TABLE)
+
+
+def drop_expired_audit_partitions(connection, retention_months: int, today: date = None) -> List[str]:
+    """Remove as partições inteiramente anteriores ao período de retenção (0 mantém tudo)."""
+    if retention_months <= 0 or connection.dialect.name != "mysql":
+        return []
+    cutoff = partition_name(_add_months((today or date.today()).replace(day=1), -retention_months))
+    expired = sorted(
+        name for name in _existing_partitions(connection)
+        if name != "p_future" and name < cutoff
+    )
+    if expired:
+        connection.execute(text(f"ALTER TABLE {AUDIT_TABLE} DROP PARTITION {', '.join(expired)}"))
+        logger.info("Partições expiradas removidas de %s: %s", AUDIT_TABLE, expired)
+    return expired
@@ -0,0 +1,153 @@
+"""
+Criação/atualização do esquema e dados iniciais.
+
+Executado uma única vez por implantação (e não em cada worker):
+
+    python -m app.backend.database.migrate
+
+Um lock consultivo do MySQL impede que réplicas iniciadas ao mesmo tempo
+migrem ou populem o banco em paralelo.
+"""
+import logging
+from contextlib import contextmanager
+
+from alembic import command
+from sqlalchemy import inspect, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.dialects.mysql import insert
+
+from app.backend.config.database import engine
+from app.backend.config.settings import settings
+from app.backend.database.audit_partitions import drop_expired_audit_partitions, ensure_audit_partitions
+from app.backend.config.logging_config import setup_logging
+from app.backend.database.base_class import Base
+from app.backend.database.schema_version import alembic_config
+from app.backend.models.user import User, Role, Permission
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAME = "omnicorp:migrate"
+LOCK_TIMEOUT_SECONDS = 300
+# Última revisão cujo esquema equivale ao criado pelo antigo create_all na inicialização
+LEGACY_REVISION = "add_profile_permission_tables"
+
+INITIAL_ROLES = [
+    {"name": "admin", "description": "Administrador do sistema"},
+    {"name": "viewer", "description": "Usuário com permissões de visualização"},
+    {"name": "editor", "description": "Usuário com permissões de edição"}
+]
+
+INITIAL_PERMISSIONS = [
+    {"name": "admin:all", "description": "Acesso total ao sistema"},
+    {"name": "users:read", "description": "Visualizar usuários"},
+    {"name": "users:write", "description": "Gerenciar usuários"},
+    {"name": "modules:read", "description": "Visualizar módulos"},
+    {"name": "modules:write", "description": "Gerenciar módulos"}
+]
+
+
+@contextmanager
+def migration_lock():
+    """
+    Mantém um lock consultivo (GET_LOCK) enquanto o bloco é executado.
+
+    O lock pertence à sessão do MySQL: o bloco recebe a conexão que o detém e
+    todas as etapas da migração devem usá-la.
+    """
+    with engine.connect() as connection:
+        if engine.dialect.name != "mysql":
+            yield connection
+            return
+
+        acquired = connection.execute(
+            text("SELECT GET_LOCK(:name, :timeout)"),
+            {"name": LOCK_NAME, "timeout": LOCK_TIMEOUT_SECONDS}
+        ).scalar()
+        if acquired != 1:
+            raise RuntimeError(f"Não foi possível obter o lock de migração '{LOCK_NAME}'")
+        try:
+            yield connection
+        finally:
+            connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": LOCK_NAME})
+
+
+def upgrade_schema(connection: Connection):
+    """Aplica as migrações pendentes; bancos novos são criados direto na revisão mais recente."""
+    config = alembic_config()
+    # O env.py das migrações usa esta conexão em vez de abrir outra
+    config.attributes["connection"] = connection
+    tables = set(inspect(connection).get_table_names())
+
+    if "alembic_version" in tables:
+        command.upgrade(config, "head")
+    elif User.__tablename__ not in tables:
+        logger.info("Banco vazio: criando esquema completo")
+        Base.metadata.create_all(bind=connection)
+        command.stamp(config, "head")
+    else:
+        logger.info("Esquema legado sem versionamento: marcando %s e aplicando migrações", LEGACY_REVISION)
+        command.stamp(config, LEGACY_REVISION)
+        command.upgrade(config, "head")
+
+
+def seed_initial_data(connection: Connection):
+    """Cria perfis, permissões e o usuário administrator de forma idempotente."""
+    # Importado aqui para não carregar o passlib no processo dos workers
+    from app.backend.services.auth_service import get_password_hash
+
+    with connection.begin():
+        statement = insert(Role).values(INITIAL_ROLES)
+        connection.execute(statement.on_duplicate_key_update(name=statement.inserted.name))
+
+        statement = insert(Permission).values(INITIAL_PERMISSIONS)
+        connection.execute(statement.on_duplicate_key_update(name=statement.inserted.name))
+
+        admin_exists = connection.execute(
+            select(User.id).where(User.username == "administrator")
+        ).first()
+        if not admin_exists:
+            admin_role_id = connection.execute(select(Role.id).where(Role.name == "admin")).scalar()
+            connection.execute(insert(User).prefix_with("IGNORE").values(
+                username="administrator",
+                email="admin@omnicorp.local",
+                full_name="Administrador do Sistema",
+                hashed_password=get_password_hash("admin@123"),
+                is_ad_user=False,
+                role_id=admin_role_id
+            ))
+
+
+def maintain_audit_partitions(connection: Connection):
+    """Cria as partições futuras da auditoria e remove as que passaram do período de retenção."""
+    with connection.begin():
+        ensure_audit_partitions(connection, settings.audit.partitions_ahead)
+        drop_expired_audit_partitions(connection, settings.audit.retention_months)
+
+
+def ensure_token_signing_key():
+    """Gera a chave de assinatura dos tokens na implantação, antes dos workers subirem."""
+    from app.backend.services.auth_service import uses_asymmetric_signing
+    from app.backend.services.key_service import ensure_signing_key
+    if uses_asymmetric_signing():
+        ensure_signing_key(settings.auth.keys_dir)
+
+
+def bump_seeded_catalogs():
+    """Invalida as ETags dos catálogos que o seed pode ter alterado."""
+    from app.backend.middleware.etag_middleware import bump_catalogs
+    bump_catalogs("roles")
+
+
+def main():
+    with migration_lock() as connection:
+        upgrade_schema(connection)
+        seed_initial_data(connection)
+        maintain_audit_partitions(connection)
+        ensure_token_signing_key()
+    bump_seeded_catalogs()
+    logger.info("Migração e dados iniciais concluídos")
+
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
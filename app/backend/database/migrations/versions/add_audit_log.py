@@ -0,0 +1,44 @@
+"""add audit log
+
+Revision ID: add_audit_log
+Revises: add_login_events
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.backend.database.audit_partitions import ensure_audit_partitions
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_audit_log'
+down_revision = 'add_login_events'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'audit_log',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('actor_id', sa.Integer(), nullable=True),
+        sa.Column('actor', sa.String(length=100), nullable=False),
+        sa.Column('action', sa.String(length=50), nullable=False),
+        sa.Column('target_type', sa.String(length=50), nullable=False),
+        sa.Column('target_id', sa.String(length=64), nullable=True),
+        sa.Column('changes', sa.JSON(), nullable=True),
+        sa.Column('request_id', sa.String(length=64), nullable=True),
+        sa.PrimaryKeyConstraint('id', 'created_at')
+    )
+    op.create_index('ix_audit_log_created_at', 'audit_log', ['created_at'])
+    op.create_index('ix_audit_log_actor_created_at', 'audit_log', ['actor', 'created_at'])
+    op.create_index('ix_audit_log_target_created_at', 'audit_log', ['target_type', 'target_id', 'created_at'])
+
+    # Particionamento mensal; as partições dos próximos meses são mantidas por database/migrate.py
+    ensure_audit_partitions(op.get_bind())
+
+
+def downgrade():
+    op.drop_table('audit_log')
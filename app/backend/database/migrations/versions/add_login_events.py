@@ -0,0 +1,38 @@
+"""add login events
+
+Revision ID: add_login_events
+Revises: add_user_search_indexes
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_login_events'
+down_revision = 'add_user_search_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'login_events',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('username', sa.String(length=100), nullable=False),
+        sa.Column('success', sa.Boolean(), nullable=False),
+        sa.Column('auth_type', sa.String(length=20), nullable=True),
+        sa.Column('client_ip', sa.String(length=45), nullable=True),
+        sa.Column('error', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_login_events_created_at', 'login_events', ['created_at'])
+    op.create_index('ix_login_events_username_created_at', 'login_events', ['username', 'created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_login_events_username_created_at', table_name='login_events')
+    op.drop_index('ix_login_events_created_at', table_name='login_events')
+    op.drop_table('login_events')
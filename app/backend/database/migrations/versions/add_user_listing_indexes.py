@@ -0,0 +1,28 @@
+"""add user listing indexes
+
+Revision ID: add_user_listing_indexes
+Revises: add_profile_permission_tables
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_listing_indexes'
+down_revision = 'add_profile_permission_tables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Índices para a paginação por cursor (keyset) da listagem de usuários
+    op.create_index('ix_users_created_at', 'users', ['created_at'])
+    op.create_index('ix_users_is_active_username', 'users', ['is_active', 'username'])
+    op.create_index('ix_users_is_ad_user_username', 'users', ['is_ad_user', 'username'])
+
+
+def downgrade():
+    op.drop_index('ix_users_is_ad_user_username', table_name='users')
+    op.drop_index('ix_users_is_active_username', table_name='users')
+    op.drop_index('ix_users_created_at', table_name='users')
@@ -0,0 +1,34 @@
+"""add user search indexes
+
+Revision ID: add_user_search_indexes
+Revises: add_user_listing_indexes
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_search_indexes'
+down_revision = 'add_user_listing_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Índice de prefixo para buscas por início do nome completo
+    # (username e email já possuem índices únicos)
+    op.create_index('ix_users_full_name', 'users', ['full_name'], mysql_length=64)
+
+    # Índice FULLTEXT para busca com ordenação por relevância
+    op.create_index(
+        'ft_users_search',
+        'users',
+        ['username', 'email', 'full_name'],
+        mysql_prefix='FULLTEXT'
+    )
+
+
+def downgrade():
+    op.drop_index('ft_users_search', table_name='users')
+    op.drop_index('ix_users_full_name', table_name='users')
@@ -0,0 +1,34 @@
+"""
+Revisão do esquema esperada pela aplicação.
+
+Importado pelos workers na inicialização: o Alembic só é carregado quando a
+verificação é executada, fora do orçamento de importação de app.backend.main.
+"""
+import os
+
+from app.backend.config.database import engine
+
+MIGRATIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+
+def alembic_config():
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_PATH)
+    return config
+
+
+def verify_schema_version():
+    """Confere se o banco está na revisão mais recente; usado na inicialização dos workers."""
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    head = ScriptDirectory.from_config(alembic_config()).get_current_head()
+    with engine.connect() as connection:
+        current = MigrationContext.configure(connection).get_current_revision()
+    if current != head:
+        raise RuntimeError(
+            f"Esquema do banco na revisão {current}, esperado {head}. "
+            "Execute: python -m app.backend.database.migrate"
+        )
@@ -0,0 +1,4 @@
+# Sessão do banco usada pelos controladores e middlewares; a configuração fica em config/database.py
+from app.backend.config.database import SessionLocal, engine, get_db
+
+__all__ = ["SessionLocal", "engine", "get_db"]
@@ -1,22 +1,44 @@
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette.concurrency import run_in_threadpool
 
-from app.backend.config.database import get_db, engine, Base
-from app.backend.services.auth_service import create_initial_data
+from app.backend.config.database import engine
+from app.backend.config.logging_config import setup_logging
+from app.backend.config.settings import settings
+from app.backend.database.schema_version import verify_schema_version
+from app.backend.middleware.etag_middleware import NotModified, not_modified_handler
+from app.backend.middleware.metrics_middleware import MetricsMiddleware
+from app.backend.middleware.profiling_middleware import ProfilingMiddleware
+from app.backend.middleware.tracing_middleware import TracingMiddleware
+from app.backend.services.metrics_service import instrument_engine, render_metrics
+from app.backend.services.health_service import health_service
+from app.backend.services.audit_service import audit_writer
+from app.backend.services.login_telemetry_service import login_telemetry
+from app.backend.services.revocation_service import revocation_list
+from app.backend.services.auth_service import uses_asymmetric_signing
+from app.backend.services.key_service import key_store
 from app.backend.controllers import auth_controller, user_controller, module_controller
 from app.backend.controllers.profile_controller import router as profile_router
 from app.backend.controllers.permission_controller import router as permission_router
+from app.backend.controllers.export_controller import router as export_router
+from app.backend.controllers.admin_controller import router as admin_router
+from app.backend.controllers.audit_controller import router as audit_router
+from app.backend.controllers.jwks_controller import router as jwks_router
 
-# Cria as tabelas no banco de dados
-Base.metadata.create_all(bind=engine)
+setup_logging()
 
 app = FastAPI(
     title="OmniCorp",
     description="Sistema corporativo OmniCorp",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
+# Resposta 304 dos endpoints de catálogo com GET condicional
+app.add_exception_handler(NotModified, not_modified_handler)
+
 # Configura CORS
 app.add_middleware(
     CORSMiddleware,
@@ -24,23 +46,81 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Profile-Id", "X-Request-ID", "ETag"],
 )
 
+# Compressão das respostas acima do tamanho mínimo (brotli quando o cliente aceita e o pacote está instalado)
+try:
+    from brotli_asgi import BrotliMiddleware
+    app.add_middleware(
+        BrotliMiddleware,
+        minimum_size=settings.server.compression_minimum_size,
+        gzip_fallback=True,
+    )
+except ImportError:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.server.compression_minimum_size)
+
+# Métricas de latência por rota e do pool/consultas do banco
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+
+# Perfilamento sob demanda (cabeçalho X-Profile de administradores ou amostragem)
+app.add_middleware(ProfilingMiddleware)
+
+# Id da requisição e span raiz; adicionado por último para envolver os demais middlewares
+app.add_middleware(TracingMiddleware)
+
 # Adiciona rotas
 app.include_router(auth_controller.router)
 app.include_router(user_controller.router)
 app.include_router(module_controller.router)
 app.include_router(profile_router, prefix="/api", tags=["profiles"])
 app.include_router(permission_router, prefix="/api", tags=["permissions"])
+app.include_router(export_router)
+app.include_router(admin_router)
+app.include_router(audit_router)
+app.include_router(jwks_router)
 
 
 @app.on_event("startup")
 async def startup_event():
-    # Inicializa dados iniciais
-    db = next(get_db())
-    create_initial_data(db)
+    # Recria a thread de escrita de logs caso o worker tenha sido criado por fork
+    setup_logging()
+    # Esquema e dados iniciais são criados pelo comando de migração (database/migrate.py);
+    # o worker apenas confere se o banco está na revisão esperada
+    verify_schema_version()
+    # A chave de assinatura é gerada pela migração; sem ela o worker não sobe
+    if uses_asymmetric_signing():
+        key_store.check()
+    health_service.start()
+    login_telemetry.start()
+    audit_writer.start()
+    revocation_list.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await health_service.stop()
+    await run_in_threadpool(revocation_list.stop)
+    # Grava os eventos de login e os registros de auditoria pendentes antes de encerrar o worker
+    await run_in_threadpool(login_telemetry.stop)
+    await run_in_threadpool(audit_writer.stop)
 
 
 @app.get("/api/health")
 async def health_check():
-    return {"status": "healthy", "version": "1.0.0"} 
\ No newline at end of file
+    return {"status": "healthy", "version": "1.0.0"}
+
+
+@app.get("/api/ready")
+async def readiness_check():
+    """Readiness com o estado (em cache) do banco, Redis e AD."""
+    result = await health_service.get_status()
+    status_code = 200 if result["status"] == "ready" else 503
+    return JSONResponse(content=result, status_code=status_code)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
@@ -2,16 +2,20 @@ from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.backend.database.session import get_db
-from app.backend.models.user import User
-from app.backend.models.profile import Profile
 from app.backend.models.permission import Permission
+from app.backend.models.profile_permission import profile_permissions
 from app.backend.services.auth_service import decode_token
+from app.backend.services.identity_service import Identity, get_identity
 from app.backend.services.redis_service import redis_service
 from typing import List, Set
 
 security = HTTPBearer()
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
+# Perfil com acesso total e a permissão que o representa nos conjuntos resolvidos
+ADMIN_PROFILE = "Administrador"
+ALL_PERMISSIONS = "admin:all"
+
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)) -> Identity:
     try:
         token = credentials.credentials
         payload = decode_token(token)
@@ -20,43 +24,74 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
         if not username:
             raise HTTPException(status_code=401, detail="Token inválido")
             
-        user = db.query(User).filter(User.username == username).first()
-        if not user:
+        identity = get_identity(db, username)
+        if not identity:
             raise HTTPException(status_code=401, detail="Usuário não encontrado")
             
-        return user
+        return identity
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=401, detail=str(e))
 
+def _profile_permission_names(db: Session, profile_id: int) -> Set[str]:
+    rows = (
+        db.query(Permission.name)
+        .join(profile_permissions, profile_permissions.c.permission_id == Permission.id)
+        .filter(profile_permissions.c.profile_id == profile_id)
+        .all()
+    )
+    return {name for (name,) in rows}
+
+def load_user_permissions(user: Identity, db: Session) -> Set[str]:
+    """Permissões dos perfis do usuário, usando o cache de cada perfil, e atualiza o cache do usuário."""
+    user_permissions = set()
+    for profile_id in user.profile_ids:
+        # Tenta obter as permissões do perfil do cache
+        cached_profile_permissions = redis_service.get_profile_permissions(profile_id)
+        if cached_profile_permissions:
+            user_permissions.update(cached_profile_permissions)
+        else:
+            # Se não estiver no cache, busca do banco de dados
+            permission_names = _profile_permission_names(db, profile_id)
+            user_permissions.update(permission_names)
+            # Armazena no cache
+            redis_service.set_profile_permissions(profile_id, list(permission_names))
+    
+    # Armazena as permissões do usuário no cache
+    redis_service.set_user_permissions(user.id, list(user_permissions))
+    return user_permissions
+
+def get_effective_permissions(user: Identity, db: Session) -> Set[str]:
+    """Permissões dos perfis do usuário: o cache do usuário ou, na falta dele, os perfis."""
+    cached_permissions = redis_service.get_user_permissions(user.id)
+    if cached_permissions is not None:
+        return set(cached_permissions)
+    return load_user_permissions(user, db)
+
+def resolve_permissions(user: Identity, db: Session) -> Set[str]:
+    """
+    Permissões que a API concede ao usuário.
+
+    Fonte única para check_permission, introspecção, bootstrap e menu de
+    módulos: as permissões dos perfis do usuário, mais ALL_PERMISSIONS para o
+    perfil Administrador. Usuários inativos não têm permissão alguma; as
+    permissões gravadas no token não são consideradas.
+    """
+    if not user.is_active:
+        return set()
+    permissions = get_effective_permissions(user, db)
+    if ADMIN_PROFILE in user.profile_names:
+        permissions.add(ALL_PERMISSIONS)
+    return permissions
+
+def grants(permissions: Set[str], permission_name: str) -> bool:
+    """Se o conjunto de permissões libera permission_name (ALL_PERMISSIONS libera tudo)."""
+    return ALL_PERMISSIONS in permissions or permission_name in permissions
+
 def check_permission(permission_name: str):
-    def permission_checker(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-        # Verifica se o usuário tem o perfil de administrador
-        if any(profile.name == "Administrador" for profile in user.profiles):
-            return user
-            
-        # Tenta obter as permissões do cache
-        cached_permissions = redis_service.get_user_permissions(user.id)
-        if cached_permissions and permission_name in cached_permissions:
-            return user
-            
-        # Se não estiver no cache, busca do banco de dados
-        user_permissions = set()
-        for profile in user.profiles:
-            # Tenta obter as permissões do perfil do cache
-            cached_profile_permissions = redis_service.get_profile_permissions(profile.id)
-            if cached_profile_permissions:
-                user_permissions.update(cached_profile_permissions)
-            else:
-                # Se não estiver no cache, busca do banco de dados
-                profile_permissions = {p.name for p in profile.permissions}
-                user_permissions.update(profile_permissions)
-                # Armazena no cache
-                redis_service.set_profile_permissions(profile.id, list(profile_permissions))
-        
-        # Armazena as permissões do usuário no cache
-        redis_service.set_user_permissions(user.id, list(user_permissions))
-        
-        if permission_name in user_permissions:
+    def permission_checker(user: Identity = Depends(get_current_user), db: Session = Depends(get_db)):
+        if grants(resolve_permissions(user, db), permission_name):
             return user
             
         raise HTTPException(
@@ -76,5 +111,7 @@ PERMISSIONS = {
     "profile:read": "Visualizar perfis",
     "profile:update": "Atualizar perfis",
     "profile:delete": "Excluir perfis",
-    "permission:manage": "Gerenciar permissões"
+    "permission:manage": "Gerenciar permissões",
+    "audit:read": "Consultar a trilha de auditoria",
+    "auth:introspect": "Consultar a validade de tokens (introspecção)"
 } 
\ No newline at end of file
@@ -0,0 +1,82 @@
+import hashlib
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Depends, Request
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+
+from app.backend.database.session import get_db
+from app.backend.middleware.auth_middleware import resolve_permissions
+from app.backend.services.module_service import permission_set_key
+from app.backend.services.redis_service import redis_service
+
+logger = logging.getLogger(__name__)
+
+# As respostas dependem da autorização do usuário: nada de caches compartilhados,
+# e o navegador sempre revalida (a revalidação custa um GET no Redis e devolve 304)
+CACHE_CONTROL = "private, no-cache"
+
+class NotModified(Exception):
+    def __init__(self, etag: str):
+        self.etag = etag
+
+
+def cache_headers(etag: Optional[str]) -> Dict[str, str]:
+    headers = {"Cache-Control": CACHE_CONTROL, "Vary": "Authorization"}
+    if etag:
+        headers["ETag"] = etag
+    return headers
+
+
+async def not_modified_handler(request: Request, exc: NotModified) -> Response:
+    return Response(status_code=304, headers=cache_headers(exc.etag))
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def catalog_etag(catalog: str, authorize: Callable, per_user: bool = False):
+    """
+    Dependência de GET condicional para catálogos.
+
+    authorize é a mesma dependência de autorização do endpoint (o FastAPI a
+    executa uma única vez por requisição): o 304 só é devolvido depois de
+    validar o token, a revogação, o usuário e a permissão. A ETag é derivada do
+    contador de alterações do catálogo no Redis e, quando a resposta varia por
+    usuário, do conjunto de permissões que ele tem. Quando If-None-Match
+    confere, NotModified é levantada antes da consulta do catálogo. Sem Redis,
+    devolve None e o endpoint segue normalmente.
+    """
+    def dependency(
+        request: Request,
+        user: Any = Depends(authorize),
+        db: Session = Depends(get_db)
+    ) -> Optional[str]:
+        try:
+            version = redis_service.get_catalog_version(catalog)
+        except Exception as e:
+            logger.debug("ETag indisponível para o catálogo %s: %s", catalog, e)
+            return None
+
+        source = f"{catalog}:{version}"
+        if per_user:
+            source += f":{permission_set_key(resolve_permissions(user, db))}"
+        etag = f'W/"{hashlib.sha1(source.encode("utf-8")).hexdigest()[:20]}"'
+
+        if _matches(request.headers.get("if-none-match"), etag):
+            raise NotModified(etag)
+        return etag
+    return dependency
+
+
+def bump_catalogs(*catalogs: str):
+    """Invalida as ETags dos catálogos após uma alteração."""
+    try:
+        redis_service.bump_catalog_versions(*catalogs)
+    except Exception as e:
+        logger.warning("Não foi possível atualizar a versão dos catálogos %s: %s", catalogs, e)
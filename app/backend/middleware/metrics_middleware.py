@@ -0,0 +1,54 @@
+import time
+
+from app.backend.services.metrics_service import REQUEST_LATENCY, REQUESTS_IN_PROGRESS, RESPONSE_SIZE
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede latência por rota e requisições em andamento.
+
+    A rota é identificada pelo template do path (ex.: /api/users/{user_id}),
+    obtido a partir do endpoint resolvido pelo roteador, para manter a
+    cardinalidade das métricas limitada.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths = None
+
+    def _route_for(self, scope) -> str:
+        if self._route_paths is None:
+            self._route_paths = {
+                route.endpoint: route.path
+                for route in scope["app"].routes
+                if hasattr(route, "endpoint")
+            }
+        return self._route_paths.get(scope.get("endpoint"), "unmatched")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        body_size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, body_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body_size += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            route = self._route_for(scope)
+            REQUEST_LATENCY.labels(method, route, str(status_code)).observe(time.perf_counter() - start)
+            RESPONSE_SIZE.labels(route).observe(body_size)
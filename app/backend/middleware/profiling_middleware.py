@@ -0,0 +1,99 @@
+import random
+import threading
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+from app.backend.config.settings import settings
+from app.backend.database.session import SessionLocal
+from app.backend.middleware.auth_middleware import ALL_PERMISSIONS, grants, resolve_permissions
+from app.backend.services.auth_service import decode_token
+from app.backend.services.identity_service import get_identity
+from app.backend.services.profiling_service import (
+    RequestProfile,
+    activate,
+    deactivate,
+    store_profile,
+)
+
+PROFILE_HEADER = b"x-profile"
+
+
+class ProfilingMiddleware:
+    """
+    Perfila requisições sob demanda.
+
+    Uma requisição é perfilada quando traz o cabeçalho "X-Profile: 1" com o
+    token de um usuário a quem a API concede ALL_PERMISSIONS (as permissões
+    gravadas no token não são consideradas), ou por amostragem
+    (settings.profiling.sample_rate).
+    O cProfile cobre a thread do event loop (endpoints async, como login e
+    read_modules); o tempo gasto em LDAP, Redis, SQL e bcrypt é somado também
+    quando ocorre nas threads do threadpool. Como o event loop é compartilhado,
+    trechos de outras requisições concorrentes podem aparecer no relatório.
+    Apenas uma requisição por worker é perfilada por vez.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._busy = threading.Lock()
+
+    def _profile_token(self, scope) -> str:
+        """Token da requisição quando ela pede o perfilamento (X-Profile: 1)."""
+        headers = dict(scope["headers"])
+        if headers.get(PROFILE_HEADER) != b"1":
+            return ""
+        scheme, _, token = headers.get(b"authorization", b"").decode("latin-1").partition(" ")
+        return token if scheme.lower() == "bearer" else ""
+
+    def _is_admin(self, token: str) -> bool:
+        """Resolve a identidade do token com as mesmas regras de check_permission."""
+        try:
+            username = decode_token(token).get("sub")
+            if not username:
+                return False
+            db = SessionLocal()
+            try:
+                identity = get_identity(db, username)
+                return identity is not None and grants(resolve_permissions(identity, db), ALL_PERMISSIONS)
+            finally:
+                db.close()
+        except Exception:
+            return False
+
+    async def _should_profile(self, scope) -> bool:
+        rate = settings.profiling.sample_rate
+        if rate > 0 and random.random() < rate:
+            return True
+        token = self._profile_token(scope)
+        # Identidade e permissões (Redis e, sem cache, banco) fora do event loop
+        return bool(token) and await run_in_threadpool(self._is_admin, token)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not await self._should_profile(scope) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"])
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile.id.encode())]
+            await send(message)
+
+        context_token = activate(profile)
+        start = time.perf_counter()
+        profile.profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.profiler.disable()
+            duration = time.perf_counter() - start
+            deactivate(context_token)
+            self._busy.release()
+
+        # Formatação do relatório e gravação no Redis fora do event loop
+        await run_in_threadpool(lambda: store_profile(profile.to_dict(status_code, duration)))
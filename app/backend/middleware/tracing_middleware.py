@@ -0,0 +1,45 @@
+from app.backend.services.tracing_service import (
+    bind_request_id,
+    new_request_id,
+    span,
+    unbind_request_id,
+)
+
+REQUEST_ID_HEADER = b"x-request-id"
+
+
+class TracingMiddleware:
+    """
+    Atribui um id a cada requisição e abre o span raiz "http.request".
+
+    O id (recebido em X-Request-ID ou gerado) é propagado por contextvars para
+    logs e spans — inclusive nas threads do threadpool — e devolvido no
+    cabeçalho X-Request-ID da resposta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope["headers"]).get(REQUEST_ID_HEADER, b"").decode("latin-1")
+        request_id = new_request_id(incoming)
+        token = bind_request_id(request_id)
+
+        try:
+            with span("http.request", method=scope["method"], path=scope["path"]) as root:
+                async def send_wrapper(message):
+                    if message["type"] == "http.response.start":
+                        if root is not None:
+                            root.attributes["status"] = message["status"]
+                        message["headers"] = list(message.get("headers", [])) + [
+                            (REQUEST_ID_HEADER, request_id.encode("latin-1"))
+                        ]
+                    await send(message)
+
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            unbind_request_id(token)
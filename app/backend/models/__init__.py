@@ -1 +1,8 @@
-# Este arquivo permite que o diretório seja tratado como um pacote Python 
\ No newline at end of file
+# Importar todos os modelos aqui para que o Alembic e os relacionamentos declarados
+# por nome os encontrem, qualquer que seja o primeiro módulo de modelo importado
+from app.backend.models.user import User
+from app.backend.models.profile import Profile
+from app.backend.models.permission import Permission
+from app.backend.models.profile_permission import profile_permissions
+from app.backend.models.login_event import LoginEvent
+from app.backend.models.audit_log import AuditLog
@@ -0,0 +1,29 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, JSON, String
+from datetime import datetime
+from app.backend.database.base_class import Base
+
+
+class AuditLog(Base):
+    """
+    Registro de auditoria de uma alteração administrativa.
+
+    Somente inserção: a tabela é particionada por mês em created_at (ver
+    database/audit_partitions.py) e a retenção é feita removendo partições.
+    """
+    __tablename__ = "audit_log"
+    __table_args__ = (
+        Index("ix_audit_log_created_at", "created_at"),
+        Index("ix_audit_log_actor_created_at", "actor", "created_at"),
+        Index("ix_audit_log_target_created_at", "target_type", "target_id", "created_at"),
+    )
+
+    # A coluna de particionamento precisa fazer parte da chave primária
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
+    actor_id = Column(Integer)
+    actor = Column(String(100), nullable=False)
+    action = Column(String(50), nullable=False)
+    target_type = Column(String(50), nullable=False)
+    target_id = Column(String(64))
+    changes = Column(JSON)
+    request_id = Column(String(64))
@@ -0,0 +1,20 @@
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Index, String
+from datetime import datetime
+from app.backend.database.base_class import Base
+
+
+class LoginEvent(Base):
+    """Tentativa de login (sucesso ou falha), gravada em lote pela telemetria de login."""
+    __tablename__ = "login_events"
+    __table_args__ = (
+        Index("ix_login_events_created_at", "created_at"),
+        Index("ix_login_events_username_created_at", "username", "created_at"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    username = Column(String(100), nullable=False)
+    success = Column(Boolean, nullable=False)
+    auth_type = Column(String(20))
+    client_ip = Column(String(45))
+    error = Column(String(255))
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,24 +1,9 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Table, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.backend.database.base_class import Base
 from app.backend.models.user_profiles import user_profiles
-
-# Tabela de associação entre usuários e perfis
-user_profiles = Table(
-    'user_profiles',
-    Base.metadata,
-    Column('user_id', Integer, ForeignKey('user.id'), primary_key=True),
-    Column('profile_id', Integer, ForeignKey('profile.id'), primary_key=True)
-)
-
-# Tabela de associação entre Profile e Permission
-profile_permissions = Table(
-    "profile_permissions",
-    Base.metadata,
-    Column("profile_id", Integer, ForeignKey("profile.id")),
-    Column("permission_id", Integer, ForeignKey("permission.id"))
-)
+from app.backend.models.profile_permission import profile_permissions
 
 class Profile(Base):
     __tablename__ = 'profile'
@@ -33,4 +18,4 @@ class Profile(Base):
 
     # Relacionamento com usuários
     users = relationship("User", secondary=user_profiles, back_populates="profiles")
-    permissions = relationship("Permission", secondary=profile_permissions, back_populates="profiles")
\ No newline at end of file
+    permissions = relationship("app.backend.models.permission.Permission", secondary=profile_permissions, back_populates="profiles")
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -8,6 +8,15 @@ from app.backend.models.user_profiles import user_profiles
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Índices usados pela paginação por cursor da listagem de usuários
+        Index("ix_users_created_at", "created_at"),
+        Index("ix_users_is_active_username", "is_active", "username"),
+        Index("ix_users_is_ad_user_username", "is_ad_user", "username"),
+        # Índices usados pela busca de usuários (prefixo e texto completo)
+        Index("ix_users_full_name", "full_name", mysql_length=64),
+        Index("ft_users_search", "username", "email", "full_name", mysql_prefix="FULLTEXT"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String(100), unique=True, nullable=False)
@@ -65,7 +74,7 @@ class RolePermission(Base):
     
     # Relacionamentos
     role = relationship("Role", back_populates="permissions")
-    permission = relationship("Permission", back_populates="roles")
+    permission = relationship("app.backend.models.user.Permission", back_populates="roles")
 
 
 class Module(Base):
@@ -80,4 +89,4 @@ class Module(Base):
     
     # Relacionamento com permissões
     required_permission_id = Column(Integer, ForeignKey("permissions.id"))
-    required_permission = relationship("Permission") 
\ No newline at end of file
+    required_permission = relationship("app.backend.models.user.Permission") 
\ No newline at end of file
@@ -4,6 +4,6 @@ from app.backend.database.base_class import Base
 user_profiles = Table(
     "user_profiles",
     Base.metadata,
-    Column("user_id", Integer, ForeignKey("user.id"), primary_key=True),
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
     Column("profile_id", Integer, ForeignKey("profile.id"), primary_key=True)
 ) 
\ No newline at end of file
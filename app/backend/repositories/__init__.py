@@ -1,3 +1,3 @@
-from app.backend.repositories.user_repository import get_user_by_username
+from app.backend.repositories.user_repository import get_user_by_username, search_users, user_prefix_filter
 
-__all__ = ['get_user_by_username'] 
\ No newline at end of file
+__all__ = ['get_user_by_username', 'search_users', 'user_prefix_filter']
@@ -1,6 +1,13 @@
-from sqlalchemy.orm import Session
+import re
+from typing import List
+
+from sqlalchemy import case, desc, or_, text
+from sqlalchemy.orm import Query, Session, joinedload
 from app.backend.models.user import User
 
+# Tamanho mínimo de palavra indexada pelo FULLTEXT do InnoDB (innodb_ft_min_token_size)
+FULLTEXT_MIN_TOKEN_SIZE = 3
+
 def get_user_by_username(db: Session, username: str) -> User:
     """
     Busca um usuário pelo nome de usuário.
@@ -12,4 +19,62 @@ def get_user_by_username(db: Session, username: str) -> User:
     Returns:
         User: Objeto do usuário encontrado ou None se não existir
     """
-    return db.query(User).filter(User.username == username).first() 
\ No newline at end of file
+    return db.query(User).filter(User.username == username).first()
+
+def user_prefix_filter(term: str):
+    """Filtro por prefixo em username, email e full_name (atendido pelos índices)."""
+    return or_(
+        User.username.startswith(term, autoescape=True),
+        User.email.startswith(term, autoescape=True),
+        User.full_name.startswith(term, autoescape=True)
+    )
+
+def _fulltext_terms(term: str) -> str:
+    """Monta a expressão booleana do FULLTEXT exigindo o prefixo de cada palavra."""
+    words = re.findall(r"\w+", term, re.UNICODE)
+    return " ".join(f"+{word}*" for word in words if len(word) >= FULLTEXT_MIN_TOKEN_SIZE)
+
+def user_search_query(db: Session, term: str, fulltext: bool) -> Query:
+    """
+    Consulta ordenada da busca de usuários, sem limite.
+
+    Termos com palavras de ao menos FULLTEXT_MIN_TOKEN_SIZE letras usam também o
+    MATCH em modo booleano quando fulltext é verdadeiro; os demais ficam apenas
+    no prefixo (LIKE 'termo%'), atendido pelos índices.
+    """
+    term = term.strip()
+    prefix_match = user_prefix_filter(term)
+    rank = case(
+        (User.username == term, 0),
+        (User.username.startswith(term, autoescape=True), 1),
+        (User.email.startswith(term, autoescape=True), 2),
+        else_=3
+    )
+
+    # O perfil entra na resposta (user_to_dict): carregado na mesma consulta
+    query = db.query(User).options(joinedload(User.role))
+    fulltext_terms = _fulltext_terms(term)
+    if fulltext_terms and fulltext:
+        relevance = text(
+            "MATCH (users.username, users.email, users.full_name) "
+            "AGAINST (:fulltext_terms IN BOOLEAN MODE)"
+        ).bindparams(fulltext_terms=fulltext_terms)
+        return query.filter(or_(prefix_match, relevance)).order_by(rank, desc(relevance), User.username)
+    return query.filter(prefix_match).order_by(rank, User.username)
+
+def search_users(db: Session, term: str, limit: int = 10) -> List[User]:
+    """
+    Busca usuários por username, email ou nome completo.
+    
+    Correspondências exatas e por prefixo do username vêm primeiro; em seguida
+    os resultados são ordenados pela relevância do índice FULLTEXT (MySQL).
+    
+    Args:
+        db: Sessão do banco de dados
+        term: Texto digitado pelo usuário
+        limit: Quantidade máxima de resultados
+        
+    Returns:
+        List[User]: Usuários encontrados, do mais para o menos relevante
+    """
+    return user_search_query(db, term, fulltext=db.bind.dialect.name == "mysql").limit(limit).all()
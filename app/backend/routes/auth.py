@@ -16,7 +16,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     try:
         user = authenticate_user(form_data.username, form_data.password)
         if not user:
-            logger.warning(f"Tentativa de login falhou para usuário: {form_data.username}")
+            logger.warning("Tentativa de login falhou para usuário: %s", form_data.username)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Usuário ou senha incorretos",
@@ -28,7 +28,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
             data={"sub": user["username"]}, expires_delta=access_token_expires
         )
 
-        logger.info(f"Login bem-sucedido para usuário: {form_data.username}")
+        logger.info("Login bem-sucedido para usuário: %s", form_data.username)
         return {
             "access_token": access_token,
             "token_type": "bearer",
@@ -40,7 +40,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
             }
         }
     except Exception as e:
-        logger.error(f"Erro durante o login: {str(e)}")
+        logger.error("Erro durante o login: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Erro interno durante a autenticação"
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+class AuditEntry(BaseModel):
+    id: int
+    created_at: datetime
+    actor_id: Optional[int] = None
+    actor: str
+    action: str
+    target_type: str
+    target_id: Optional[str] = None
+    changes: Optional[Dict[str, Any]] = None
+    request_id: Optional[str] = None
+
+    class Config:
+        orm_mode = True
@@ -17,4 +17,15 @@ class ProfileResponse(ProfileBase):
     permissions: List[PermissionResponse] = []
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True
+
+class ProfileIdList(BaseModel):
+    ids: List[int]
+
+class ProfileIdDiff(BaseModel):
+    add: List[int] = []
+    remove: List[int] = []
+
+class ProfileBulkResult(BaseModel):
+    added: int
+    removed: int
@@ -64,6 +64,21 @@ class User(UserBase):
         from_attributes = True
 
 
+class UserImportError(BaseModel):
+    row: int
+    username: Optional[str] = None
+    error: str
+
+
+class UserImportResult(BaseModel):
+    processed: int
+    imported: int
+    created: int = 0
+    updated: int = 0
+    failed: int
+    errors: List[UserImportError] = []
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str
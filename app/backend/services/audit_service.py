@@ -0,0 +1,139 @@
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.backend.config.database import engine
+from app.backend.config.settings import settings
+from app.backend.models.audit_log import AuditLog
+from app.backend.services.batch_writer import BatchWriter
+from app.backend.services.tracing_service import current_request_id
+
+logger = logging.getLogger(__name__)
+
+# Campos que nunca vão para a trilha de auditoria
+EXCLUDED_FIELDS = {"hashed_password"}
+
+_audit_log = AuditLog.__table__
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+
+def snapshot(obj, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Valores das colunas de um objeto ORM, prontos para serialização em JSON."""
+    names = fields or [column.key for column in obj.__table__.columns]
+    return {name: _jsonable(getattr(obj, name)) for name in names if name not in EXCLUDED_FIELDS}
+
+
+def diff(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Campos alterados entre dois snapshots, no formato {campo: {"old": ..., "new": ...}}."""
+    return {
+        key: {"old": before.get(key), "new": after.get(key)}
+        for key in sorted(set(before) | set(after))
+        if before.get(key) != after.get(key)
+    }
+
+
+def actor_of(user) -> Dict[str, Any]:
+    """Id e nome do autor a partir da identidade, do usuário ORM ou do dicionário do token."""
+    if isinstance(user, dict):
+        return {"actor_id": user.get("id"), "actor": user.get("username") or "desconhecido"}
+    return {"actor_id": getattr(user, "id", None), "actor": getattr(user, "username", None) or "desconhecido"}
+
+
+def flush_audit_entries(entries: List[Dict[str, Any]]):
+    with engine.begin() as connection:
+        connection.execute(_audit_log.insert(), entries)
+
+
+audit_writer = BatchWriter(
+    "audit_log",
+    flush_audit_entries,
+    batch_size=settings.audit.batch_size,
+    flush_interval=settings.audit.flush_seconds,
+    max_pending=settings.audit.max_pending,
+    retries=settings.audit.retries,
+)
+
+
+def _entry(
+    user,
+    action: str,
+    target_type: str,
+    target_id: Any,
+    before: Optional[Dict[str, Any]],
+    after: Optional[Dict[str, Any]],
+    changes: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    if changes is None:
+        if before is not None and after is not None:
+            changes = diff(before, after)
+            if not changes:
+                return None
+        else:
+            changes = {"before": before} if before is not None else {"after": after}
+    return {
+        **actor_of(user),
+        "created_at": datetime.utcnow(),
+        "action": action,
+        "target_type": target_type,
+        "target_id": str(target_id) if target_id is not None else None,
+        "changes": changes,
+        "request_id": current_request_id(),
+    }
+
+
+def record_audit(
+    user,
+    action: str,
+    target_type: str,
+    target_id: Any = None,
+    before: Optional[Dict[str, Any]] = None,
+    after: Optional[Dict[str, Any]] = None,
+    changes: Optional[Dict[str, Any]] = None
+):
+    """
+    Enfileira um registro de auditoria para gravação em lote.
+
+    Com before e after, apenas os campos alterados são gravados (e nada é
+    registrado se não houver diferença); com apenas um deles, o snapshot
+    completo. changes substitui o cálculo quando o endpoint já conhece a diferença.
+    Com o buffer cheio (banco lento), a chamada espera até audit.enqueue_timeout;
+    deve ser usada em endpoints síncronos, que rodam no pool de threads.
+    """
+    entry = _entry(user, action, target_type, target_id, before, after, changes)
+    if entry is None:
+        return
+    if not audit_writer.put(entry, timeout=settings.audit.enqueue_timeout):
+        logger.error("Registro de auditoria descartado (buffer cheio): %s %s %s", action, target_type, target_id)
+
+
+async def record_audit_async(
+    user,
+    action: str,
+    target_type: str,
+    target_id: Any = None,
+    before: Optional[Dict[str, Any]] = None,
+    after: Optional[Dict[str, Any]] = None,
+    changes: Optional[Dict[str, Any]] = None
+):
+    """Versão de record_audit para endpoints assíncronos: a espera por espaço não bloqueia o event loop."""
+    entry = _entry(user, action, target_type, target_id, before, after, changes)
+    if entry is None:
+        return
+    if audit_writer.offer(entry):
+        return
+    if not await run_in_threadpool(audit_writer.put, entry, settings.audit.enqueue_timeout):
+        logger.error("Registro de auditoria descartado (buffer cheio): %s %s %s", action, target_type, target_id)
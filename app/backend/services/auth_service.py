@@ -1,40 +1,40 @@
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
 from sqlalchemy.orm import Session
 from fastapi import Depends, HTTPException, status
 import logging
-import traceback
 import sys
+import uuid
 
 from app.backend.config.settings import settings
 from app.backend.config.database import get_db
-from app.backend.models.user import User, Role, Permission
+from app.backend.models.user import User, Role, Permission, RolePermission
 from app.backend.schemas.user import TokenData
-from app.backend.services.ldap_service import LDAPService
+from app.backend.services.ldap_service import get_ldap_service
+from app.backend.services.metrics_service import PASSWORD_HASH_LATENCY, timed
+from app.backend.services.key_service import key_store
+from app.backend.services.revocation_service import revocation_list
+from app.backend.services.tracing_service import span
 from app.backend.repositories.user_repository import get_user_by_username
 
 logger = logging.getLogger(__name__)
-# Configurar logging para mostrar mais detalhes
-logging.basicConfig(level=logging.DEBUG, 
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-# Configuração de hash de senha
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-# Instância do serviço LDAP
-ldap_service = LDAPService()
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """Contexto de hash de senha, criado no primeiro uso (evita carregar o passlib na importação)."""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def log_exception(e: Exception, context: str = ""):
     """Registra exceção com traceback completo"""
-    logger.error(f"ERRO em {context}: {str(e)}")
-    logger.error(f"TRACEBACK: {''.join(traceback.format_exception(None, e, e.__traceback__))}")
+    logger.error("ERRO em %s: %s", context, e, exc_info=e)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
-        logger.debug(f"Verificando senha (hash começa com: {hashed_password[:5]}...)")
-        return pwd_context.verify(plain_password, hashed_password)
+        logger.debug("Verificando senha (hash começa com: %s...)", hashed_password[:5])
+        with timed(PASSWORD_HASH_LATENCY, "verify"):
+            return get_pwd_context().verify(plain_password, hashed_password)
     except Exception as e:
         log_exception(e, "verify_password")
         return False
@@ -42,11 +42,17 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     try:
         logger.debug("Gerando hash de senha")
-        return pwd_context.hash(password)
+        with timed(PASSWORD_HASH_LATENCY, "hash"):
+            return get_pwd_context().hash(password)
     except Exception as e:
         log_exception(e, "get_password_hash")
         raise
 
+
+def uses_asymmetric_signing() -> bool:
+    return settings.auth.algorithm.upper().startswith("RS")
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Cria um token JWT de acesso."""
     to_encode = data.copy()
@@ -54,9 +60,43 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.auth.secret_key, algorithm=settings.auth.algorithm)
-    return encoded_jwt
+    # jti identifica o token para revogação (logout)
+    to_encode.update({
+        "exp": expire,
+        "iss": settings.auth.issuer,
+        "jti": to_encode.get("jti") or uuid.uuid4().hex,
+    })
+    from jose import jwt
+    with span("jwt.encode"):
+        if uses_asymmetric_signing():
+            kid, private_key = key_store.signing_key()
+            return jwt.encode(to_encode, private_key, algorithm=settings.auth.algorithm, headers={"kid": kid})
+        return jwt.encode(to_encode, settings.auth.secret_key, algorithm=settings.auth.algorithm)
+
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """Decodifica e valida um token JWT de acesso (levanta JWTError se inválido ou revogado)."""
+    from jose import JWTError, jwt
+    with span("jwt.decode"):
+        if not uses_asymmetric_signing():
+            payload = jwt.decode(token, settings.auth.secret_key, algorithms=[settings.auth.algorithm])
+        else:
+            header = jwt.get_unverified_header(token)
+            algorithm = header.get("alg")
+            if algorithm == settings.auth.algorithm:
+                key = key_store.verification_key(header.get("kid"))
+                if key is None:
+                    raise JWTError("Chave de assinatura desconhecida")
+                payload = jwt.decode(token, key, algorithms=[settings.auth.algorithm])
+            elif algorithm == "HS256" and settings.auth.accept_legacy_hs256:
+                # Tokens emitidos antes da troca de algoritmo; a lista de algoritmos
+                # é fixa, então a chave pública nunca é usada como segredo HMAC
+                payload = jwt.decode(token, settings.auth.secret_key, algorithms=["HS256"])
+            else:
+                raise JWTError("Algoritmo de assinatura não aceito")
+    if revocation_list.is_revoked(payload.get("jti")):
+        raise JWTError("Token revogado")
+    return payload
 
 
 def get_user_by_username(db: Session, username: str) -> Optional[User]:
@@ -69,23 +109,14 @@ def get_user_permissions(db: Session, user: User) -> List[str]:
     if not user.role_id:
         return []
     
-    # Busca todas as permissões associadas ao perfil do usuário
-    role_with_permissions = (
-        db.query(Role)
-        .filter(Role.id == user.role_id)
-        .first()
+    # Busca os nomes das permissões do perfil do usuário em uma única consulta
+    rows = (
+        db.query(Permission.name)
+        .join(RolePermission, RolePermission.permission_id == Permission.id)
+        .filter(RolePermission.role_id == user.role_id)
+        .all()
     )
-    
-    if not role_with_permissions:
-        return []
-    
-    permissions = []
-    for role_permission in role_with_permissions.permissions:
-        permission = db.query(Permission).filter(Permission.id == role_permission.permission_id).first()
-        if permission:
-            permissions.append(permission.name)
-    
-    return permissions
+    return [name for (name,) in rows]
 
 
 def authenticate_user(username: str, password: str) -> dict:
@@ -99,7 +130,7 @@ def authenticate_user(username: str, password: str) -> dict:
     - authenticated: booleano indicando se a autenticação foi bem sucedida
     - auth_type: "local" para administrator, "ldap" para os demais
     """
-    logger.debug(f"Tentando autenticar usuário: {username}")
+    logger.debug("Tentando autenticar usuário: %s", username)
     try:
         # Caso especial para o administrator
         if username == "administrator":
@@ -123,13 +154,14 @@ def authenticate_user(username: str, password: str) -> dict:
                 }
         
         # Para outros usuários, usa LDAP
-        logger.debug(f"Autenticando usuário {username} via LDAP")
+        logger.debug("Autenticando usuário %s via LDAP", username)
         try:
-            ldap_result = ldap_service.authenticate(username, password)
-            logger.debug(f"Resultado da autenticação LDAP: {ldap_result}")
+            with span("ldap.authenticate"):
+                ldap_result = get_ldap_service().authenticate(username, password)
+            logger.debug("Resultado da autenticação LDAP: %s", ldap_result)
             
             if ldap_result:
-                logger.info(f"Usuário {username} autenticado via LDAP")
+                logger.info("Usuário %s autenticado via LDAP", username)
                 return {
                     "username": username,
                     "authenticated": True,
@@ -139,7 +171,7 @@ def authenticate_user(username: str, password: str) -> dict:
                     "groups": ["Usuários"]
                 }
             else:
-                logger.warning(f"Autenticação LDAP falhou para {username}")
+                logger.warning("Autenticação LDAP falhou para %s", username)
                 return {
                     "username": username,
                     "authenticated": False,
@@ -172,8 +204,10 @@ def get_current_user(token: str) -> Dict[str, Any]:
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    from jose import JWTError
+
     try:
-        payload = jwt.decode(token, settings.auth.secret_key, algorithms=[settings.auth.algorithm])
+        payload = decode_token(token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
@@ -194,51 +228,3 @@ def get_current_active_user(current_user: Dict[str, Any] = Depends(get_current_u
     if not current_user.get("authenticated"):
         raise HTTPException(status_code=400, detail="Usuário inativo")
     return current_user
-
-
-def create_initial_data(db: Session) -> None:
-    """Cria dados iniciais no banco de dados."""
-    # Criar perfis básicos
-    roles = [
-        {"name": "admin", "description": "Administrador do sistema"},
-        {"name": "viewer", "description": "Usuário com permissões de visualização"},
-        {"name": "editor", "description": "Usuário com permissões de edição"}
-    ]
-    
-    for role_data in roles:
-        role = db.query(Role).filter(Role.name == role_data["name"]).first()
-        if not role:
-            role = Role(**role_data)
-            db.add(role)
-    
-    # Criar permissões básicas
-    permissions = [
-        {"name": "admin:all", "description": "Acesso total ao sistema"},
-        {"name": "users:read", "description": "Visualizar usuários"},
-        {"name": "users:write", "description": "Gerenciar usuários"},
-        {"name": "modules:read", "description": "Visualizar módulos"},
-        {"name": "modules:write", "description": "Gerenciar módulos"}
-    ]
-    
-    for perm_data in permissions:
-        perm = db.query(Permission).filter(Permission.name == perm_data["name"]).first()
-        if not perm:
-            perm = Permission(**perm_data)
-            db.add(perm)
-    
-    # Criar usuário administrator local
-    admin_user = db.query(User).filter(User.username == "administrator").first()
-    if not admin_user:
-        admin_role = db.query(Role).filter(Role.name == "admin").first()
-        if admin_role:
-            admin_user = User(
-                username="administrator",
-                email="admin@omnicorp.local",
-                full_name="Administrador do Sistema",
-                hashed_password=get_password_hash("admin@123"),
-                is_ad_user=False,
-                role_id=admin_role.id
-            )
-            db.add(admin_user)
-    
-    db.commit() 
\ No newline at end of file
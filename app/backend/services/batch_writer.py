@@ -0,0 +1,140 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+from app.backend.services.metrics_service import BATCH_FLUSH_LATENCY, BATCH_FLUSH_SIZE, BATCH_WRITER_DROPPED
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class BatchWriter:
+    """
+    Grava itens em lote a partir de uma thread própria (write-behind).
+
+    put() apenas enfileira; a thread chama flush(itens) quando o lote atinge
+    batch_size ou quando flush_interval segundos se passam desde o primeiro item
+    pendente. A fila é limitada a max_pending itens: com a fila cheia, put()
+    descarta o item, ou espera até timeout segundos quando informado.
+
+    Com retries, um lote que falha é regravado com espera crescente antes de
+    ser descartado; enquanto isso a fila enche e os produtores passam a esperar
+    (back-pressure) em vez de acumular memória.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush: Callable[[List[Any]], None],
+        batch_size: int,
+        flush_interval: float,
+        max_pending: int,
+        retries: int = 0,
+        retry_backoff: float = 0.5
+    ):
+        self.name = name
+        self.flush = flush
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self._queue: "queue.Queue[Any]" = queue.Queue(max_pending)
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Inicia a thread de gravação (uma por processo; chamar após o fork do worker)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name=f"batch-writer-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Grava os itens pendentes e encerra a thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def offer(self, item: Any) -> bool:
+        """Enfileira o item apenas se houver espaço, sem contabilizá-lo como descartado."""
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            return False
+
+    def put(self, item: Any, timeout: Optional[float] = None) -> bool:
+        """Enfileira um item; retorna False quando ele é descartado por falta de espaço."""
+        try:
+            if timeout is None:
+                self._queue.put_nowait(item)
+            else:
+                self._queue.put(item, timeout=timeout)
+            return True
+        except queue.Full:
+            BATCH_WRITER_DROPPED.labels(self.name, "queue_full").inc()
+            return False
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+
+        # Esvazia o que restou na fila antes de encerrar
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                batch.append(item)
+        for start in range(0, len(batch), self.batch_size):
+            self._write(batch[start:start + self.batch_size])
+
+    def _write(self, batch: List[Any]):
+        start = time.perf_counter()
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    self.flush(batch)
+                    return
+                except Exception as e:
+                    if attempt < self.retries:
+                        logger.warning(
+                            "Falha ao gravar lote em %s (tentativa %d): %s", self.name, attempt + 1, e
+                        )
+                        time.sleep(self.retry_backoff * (2 ** attempt))
+                        continue
+                    BATCH_WRITER_DROPPED.labels(self.name, "flush_error").inc(len(batch))
+                    logger.error(
+                        "Falha ao gravar lote de %d itens em %s: %s", len(batch), self.name, e, exc_info=e
+                    )
+        finally:
+            BATCH_FLUSH_LATENCY.labels(self.name).observe(time.perf_counter() - start)
+            BATCH_FLUSH_SIZE.labels(self.name).observe(len(batch))
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+from typing import Any, Dict
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.backend.middleware.auth_middleware import resolve_permissions
+from app.backend.services.identity_service import get_identity
+from app.backend.services.module_service import get_accessible_modules
+from app.backend.services.redis_service import redis_service
+from app.backend.services.tracing_service import span
+
+logger = logging.getLogger(__name__)
+
+# Catálogos cujas versões o frontend usa para decidir se precisa recarregá-los
+BOOTSTRAP_CATALOGS = ("modules", "roles", "profiles", "permissions")
+
+
+class InactiveUser(Exception):
+    """O usuário do token não existe mais ou foi desativado."""
+
+
+def _identity_and_menu(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Usuário, permissões efetivas e menu de módulos; usa a mesma sessão, em sequência.
+
+    Tudo sai dos caches usados pelas demais requisições (identidade, permissões
+    e menu por conjunto de permissões): com eles aquecidos, nenhuma consulta ao banco.
+    """
+    username = payload.get("sub")
+    current = get_identity(db, username)
+    if current is None or not current.is_active:
+        raise InactiveUser(username)
+
+    # As mesmas permissões que check_permission concede; as do token não são consideradas
+    permissions = resolve_permissions(current, db)
+
+    identity = {
+        "username": username,
+        "display_name": "Administrador do Sistema" if username == "administrator" else username,
+        "groups": payload.get("groups", ["Usuários"]),
+        "id": current.id,
+        "email": current.email,
+        "full_name": current.full_name,
+        "is_active": current.is_active,
+        "is_ad_user": current.is_ad_user,
+        "role": {"id": current.role_id, "name": current.role_name} if current.role_name is not None else None,
+    }
+
+    with span("bootstrap.modules"):
+        modules = get_accessible_modules(db, permissions)
+
+    return {"user": identity, "permissions": sorted(permissions), "modules": modules}
+
+
+def _catalog_versions() -> Dict[str, int]:
+    try:
+        return redis_service.get_catalog_versions(*BOOTSTRAP_CATALOGS)
+    except Exception as e:
+        logger.warning("Versões dos catálogos indisponíveis: %s", e)
+        return {}
+
+
+async def build_bootstrap(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Monta a resposta de /api/auth/bootstrap.
+
+    Identidade e menu (banco e cache do menu) e versões dos catálogos (Redis)
+    são obtidos em paralelo, cada parte em uma thread do pool.
+    """
+    with span("bootstrap.build"):
+        session_part, versions = await asyncio.gather(
+            run_in_threadpool(_identity_and_menu, db, payload),
+            run_in_threadpool(_catalog_versions),
+        )
+    session_part["catalog_versions"] = versions
+    return session_part
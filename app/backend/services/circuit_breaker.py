@@ -0,0 +1,71 @@
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    """A dependência está marcada como indisponível; a chamada nem foi tentada."""
+
+
+class CircuitBreaker:
+    """
+    Disjuntor por processo para uma dependência externa.
+
+    Após failure_threshold falhas consecutivas o circuito abre e as chamadas
+    falham imediatamente com CircuitOpen. Passados reset_seconds, uma única
+    chamada de teste é liberada (meio-aberto): sucesso fecha o circuito,
+    falha o reabre por mais reset_seconds. clock mede o tempo (monotônico)
+    e pode ser trocado nos testes.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float, on_state_change=None,
+                 clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.on_state_change = on_state_change
+        self.clock = clock
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            previous, self.state = self.state, state
+            if self.on_state_change is not None:
+                self.on_state_change(self.name, previous, state)
+
+    def before_call(self):
+        """Levanta CircuitOpen quando a chamada não deve ser tentada."""
+        if self.state == CLOSED:
+            return
+        with self._lock:
+            if self.state == OPEN:
+                if self.clock() - self._opened_at < self.reset_seconds:
+                    raise CircuitOpen(self.name)
+                self._set_state(HALF_OPEN)
+            # Meio-aberto: apenas uma chamada de teste por vez
+            if self._trial_in_flight:
+                raise CircuitOpen(self.name)
+            self._trial_in_flight = True
+
+    def record_success(self):
+        if self.state == CLOSED and self._failures == 0:
+            return
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            self._set_state(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = self.clock()
+                self._set_state(OPEN)
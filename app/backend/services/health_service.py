@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import socket
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import create_engine, text
+
+from app.backend.config.database import engine
+from app.backend.config.settings import settings
+from app.backend.services.redis_service import redis_service
+
+logger = logging.getLogger(__name__)
+
+LDAP_PORT = 389
+
+
+_probe_engine = None
+
+
+def _get_probe_engine():
+    """
+    Engine própria dos testes, com uma única conexão e timeouts no driver.
+
+    O pool da aplicação não é usado: com ele esgotado o teste ficaria na fila, e
+    um timeout de leitura nas conexões da aplicação interromperia consultas longas.
+    """
+    global _probe_engine
+    if _probe_engine is None:
+        timeout = settings.health.probe_timeout
+        connect_args = {}
+        if engine.url.drivername.endswith("pymysql"):
+            connect_args = {"connect_timeout": timeout, "read_timeout": timeout, "write_timeout": timeout}
+        _probe_engine = create_engine(
+            engine.url,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=timeout,
+            pool_recycle=300,
+            connect_args=connect_args,
+        )
+    return _probe_engine
+
+
+def probe_database():
+    with _get_probe_engine().connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def probe_redis():
+    redis_service.execute("ping")
+
+
+def probe_ldap():
+    # Apenas abre a conexão TCP: um bind consumiria a conta de serviço a cada verificação.
+    # O timeout do socket limita a própria thread, não só a espera do loop
+    with socket.create_connection((settings.ldap.server, LDAP_PORT), timeout=settings.health.probe_timeout):
+        pass
+
+
+PROBES: Dict[str, Callable[[], None]] = {
+    "database": probe_database,
+    "redis": probe_redis,
+    "ldap": probe_ldap,
+}
+
+
+class HealthService:
+    """
+    Verifica a disponibilidade das dependências para o endpoint de readiness.
+
+    Os testes rodam em segundo plano a cada health.refresh_seconds e o endpoint
+    apenas lê o último resultado, de modo que a frequência das verificações do
+    balanceador não aumenta a carga sobre o banco, o Redis ou o AD.
+    """
+
+    def __init__(self):
+        self.required = {name.strip() for name in settings.health.required.split(",") if name.strip()}
+        self._results: Optional[Dict[str, Dict[str, Any]]] = None
+        self._checked_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        # Pool próprio: um teste travado nunca ocupa as threads de run_in_threadpool
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight: Dict[str, Future] = {}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=len(PROBES), thread_name_prefix="health-probe")
+        return self._executor
+
+    async def _run_probe(self, name: str, probe: Callable[[], None]):
+        start = time.perf_counter()
+        error = None
+        previous = self._in_flight.get(name)
+        if previous is not None and not previous.done():
+            # O wait_for abandona a thread sem pará-la: não empilha outro teste sobre ela
+            error = "verificação anterior ainda em andamento"
+        else:
+            future = self._get_executor().submit(probe)
+            self._in_flight[name] = future
+            try:
+                await asyncio.wait_for(asyncio.wrap_future(future), settings.health.probe_timeout)
+            except asyncio.TimeoutError:
+                error = "timeout"
+            except Exception as e:
+                error = str(e)
+        return name, {
+            "status": "up" if error is None else "down",
+            "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+            "required": name in self.required,
+            "error": error,
+        }
+
+    async def refresh(self):
+        results = await asyncio.gather(*(self._run_probe(name, probe) for name, probe in PROBES.items()))
+        self._results = dict(results)
+        self._checked_at = time.time()
+
+    def _is_stale(self) -> bool:
+        # Tolera um ciclo de atraso da tarefa em segundo plano antes de testar novamente
+        return self._checked_at is None or time.time() - self._checked_at > settings.health.refresh_seconds * 2
+
+    async def get_status(self) -> Dict[str, Any]:
+        if self._is_stale():
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if self._is_stale():
+                    await self.refresh()
+
+        ready = all(
+            result["status"] == "up"
+            for name, result in self._results.items()
+            if result["required"]
+        )
+        return {
+            "status": "ready" if ready else "not_ready",
+            "checked_at": datetime.utcfromtimestamp(self._checked_at).isoformat() + "Z",
+            "dependencies": self._results,
+        }
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Falha ao atualizar o estado das dependências")
+            await asyncio.sleep(settings.health.refresh_seconds)
+
+    def start(self):
+        """Inicia a atualização periódica (chamado no startup do worker)."""
+        self._lock = asyncio.Lock()
+        self._task = asyncio.get_running_loop().create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self._in_flight.clear()
+
+
+# Instância global do serviço de health check
+health_service = HealthService()
@@ -0,0 +1,187 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.backend.models.user import User
+from app.backend.services.redis_service import redis_service
+
+logger = logging.getLogger(__name__)
+
+# Identidades mantidas em memória por worker
+LOCAL_CACHE_SIZE = 4096
+
+
+class Identity:
+    """
+    Dados do usuário autenticado necessários à autorização.
+
+    Imutável e sem relacionamentos: nada é carregado do banco depois da
+    autenticação. Substitui o objeto ORM User em get_current_user e no bootstrap.
+    """
+
+    __slots__ = (
+        "id", "username", "email", "full_name", "is_active", "is_ad_user",
+        "role_id", "role_name", "profile_ids", "profile_names"
+    )
+
+    def __init__(
+        self,
+        id: int,
+        username: str,
+        email: Optional[str],
+        full_name: Optional[str],
+        is_active: bool,
+        is_ad_user: bool,
+        role_id: Optional[int],
+        role_name: Optional[str],
+        profile_ids: Iterable[int],
+        profile_names: Iterable[str]
+    ):
+        object.__setattr__(self, "id", id)
+        object.__setattr__(self, "username", username)
+        object.__setattr__(self, "email", email)
+        object.__setattr__(self, "full_name", full_name)
+        object.__setattr__(self, "is_active", is_active)
+        object.__setattr__(self, "is_ad_user", is_ad_user)
+        object.__setattr__(self, "role_id", role_id)
+        object.__setattr__(self, "role_name", role_name)
+        object.__setattr__(self, "profile_ids", tuple(profile_ids))
+        object.__setattr__(self, "profile_names", tuple(profile_names))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Identity é imutável")
+
+    def __delattr__(self, name):
+        raise AttributeError("Identity é imutável")
+
+    def __repr__(self) -> str:
+        return f"Identity(id={self.id!r}, username={self.username!r})"
+
+    @classmethod
+    def from_user(cls, user: User) -> "Identity":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=user.is_active,
+            is_ad_user=user.is_ad_user,
+            role_id=user.role_id,
+            role_name=user.role.name if user.role else None,
+            profile_ids=[profile.id for profile in user.profiles],
+            profile_names=[profile.name for profile in user.profiles],
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Identity":
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _LocalIdentityCache:
+    """LRU em memória: username -> (versão, Identity)."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: "OrderedDict[str, Tuple[int, Identity]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, username: str) -> Optional[Tuple[int, Identity]]:
+        with self._lock:
+            item = self._items.get(username)
+            if item is not None:
+                self._items.move_to_end(username)
+            return item
+
+    def set(self, username: str, version: int, identity: Identity):
+        with self._lock:
+            self._items[username] = (version, identity)
+            self._items.move_to_end(username)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def discard(self, username: str):
+        with self._lock:
+            self._items.pop(username, None)
+
+
+_local_cache = _LocalIdentityCache(LOCAL_CACHE_SIZE)
+
+
+def _load_identity(db: Session, username: str) -> Optional[Identity]:
+    user = (
+        db.query(User)
+        .options(selectinload(User.profiles), joinedload(User.role))
+        .filter(User.username == username)
+        .first()
+    )
+    return Identity.from_user(user) if user else None
+
+
+def get_identity(db: Session, username: str) -> Optional[Identity]:
+    """
+    Resolve a identidade do usuário sem consultar o banco no caso comum.
+
+    A identidade fica em memória no worker e no Redis, acompanhada da versão
+    do usuário no momento em que foi carregada. Cada requisição confere a versão
+    atual (um GET no Redis); alterações no usuário ou nos seus perfis
+    incrementam a versão e descartam as cópias antigas. Sem Redis, a identidade
+    é lida do banco.
+    """
+    user_id = None
+    try:
+        cached = _local_cache.get(username)
+        if cached is not None:
+            version, identity = cached
+            user_id = identity.id
+            if redis_service.get_identity_version(user_id) == version:
+                return identity
+            _local_cache.discard(username)
+
+        data = redis_service.get_identity(username)
+        if data is not None:
+            user_id = data["identity"]["id"]
+            version = redis_service.get_identity_version(user_id)
+            # Cópias gravadas com outro conjunto de campos são recarregadas
+            if data["version"] == version and set(data["identity"]) == set(Identity.__slots__):
+                identity = Identity.from_dict(data["identity"])
+                _local_cache.set(username, version, identity)
+                return identity
+
+        return _refresh_identity(db, username, user_id)
+    except Exception as e:
+        logger.warning("Cache de identidade indisponível: %s", e)
+        return _load_identity(db, username)
+
+
+def _refresh_identity(db: Session, username: str, user_id: Optional[int]) -> Optional[Identity]:
+    if user_id is None:
+        user_id = db.query(User.id).filter(User.username == username).scalar()
+        if user_id is None:
+            return None
+
+    # A versão é lida antes dos dados: uma alteração concorrente deixa a cópia
+    # com versão antiga, e ela é recarregada na próxima requisição
+    version = redis_service.get_identity_version(user_id)
+    identity = _load_identity(db, username)
+    if identity is None:
+        return None
+    redis_service.set_identity(username, {"version": version, "identity": identity.to_dict()})
+    _local_cache.set(username, version, identity)
+    return identity
+
+
+def invalidate_identities(user_ids: Iterable[int]):
+    """Descarta as identidades em cache dos usuários informados (em todos os workers)."""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    try:
+        redis_service.bump_identity_versions(user_ids)
+    except Exception as e:
+        logger.warning("Não foi possível invalidar as identidades %s: %s", user_ids, e)
@@ -0,0 +1,110 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.backend.config.settings import settings
+from app.backend.middleware.auth_middleware import resolve_permissions
+from app.backend.services.auth_service import decode_token
+from app.backend.services.identity_service import get_identity
+from app.backend.services.metrics_service import record_cache_lookup
+from app.backend.services.revocation_service import revocation_list
+
+logger = logging.getLogger(__name__)
+
+INACTIVE = {"active": False}
+
+
+class _IntrospectionCache:
+    """LRU em memória: hash do token -> (expira em, resposta, jti)."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: "OrderedDict[str, Tuple[float, Dict[str, Any], Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], Optional[str]]]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            if item[0] <= time.time():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return item[1], item[2]
+
+    def set(self, key: str, expires_at: float, result: Dict[str, Any], jti: Optional[str]):
+        with self._lock:
+            self._items[key] = (expires_at, result, jti)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+
+_cache = _IntrospectionCache(settings.auth.introspection_cache_size)
+
+
+def _inspect(db: Session, token: str) -> Tuple[Dict[str, Any], Optional[str], Optional[float]]:
+    """Resposta RFC 7662 do token, seu jti e a expiração (timestamp)."""
+    from jose import JWTError
+
+    try:
+        payload = decode_token(token)
+    except JWTError:
+        return INACTIVE, None, None
+
+    username = payload.get("sub")
+    if not username:
+        return INACTIVE, None, None
+
+    # Mesmas regras de check_permission: usuário existente e ativo, permissões dos perfis
+    identity = get_identity(db, username)
+    if identity is None or not identity.is_active:
+        return INACTIVE, payload.get("jti"), payload.get("exp")
+    permissions = resolve_permissions(identity, db)
+
+    result = {
+        "active": True,
+        "sub": username,
+        "exp": payload.get("exp"),
+        "iss": payload.get("iss"),
+        "jti": payload.get("jti"),
+        "token_type": "Bearer",
+        "permissions": sorted(permissions),
+        "scope": " ".join(sorted(permissions)),
+    }
+    return result, payload.get("jti"), payload.get("exp")
+
+
+def introspect_token(db: Session, token: str) -> Dict[str, Any]:
+    """
+    Introspecção de um token com cache local.
+
+    As respostas ficam em memória por até auth.introspection_cache_seconds,
+    nunca além da expiração do token. Um acerto no cache ainda consulta o filtro
+    de revogação (em memória), de modo que o logout vale imediatamente.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    cached = _cache.get(key)
+    record_cache_lookup("introspection", cached is not None)
+    if cached is not None:
+        result, jti = cached
+        if result["active"] and revocation_list.is_revoked(jti):
+            return INACTIVE
+        return result
+
+    result, jti, exp = _inspect(db, token)
+    expires_at = time.time() + settings.auth.introspection_cache_seconds
+    if exp is not None:
+        expires_at = min(expires_at, float(exp))
+    _cache.set(key, expires_at, result, jti)
+    return result
+
+
+def introspect_tokens(db: Session, tokens: List[str]) -> List[Dict[str, Any]]:
+    return [introspect_token(db, token) for token in tokens]
@@ -0,0 +1,193 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.backend.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_SIZE = 2048
+GENERATED_KEY_FILE = "signing-key.pem"
+# Arquivo do diretório de chaves com o nome da chave ativa; relido junto com o diretório
+ACTIVE_KEY_FILE = "active"
+# Tempo que os consumidores podem manter o JWKS em cache
+JWKS_MAX_AGE_SECONDS = 300
+
+
+def _b64url_uint(value: int) -> str:
+    data = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def public_jwk(private_pem: bytes) -> Dict[str, str]:
+    """JWK público (RSA) da chave, com kid igual ao thumbprint RFC 7638."""
+    from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+    numbers = load_pem_private_key(private_pem, password=None).public_key().public_numbers()
+    jwk = {"e": _b64url_uint(numbers.e), "kty": "RSA", "n": _b64url_uint(numbers.n)}
+    canonical = json.dumps(jwk, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    kid = base64.urlsafe_b64encode(hashlib.sha256(canonical).digest()).decode("ascii").rstrip("=")
+    return {**jwk, "kid": kid, "alg": "RS256", "use": "sig"}
+
+
+def ensure_signing_key(keys_dir: str) -> bool:
+    """
+    Gera uma chave de assinatura quando o diretório não tem nenhuma.
+
+    A chave é escrita em um arquivo temporário e publicada com os.link, que
+    falha se o arquivo já existir: processos concorrentes nunca deixam duas
+    chaves "iniciais" nem um arquivo parcialmente escrito.
+    """
+    os.makedirs(keys_dir, exist_ok=True)
+    if any(name.endswith(".pem") for name in os.listdir(keys_dir)):
+        return False
+
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=KEY_SIZE)
+    pem = key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    fd, temp_path = tempfile.mkstemp(dir=keys_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(pem)
+        os.chmod(temp_path, 0o600)
+        try:
+            os.link(temp_path, os.path.join(keys_dir, GENERATED_KEY_FILE))
+        except FileExistsError:
+            return False
+    finally:
+        os.unlink(temp_path)
+    logger.info("Chave de assinatura de tokens gerada em %s", keys_dir)
+    return True
+
+
+class KeyStore:
+    """
+    Chaves RSA de assinatura dos tokens, lidas de settings.auth.keys_dir.
+
+    Todas as chaves do diretório são publicadas no JWKS e aceitas na
+    verificação. A chave que assina os novos tokens é a indicada no arquivo
+    ACTIVE_KEY_FILE do diretório (ou em JWT_ACTIVE_KEY); sem indicação, é a
+    mais recente entre as publicadas há mais de JWKS_MAX_AGE_SECONDS, para que
+    os consumidores já a tenham no JWKS em cache. Rotação: adicionar a nova
+    chave, aguardar JWKS_MAX_AGE_SECONDS, gravar o nome dela em ACTIVE_KEY_FILE
+    e remover a antiga depois que os tokens assinados por ela expirarem. O
+    diretório é relido no máximo a cada auth.keys_refresh_seconds.
+
+    As chaves são geradas apenas pela migração; sem nenhuma chave no diretório
+    a aplicação falha em vez de criar uma chave própria por instância.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._fingerprint: Optional[Tuple] = None
+        self._keys: Dict[str, Tuple[bytes, Dict[str, str]]] = {}
+        self._published_at: Dict[str, float] = {}
+        self._active: Optional[Tuple[str, bytes]] = None
+        self._public: Dict[str, Dict[str, str]] = {}
+        self._jwks: bytes = b'{"keys":[]}'
+        self._jwks_etag = ""
+
+    def _scan(self) -> Tuple[List[Tuple[str, float]], Optional[str]]:
+        keys_dir = settings.auth.keys_dir
+        try:
+            names = os.listdir(keys_dir)
+        except FileNotFoundError:
+            names = []
+        entries = []
+        for name in names:
+            if name.endswith(".pem"):
+                entries.append((name, os.stat(os.path.join(keys_dir, name)).st_mtime))
+        if not entries:
+            raise RuntimeError(
+                f"Nenhuma chave de assinatura em {keys_dir}; execute a migração "
+                "(python -m app.backend.database.migrate) ou compartilhe o diretório entre as instâncias"
+            )
+
+        active_name = None
+        if ACTIVE_KEY_FILE in names:
+            with open(os.path.join(keys_dir, ACTIVE_KEY_FILE), encoding="utf-8") as handle:
+                active_name = handle.read().strip() or None
+        return sorted(entries), active_name
+
+    def _choose_active(self, active_name: Optional[str]) -> str:
+        active_name = active_name or settings.auth.active_key
+        if active_name in self._keys:
+            return active_name
+        if active_name:
+            logger.error("Chave ativa %s não encontrada; usando a mais recente já publicada", active_name)
+
+        # Uma chave recém-adicionada só assina depois que os consumidores puderam
+        # atualizar o JWKS; sem nenhuma publicada há tempo suficiente, usa a mais antiga
+        published_before = time.time() - JWKS_MAX_AGE_SECONDS
+        by_age = sorted(self._published_at.items(), key=lambda entry: entry[1])
+        eligible = [name for name, published in by_age if published <= published_before]
+        return eligible[-1] if eligible else by_age[0][0]
+
+    def _refresh(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._checked_at < settings.auth.keys_refresh_seconds and self._active:
+            return
+        with self._lock:
+            if not force and now - self._checked_at < settings.auth.keys_refresh_seconds and self._active:
+                return
+            entries, active_name = self._scan()
+            self._checked_at = now
+
+            fingerprint = tuple(entries)
+            if fingerprint != self._fingerprint:
+                keys = {}
+                for name, _ in entries:
+                    with open(os.path.join(settings.auth.keys_dir, name), "rb") as handle:
+                        pem = handle.read()
+                    keys[name] = (pem, public_jwk(pem))
+                self._keys = keys
+                self._published_at = dict(entries)
+                self._public = {jwk["kid"]: jwk for _, jwk in keys.values()}
+                self._jwks = json.dumps({"keys": list(self._public.values())}, separators=(",", ":")).encode("utf-8")
+                self._jwks_etag = f'"{hashlib.sha256(self._jwks).hexdigest()[:32]}"'
+                self._fingerprint = fingerprint
+
+            # Reavaliada a cada leitura: uma chave passa a ser elegível com o tempo
+            active_pem, active_jwk = self._keys[self._choose_active(active_name)]
+            if self._active is None or self._active[0] != active_jwk["kid"]:
+                logger.info("Chaves de assinatura carregadas: %d (ativa %s)", len(self._keys), active_jwk["kid"])
+            self._active = (active_jwk["kid"], active_pem)
+
+    def check(self):
+        """Carrega as chaves na inicialização do worker; falha se não houver nenhuma."""
+        self._refresh(force=True)
+
+    def signing_key(self) -> Tuple[str, bytes]:
+        """(kid, chave privada em PEM) da chave ativa."""
+        self._refresh()
+        return self._active
+
+    def verification_key(self, kid: Optional[str]) -> Optional[Dict[str, Any]]:
+        """JWK público correspondente ao kid; relê o diretório uma vez se o kid for desconhecido."""
+        self._refresh()
+        key = self._public.get(kid)
+        if key is None and kid and time.monotonic() - self._checked_at >= 1.0:
+            self._refresh(force=True)
+            key = self._public.get(kid)
+        return key
+
+    def jwks(self) -> Tuple[bytes, str]:
+        """Documento JWKS já serializado e a sua ETag."""
+        self._refresh()
+        return self._jwks, self._jwks_etag
+
+
+key_store = KeyStore()
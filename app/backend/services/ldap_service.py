@@ -1,9 +1,9 @@
-import ldap
 import logging
-import traceback
 import re
+from functools import lru_cache
 from typing import Optional, Dict, Any, List
 from app.backend.config.settings import settings
+from app.backend.services.metrics_service import LDAP_LATENCY, timed
 
 logger = logging.getLogger(__name__)
 
@@ -15,12 +15,11 @@ class LDAPService:
         self.base_dn = settings.ldap.base_dn
         self.username = settings.ldap.username
         self.password = settings.ldap.password
-        logger.debug(f"Configuração LDAP: server={self.server}, domain={self.domain}")
+        logger.debug("Configuração LDAP: server=%s, domain=%s", self.server, self.domain)
 
     def log_exception(self, e: Exception, context: str = ""):
         """Registra exceção com traceback completo"""
-        logger.error(f"ERRO LDAP em {context}: {str(e)}")
-        logger.error(f"TRACEBACK LDAP: {''.join(traceback.format_exception(None, e, e.__traceback__))}")
+        logger.error("ERRO LDAP em %s: %s", context, e, exc_info=e)
 
     def extract_cn_name(self, dn: str) -> str:
         """Extrai o nome do CN de um DN"""
@@ -41,9 +40,11 @@ class LDAPService:
         Returns:
             Dict: Dicionário com dados do usuário ou None se falhar
         """
-        logger.debug(f"Tentando autenticar usuário {username} via LDAP")
+        logger.debug("Tentando autenticar usuário %s via LDAP", username)
+        # Importado sob demanda: o python-ldap só é carregado no primeiro login via AD
+        import ldap
         try:
-            logger.debug(f"Inicializando conexão LDAP para servidor {self.server}")
+            logger.debug("Inicializando conexão LDAP para servidor %s", self.server)
             conn = ldap.initialize(f"ldap://{self.server}")
             conn.protocol_version = ldap.VERSION3
             conn.set_option(ldap.OPT_REFERRALS, 0)
@@ -51,25 +52,27 @@ class LDAPService:
             # Extrai o nome de usuário do email
             original_username = username
             username = username.split('@')[0]
-            logger.debug(f"Username extraído: {username} (original: {original_username})")
+            logger.debug("Username extraído: %s (original: %s)", username, original_username)
             
             # Conecta com as credenciais do usuário
             bind_dn = f"{username}@{self.domain}"
-            logger.debug(f"Tentando bind com DN: {bind_dn}")
-            conn.simple_bind_s(bind_dn, password)
+            logger.debug("Tentando bind com DN: %s", bind_dn)
+            with timed(LDAP_LATENCY, "bind"):
+                conn.simple_bind_s(bind_dn, password)
             logger.debug("Bind LDAP bem sucedido")
             
             # Busca o usuário no AD, incluindo subrepositórios
             search_filter = f"(&(objectClass=user)(mail={original_username}))"
-            logger.debug(f"Executando busca LDAP: base_dn={self.base_dn}, filtro={search_filter}")
-            result = conn.search_s(
-                self.base_dn,
-                ldap.SCOPE_SUBTREE,
-                search_filter,
-                ["sAMAccountName", "mail", "displayName", "memberOf"]
-            )
+            logger.debug("Executando busca LDAP: base_dn=%s, filtro=%s", self.base_dn, search_filter)
+            with timed(LDAP_LATENCY, "search"):
+                result = conn.search_s(
+                    self.base_dn,
+                    ldap.SCOPE_SUBTREE,
+                    search_filter,
+                    ["sAMAccountName", "mail", "displayName", "memberOf"]
+                )
             
-            logger.debug(f"Resultado da busca LDAP: {result}")
+            logger.debug("Resultado da busca LDAP: %s", result)
             
             if not result:
                 return None
@@ -89,7 +92,7 @@ class LDAPService:
                     group_name = self.extract_cn_name(group_dn.decode('utf-8'))
                     member_of.append(group_name)
             
-            logger.debug(f"Grupos do usuário: {member_of}")
+            logger.debug("Grupos do usuário: %s", member_of)
             
             user_data = {
                 "username": original_username,
@@ -99,11 +102,11 @@ class LDAPService:
                 "groups": member_of if member_of else ["Usuários"]
             }
             
-            logger.debug(f"Dados do usuário LDAP: {user_data}")
+            logger.debug("Dados do usuário LDAP: %s", user_data)
             return user_data
             
         except ldap.INVALID_CREDENTIALS:
-            logger.warning(f"Credenciais inválidas para o usuário {username}")
+            logger.warning("Credenciais inválidas para o usuário %s", username)
             return None
         except Exception as e:
             self.log_exception(e, f"autenticação LDAP para {username}")
@@ -113,5 +116,7 @@ class LDAPService:
                 logger.debug("Desconectando da sessão LDAP")
                 conn.unbind_s()
 
-# Criando e exportando a instância do serviço LDAP
-ldap_service = LDAPService() 
\ No newline at end of file
+@lru_cache(maxsize=None)
+def get_ldap_service() -> LDAPService:
+    """Retorna a instância única do serviço LDAP, criada no primeiro uso."""
+    return LDAPService()
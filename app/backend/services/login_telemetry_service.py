@@ -0,0 +1,68 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import bindparam
+
+from app.backend.config.database import engine
+from app.backend.config.settings import settings
+from app.backend.models.login_event import LoginEvent
+from app.backend.models.user import User
+from app.backend.services.batch_writer import BatchWriter
+from app.backend.services.metrics_service import LOGIN_ATTEMPTS
+
+logger = logging.getLogger(__name__)
+
+_login_events = LoginEvent.__table__
+_users = User.__table__
+
+_update_last_login = (
+    _users.update()
+    .where(_users.c.username == bindparam("b_username"))
+    .values(last_login=bindparam("b_last_login"))
+)
+
+
+def flush_login_events(events: List[Dict[str, Any]]):
+    """Insere os eventos do lote e atualiza last_login uma vez por usuário, na mesma transação."""
+    last_logins: Dict[str, datetime] = {}
+    for event in events:
+        if event["success"]:
+            username = event["username"]
+            last_logins[username] = max(event["created_at"], last_logins.get(username, event["created_at"]))
+
+    with engine.begin() as connection:
+        connection.execute(_login_events.insert(), events)
+        if last_logins:
+            connection.execute(
+                _update_last_login,
+                [{"b_username": username, "b_last_login": at} for username, at in last_logins.items()]
+            )
+
+
+login_telemetry = BatchWriter(
+    "login_events",
+    flush_login_events,
+    batch_size=settings.telemetry.login_batch_size,
+    flush_interval=settings.telemetry.login_flush_seconds,
+    max_pending=settings.telemetry.login_max_pending,
+)
+
+
+def record_login(
+    username: str,
+    success: bool,
+    auth_type: Optional[str] = None,
+    client_ip: Optional[str] = None,
+    error: Optional[str] = None
+):
+    """Registra uma tentativa de login sem bloquear a requisição."""
+    LOGIN_ATTEMPTS.labels("success" if success else "failure").inc()
+    login_telemetry.put({
+        "username": username[:100],
+        "success": success,
+        "auth_type": auth_type,
+        "client_ip": client_ip,
+        "error": error[:255] if error else None,
+        "created_at": datetime.utcnow(),
+    })
@@ -0,0 +1,198 @@
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+)
+from sqlalchemy import event
+
+from app.backend.services.profiling_service import record_dependency
+from app.backend.services.tracing_service import span, start_span
+
+# Com vários workers (gunicorn), PROMETHEUS_MULTIPROC_DIR agrega as métricas de todos os processos
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requisições HTTP em andamento",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+LDAP_LATENCY = Histogram(
+    "ldap_operation_duration_seconds",
+    "Duração das operações no AD/LDAP",
+    ["operation"],
+)
+REDIS_LATENCY = Histogram(
+    "redis_command_duration_seconds",
+    "Latência dos comandos Redis",
+    ["command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Consultas ao cache Redis por resultado",
+    ["cache", "result"],
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "Duração das consultas SQL",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_connections_checked_out",
+    "Conexões do pool em uso",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_LATENCY = Histogram(
+    "password_hash_duration_seconds",
+    "Duração das operações bcrypt",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Tamanho do corpo das respostas HTTP (após compressão)",
+    ["route"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+SERIALIZATION_LATENCY = Histogram(
+    "response_serialization_duration_seconds",
+    "Tempo de serialização das respostas de listagem",
+    ["endpoint"],
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+BATCH_WRITER_DROPPED = Counter(
+    "batch_writer_dropped_total",
+    "Itens descartados pelos gravadores em lote (fila cheia ou falha na gravação)",
+    ["writer", "reason"],
+)
+BATCH_FLUSH_LATENCY = Histogram(
+    "batch_writer_flush_duration_seconds",
+    "Duração da gravação de cada lote",
+    ["writer"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+BATCH_FLUSH_SIZE = Histogram(
+    "batch_writer_flush_size",
+    "Quantidade de itens gravados por lote",
+    ["writer"],
+    buckets=(1, 5, 10, 50, 100, 250, 500, 1000, 2500),
+)
+LOGIN_ATTEMPTS = Counter(
+    "login_attempts_total",
+    "Tentativas de login por resultado",
+    ["result"],
+)
+LOGIN_REJECTED = Counter(
+    "login_rejected_total",
+    "Logins recusados antes da autenticação, por motivo",
+    ["reason"],
+)
+DIRECTORY_IN_FLIGHT = Gauge(
+    "directory_authentications_in_flight",
+    "Autenticações em andamento no AD/bcrypt",
+    multiprocess_mode="livesum",
+)
+REDIS_CIRCUIT_STATE = Gauge(
+    "redis_circuit_state",
+    "Estado do disjuntor do Redis (0 fechado, 1 meio-aberto, 2 aberto)",
+    multiprocess_mode="max",
+)
+REDIS_FALLBACKS = Counter(
+    "redis_fallbacks_total",
+    "Operações atendidas sem o Redis (cache local ou banco)",
+    ["operation"],
+)
+
+# Nome da dependência registrada no perfil da requisição (ver profiling_service)
+DEPENDENCY_NAMES = {
+    LDAP_LATENCY: "ldap",
+    REDIS_LATENCY: "redis",
+    PASSWORD_HASH_LATENCY: "bcrypt",
+    SERIALIZATION_LATENCY: "serialization",
+}
+
+
+@contextmanager
+def timed(histogram, *labels):
+    """
+    Mede a duração de uma chamada externa.
+
+    Registra no histograma, soma ao perfil da requisição (se perfilada)
+    e abre um span "<dependência>.<operação>" no trace da requisição.
+    """
+    dependency = DEPENDENCY_NAMES.get(histogram, "other")
+    start = time.perf_counter()
+    try:
+        with span(f"{dependency}.{labels[0]}" if labels else dependency):
+            yield
+    finally:
+        elapsed = time.perf_counter() - start
+        metric = histogram.labels(*labels) if labels else histogram
+        metric.observe(elapsed)
+        record_dependency(dependency, elapsed)
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def instrument_engine(engine):
+    """Registra eventos do SQLAlchemy para medir consultas e uso do pool."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # Apenas o texto da instrução vai para o span; os parâmetros podem conter dados pessoais
+        query_span = start_span("sql.query", statement=statement[:300], executemany=executemany)
+        conn.info.setdefault("query_start", []).append((time.perf_counter(), query_span))
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start, query_span = conn.info["query_start"].pop()
+        elapsed = time.perf_counter() - start
+        DB_QUERY_LATENCY.observe(elapsed)
+        record_dependency("sql", elapsed)
+        if query_span is not None:
+            query_span.finish()
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        # after_cursor_execute não é chamado quando a instrução falha
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            _, query_span = conn.info["query_start"].pop()
+            if query_span is not None:
+                query_span.set_error(exception_context.original_exception)
+                query_span.finish()
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.inc()
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+
+
+def render_metrics():
+    """Gera o texto no formato de exposição do Prometheus."""
+    if MULTIPROCESS:
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
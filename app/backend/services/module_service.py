@@ -0,0 +1,63 @@
+import hashlib
+import logging
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy.orm import Session
+
+from app.backend.models.user import Module, Permission
+from app.backend.services.redis_service import redis_service
+from app.backend.utils.serialization import module_to_dict
+
+logger = logging.getLogger(__name__)
+
+
+def permission_set_key(permissions: Iterable[str]) -> str:
+    """Identificador estável de um conjunto de permissões, usado como chave do menu."""
+    joined = "\n".join(sorted(set(permissions)))
+    return hashlib.sha1(joined.encode("utf-8")).hexdigest()
+
+
+def query_accessible_modules(db: Session, permissions: Iterable[str]) -> List[Module]:
+    """Módulos ativos liberados para as permissões informadas, em uma única consulta."""
+    permissions = set(permissions)
+    query = db.query(Module).filter(Module.is_active == True)
+    if "admin:all" not in permissions:
+        if not permissions:
+            return []
+        query = (
+            query.join(Permission, Permission.id == Module.required_permission_id)
+            .filter(Permission.name.in_(permissions))
+        )
+    return query.order_by(Module.id).all()
+
+
+def get_accessible_modules(db: Session, permissions: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Menu de módulos do usuário, em cache por conjunto de permissões.
+
+    Usuários com as mesmas permissões compartilham a mesma entrada; o cache é
+    descartado inteiro quando um módulo é criado, alterado ou removido.
+    """
+    permissions = set(permissions)
+    key = permission_set_key(permissions)
+    try:
+        cached = redis_service.get_module_menu(key)
+        if cached is not None:
+            return cached
+    except Exception as e:
+        logger.warning("Cache do menu de módulos indisponível: %s", e)
+
+    menu = [module_to_dict(module) for module in query_accessible_modules(db, permissions)]
+    try:
+        redis_service.set_module_menu(key, menu)
+    except Exception as e:
+        logger.warning("Não foi possível armazenar o menu de módulos: %s", e)
+    return menu
+
+
+def invalidate_module_menus():
+    """Descarta os menus em cache após alterações nos módulos."""
+    try:
+        redis_service.clear_module_menus()
+    except Exception as e:
+        logger.warning("Não foi possível limpar o cache do menu de módulos: %s", e)
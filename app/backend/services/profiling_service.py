@@ -0,0 +1,93 @@
+import cProfile
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.backend.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILES_KEY = "profiling:requests"
+
+
+class RequestProfile:
+    """Perfil de uma requisição: cProfile da thread do event loop e tempo gasto em cada dependência."""
+
+    __slots__ = ("id", "method", "path", "started_at", "profiler", "dependencies", "_lock")
+
+    def __init__(self, method: str, path: str):
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.started_at = time.time()
+        self.profiler = cProfile.Profile()
+        self.dependencies: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float):
+        # Pode ser chamado das threads do threadpool (endpoints síncronos)
+        with self._lock:
+            entry = self.dependencies.setdefault(name, {"calls": 0, "total_ms": 0.0})
+            entry["calls"] += 1
+            entry["total_ms"] += seconds * 1000
+
+    def to_dict(self, status_code: int, duration: float) -> Dict[str, Any]:
+        output = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=output)
+        stats.sort_stats("cumulative").print_stats(settings.profiling.top_functions)
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": status_code,
+            "started_at": datetime.utcfromtimestamp(self.started_at).isoformat() + "Z",
+            "duration_ms": round(duration * 1000, 2),
+            "dependencies": {
+                name: {"calls": entry["calls"], "total_ms": round(entry["total_ms"], 2)}
+                for name, entry in self.dependencies.items()
+            },
+            "stats": output.getvalue(),
+        }
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current_profile.get()
+
+
+def activate(profile: RequestProfile):
+    return _current_profile.set(profile)
+
+
+def deactivate(token):
+    _current_profile.reset(token)
+
+
+def record_dependency(name: str, seconds: float):
+    """Soma o tempo de uma chamada externa ao perfil da requisição atual, se houver."""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.add(name, seconds)
+
+
+def store_profile(entry: Dict[str, Any]):
+    """Guarda o perfil no buffer circular compartilhado pelos workers (Redis)."""
+    from app.backend.services.redis_service import redis_service
+    try:
+        redis_service.push_capped(PROFILES_KEY, json.dumps(entry), settings.profiling.buffer_size)
+    except Exception as e:
+        logger.warning("Não foi possível armazenar o perfil %s: %s", entry["id"], e)
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    from app.backend.services.redis_service import redis_service
+    return [json.loads(item) for item in redis_service.get_list(PROFILES_KEY)]
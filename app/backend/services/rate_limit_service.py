@@ -0,0 +1,152 @@
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.backend.config.settings import settings
+from app.backend.services.metrics_service import DIRECTORY_IN_FLIGHT, LOGIN_REJECTED
+from app.backend.services.redis_service import redis_service
+
+logger = logging.getLogger(__name__)
+
+
+# Vagas ocupadas pelas autenticações em andamento em todos os workers
+DIRECTORY_SLOTS_KEY = "ratelimit:directory:in_flight"
+
+
+class DirectoryOverloaded(Exception):
+    """O limite de autenticações simultâneas (do worker ou global) foi atingido."""
+
+
+def _username_window_key(username: str) -> str:
+    return f"ratelimit:login:user:{username.strip().lower()[:100]}"
+
+
+def _window_member(now_ms: int) -> str:
+    return f"{now_ms}-{uuid.uuid4().hex[:8]}"
+
+
+def login_retry_after(username: str, client_ip: Optional[str]) -> Optional[int]:
+    """
+    Aplica os limites de tentativas de login por usuário e por IP (janela deslizante no Redis).
+
+    Retorna None quando a tentativa é permitida ou os segundos até que seja.
+    A janela do IP conta toda tentativa; a do usuário apenas é conferida aqui e
+    só recebe as falhas (record_login_failure), para que requisições de
+    terceiros não bloqueiem quem sabe a senha. Sem Redis, a tentativa é
+    permitida: o limite de autenticações simultâneas continua protegendo o AD.
+    """
+    config = settings.rate_limit
+    windows = [(
+        _username_window_key(username),
+        config.login_per_username,
+        config.login_username_window_seconds * 1000,
+        False,
+    )]
+    if client_ip:
+        windows.append((
+            f"ratelimit:login:ip:{client_ip}",
+            config.login_per_ip,
+            config.login_ip_window_seconds * 1000,
+            True,
+        ))
+
+    now_ms = int(time.time() * 1000)
+    try:
+        wait_ms = redis_service.hit_sliding_windows(windows, now_ms, _window_member(now_ms))
+    except Exception as e:
+        logger.warning("Limite de login indisponível (Redis): %s", e)
+        return None
+
+    if wait_ms <= 0:
+        return None
+    LOGIN_REJECTED.labels("rate_limited").inc()
+    return max(1, -(-wait_ms // 1000))
+
+
+def record_login_failure(username: str):
+    """Conta uma autenticação malsucedida na janela do usuário."""
+    now_ms = int(time.time() * 1000)
+    try:
+        redis_service.add_to_sliding_window(
+            _username_window_key(username),
+            settings.rate_limit.login_username_window_seconds * 1000,
+            now_ms,
+            _window_member(now_ms),
+        )
+    except Exception as e:
+        logger.warning("Não foi possível registrar a falha de login (Redis): %s", e)
+
+
+class InFlightLimiter:
+    """
+    Limita as autenticações simultâneas no AD/bcrypt, recusando (sem enfileirar) o excedente.
+
+    Dois limites: worker_limit, contado em memória no worker, e global_limit,
+    somando todos os workers e réplicas. Cada autenticação ocupa uma vaga em um
+    conjunto ordenado no Redis (o mesmo script das janelas de login), liberada
+    ao terminar; a vaga de um worker que caiu no meio da autenticação expira
+    após slot_seconds. Sem Redis, vale apenas o limite do worker.
+
+    slot() é usado apenas a partir do event loop, por isso o contador local
+    dispensa lock; as chamadas ao Redis rodam no pool de threads.
+    """
+
+    def __init__(self, worker_limit: int, global_limit: int, slot_seconds: int):
+        self.worker_limit = worker_limit
+        self.global_limit = global_limit
+        self.slot_seconds = slot_seconds
+        self.in_flight = 0
+
+    def _acquire_global(self) -> Optional[str]:
+        """Ocupa uma vaga global; retorna o id da vaga, ou None quando o Redis está indisponível."""
+        now_ms = int(time.time() * 1000)
+        member = _window_member(now_ms)
+        window = (DIRECTORY_SLOTS_KEY, self.global_limit, self.slot_seconds * 1000, True)
+        try:
+            wait_ms = redis_service.hit_sliding_windows([window], now_ms, member)
+        except Exception as e:
+            logger.warning("Limite global de autenticações indisponível (Redis): %s", e)
+            return None
+        if wait_ms > 0:
+            raise DirectoryOverloaded()
+        return member
+
+    def _release_global(self, member: str):
+        try:
+            redis_service.remove_from_sliding_window(DIRECTORY_SLOTS_KEY, member)
+        except Exception as e:
+            # A vaga expira sozinha após slot_seconds
+            logger.warning("Não foi possível liberar a vaga de autenticação (Redis): %s", e)
+
+    @asynccontextmanager
+    async def slot(self):
+        if self.in_flight >= self.worker_limit:
+            LOGIN_REJECTED.labels("overloaded").inc()
+            raise DirectoryOverloaded()
+        self.in_flight += 1
+        DIRECTORY_IN_FLIGHT.inc()
+        try:
+            try:
+                member = await run_in_threadpool(self._acquire_global)
+            except DirectoryOverloaded:
+                LOGIN_REJECTED.labels("overloaded").inc()
+                raise
+            try:
+                yield
+            finally:
+                if member is not None:
+                    await run_in_threadpool(self._release_global, member)
+        finally:
+            self.in_flight -= 1
+            DIRECTORY_IN_FLIGHT.dec()
+
+
+directory_limiter = InFlightLimiter(
+    settings.rate_limit.directory_max_in_flight,
+    settings.rate_limit.directory_max_in_flight_total,
+    settings.rate_limit.directory_slot_seconds,
+)
@@ -1,66 +1,412 @@
-import redis
 import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
 from datetime import timedelta
+from typing import Any, Dict, Iterable, Optional, Sequence, Set, Tuple
 from app.backend.config.settings import settings
+from app.backend.services.circuit_breaker import CLOSED, HALF_OPEN, CircuitBreaker, CircuitOpen
+from app.backend.services.metrics_service import (
+    REDIS_CIRCUIT_STATE,
+    REDIS_FALLBACKS,
+    REDIS_LATENCY,
+    record_cache_lookup,
+    timed,
+)
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1}
+
+
+class RedisUnavailable(Exception):
+    """O Redis não respondeu (timeout, conexão recusada) ou o disjuntor está aberto."""
+
+
+class _LocalCache:
+    """Cache em memória com expiração, usado quando o Redis está indisponível."""
+
+    def __init__(self, max_size: int = 10000, clock=time.monotonic):
+        self.max_size = max_size
+        self.clock = clock
+        self._items: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            if item[0] <= self.clock():
+                del self._items[key]
+                return None
+            return item[1]
+
+    def set(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            if len(self._items) >= self.max_size and key not in self._items:
+                # Descarta os itens expirados; se não bastar, limpa tudo (é apenas um fallback)
+                now = self.clock()
+                self._items = {k: v for k, v in self._items.items() if v[0] > now}
+                if len(self._items) >= self.max_size:
+                    self._items.clear()
+            self._items[key] = (self.clock() + ttl, value)
+
+    def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._items.pop(key, None)
+
+# Janela deslizante sobre várias chaves: ou a tentativa é registrada em todas,
+# ou em nenhuma. Retorna 0 quando permitida ou os milissegundos até liberar.
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local member = ARGV[2]
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[3 * i])
+    local window = tonumber(ARGV[1 + 3 * i])
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    if redis.call('ZCARD', key) >= limit then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        local retry = tonumber(oldest[2]) + window - now
+        if retry > wait then wait = retry end
+    end
+end
+if wait > 0 then
+    return wait
+end
+for i, key in ipairs(KEYS) do
+    if ARGV[2 + 3 * i] == '1' then
+        redis.call('ZADD', key, now, member)
+        redis.call('PEXPIRE', key, tonumber(ARGV[1 + 3 * i]))
+    end
+end
+return 0
+"""
 
 class RedisService:
     def __init__(self):
-        self.redis_client = redis.Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            db=0,
-            decode_responses=True
-        )
+        self._redis_client = None
+        self._sliding_window = None
         self.expiration_time = timedelta(hours=24)
+        self.breaker = CircuitBreaker(
+            "redis",
+            failure_threshold=settings.redis.breaker_failure_threshold,
+            reset_seconds=settings.redis.breaker_reset_seconds,
+            on_state_change=self._on_circuit_change,
+        )
+        # Permissões recentes, servidas enquanto o Redis está indisponível
+        self._local = _LocalCache()
+        # Invalidações que não chegaram ao Redis; reaplicadas quando ele volta
+        self._pending_deletes: Set[str] = set()
+        self._pending_bumps: Set[int] = set()
+        self._pending_lock = threading.Lock()
 
-    def get_user_permissions(self, user_id: int) -> dict:
-        """Obtém as permissões do usuário do cache."""
-        key = f"user:{user_id}:permissions"
-        cached_data = self.redis_client.get(key)
+    @property
+    def redis_client(self):
+        """Cliente Redis criado no primeiro uso; importar o serviço não abre conexões."""
+        if self._redis_client is None:
+            import redis
+            self._redis_client = redis.Redis(
+                host=settings.redis.host,
+                port=settings.redis.port,
+                db=settings.redis.db,
+                decode_responses=True,
+                socket_connect_timeout=settings.redis.connect_timeout,
+                socket_timeout=settings.redis.socket_timeout,
+                health_check_interval=30
+            )
+        return self._redis_client
+
+    def _on_circuit_change(self, name: str, previous: str, state: str):
+        REDIS_CIRCUIT_STATE.set(CIRCUIT_STATE_VALUES.get(state, 2))
+        if state == CLOSED:
+            logger.info("Redis disponível novamente (disjuntor fechado)")
+        else:
+            logger.warning("Disjuntor do Redis: %s -> %s", previous, state)
+
+    @contextmanager
+    def guarded(self, command: str):
+        """
+        Protege uma chamada ao Redis com o disjuntor e mede sua latência.
+
+        Timeouts e falhas de conexão contam para o disjuntor e viram
+        RedisUnavailable; com o circuito aberto, a chamada nem é tentada.
+        """
+        from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+        try:
+            self.breaker.before_call()
+        except CircuitOpen:
+            raise RedisUnavailable("disjuntor aberto")
+        try:
+            with timed(REDIS_LATENCY, command):
+                yield
+        except (RedisConnectionError, RedisTimeoutError) as e:
+            self.breaker.record_failure()
+            raise RedisUnavailable(str(e)) from e
+        except BaseException:
+            # Erros do comando (tipo, script...) não indicam indisponibilidade
+            self.breaker.record_success()
+            raise
+        self.breaker.record_success()
+        # Primeira chamada bem-sucedida depois de uma falha: reaplica as invalidações perdidas
+        if self._pending_deletes or self._pending_bumps:
+            self._replay_pending_invalidations()
+
+    def execute(self, command: str, *args):
+        """Executa um comando no Redis medindo sua latência."""
+        with self.guarded(command):
+            return getattr(self.redis_client, command)(*args)
+
+    def _delete_keys(self, *keys: str):
+        """Remove chaves do cache local e do Redis; sem Redis, guarda a invalidação para depois."""
+        self._local.delete(*keys)
+        try:
+            self.execute("delete", *keys)
+        except RedisUnavailable:
+            REDIS_FALLBACKS.labels("delete").inc()
+            with self._pending_lock:
+                self._pending_deletes.update(keys)
+
+    def _increment_versions(self, user_ids: Iterable[int]):
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for user_id in user_ids:
+            pipeline.incr(f"user:{user_id}:version")
+        with self.guarded("pipeline"):
+            pipeline.execute()
+
+    def _replay_pending_invalidations(self):
+        """Reaplica no Redis as remoções e os incrementos de versão que falharam."""
+        with self._pending_lock:
+            keys, self._pending_deletes = self._pending_deletes, set()
+            user_ids, self._pending_bumps = self._pending_bumps, set()
+        try:
+            if keys:
+                self.execute("delete", *keys)
+                keys = set()
+            if user_ids:
+                # Incrementar duas vezes é inofensivo: só importa a versão mudar
+                self._increment_versions(user_ids)
+                user_ids = set()
+            logger.info("Invalidações pendentes reaplicadas no Redis")
+        except RedisUnavailable:
+            with self._pending_lock:
+                self._pending_deletes.update(keys)
+                self._pending_bumps.update(user_ids)
+
+    def _get_cached_json(self, key: str, cache: str) -> Optional[Any]:
+        """Lê um JSON do Redis; sem Redis, usa a cópia local (ou None, e o chamador consulta o banco)."""
+        try:
+            cached_data = self.execute("get", key)
+        except RedisUnavailable:
+            REDIS_FALLBACKS.labels(cache).inc()
+            value = self._local.get(key)
+            record_cache_lookup(f"{cache}_local", value is not None)
+            return value
+        record_cache_lookup(cache, cached_data is not None)
         if cached_data:
-            return json.loads(cached_data)
+            value = json.loads(cached_data)
+            self._local.set(key, value, settings.redis.local_cache_seconds)
+            return value
         return None
 
+    def _set_cached_json(self, key: str, value: Any):
+        self._local.set(key, value, settings.redis.local_cache_seconds)
+        try:
+            self.execute("setex", key, self.expiration_time, json.dumps(value))
+        except RedisUnavailable:
+            REDIS_FALLBACKS.labels("set").inc()
+
+    def hit_sliding_windows(self, windows: Sequence[Tuple[str, int, int, bool]], now_ms: int, member: str) -> int:
+        """
+        Confere as janelas (chave, limite, duração em ms, registrar) informadas.
+
+        Retorna 0 quando nenhuma janela está no limite, registrando a ocorrência
+        nas janelas marcadas para registro, ou os milissegundos até a mais
+        restritiva liberar; nesse caso nada é registrado.
+        """
+        if self._sliding_window is None:
+            self._sliding_window = self.redis_client.register_script(SLIDING_WINDOW_SCRIPT)
+        keys = [key for key, _, _, _ in windows]
+        args = [now_ms, member]
+        for _, limit, window_ms, record in windows:
+            args.extend([limit, window_ms, 1 if record else 0])
+        with self.guarded("evalsha"):
+            return int(self._sliding_window(keys=keys, args=args))
+
+    def add_to_sliding_window(self, key: str, window_ms: int, now_ms: int, member: str):
+        """Registra uma ocorrência na janela sem conferir o limite."""
+        pipeline = self.redis_client.pipeline(transaction=False)
+        pipeline.zremrangebyscore(key, "-inf", now_ms - window_ms)
+        pipeline.zadd(key, {member: now_ms})
+        pipeline.pexpire(key, window_ms)
+        with self.guarded("pipeline"):
+            pipeline.execute()
+
+    def remove_from_sliding_window(self, key: str, member: str):
+        """Remove uma ocorrência registrada na janela."""
+        self.execute("zrem", key, member)
+
+    def revoke_token(self, jti: str, ttl_seconds: int, channel: str):
+        """Marca o token como revogado até a sua expiração e avisa os demais workers."""
+        self.execute("setex", f"revoked:{jti}", max(1, ttl_seconds), 1)
+        self.execute("publish", channel, jti)
+
+    def is_token_revoked(self, jti: str) -> bool:
+        """Confirma no Redis se o token foi revogado."""
+        return bool(self.execute("exists", f"revoked:{jti}"))
+
+    def iter_revoked_tokens(self):
+        """Percorre os ids de todos os tokens revogados ainda não expirados."""
+        with self.guarded("scan"):
+            keys = list(self.redis_client.scan_iter(match="revoked:*", count=1000))
+        for key in keys:
+            yield key.split(":", 1)[1]
+
+    def get_user_permissions(self, user_id: int) -> dict:
+        """Obtém as permissões do usuário do cache."""
+        return self._get_cached_json(f"user:{user_id}:permissions", "user_permissions")
+
     def set_user_permissions(self, user_id: int, permissions: dict):
         """Armazena as permissões do usuário no cache."""
-        key = f"user:{user_id}:permissions"
-        self.redis_client.setex(
-            key,
-            self.expiration_time,
-            json.dumps(permissions)
-        )
+        self._set_cached_json(f"user:{user_id}:permissions", permissions)
 
     def delete_user_permissions(self, user_id: int):
         """Remove as permissões do usuário do cache."""
-        key = f"user:{user_id}:permissions"
-        self.redis_client.delete(key)
+        self._delete_keys(f"user:{user_id}:permissions")
+
+    def delete_many_user_permissions(self, user_ids):
+        """Remove as permissões de vários usuários do cache em uma única chamada."""
+        keys = [f"user:{user_id}:permissions" for user_id in user_ids]
+        if keys:
+            self._delete_keys(*keys)
 
     def get_profile_permissions(self, profile_id: int) -> dict:
         """Obtém as permissões do perfil do cache."""
-        key = f"profile:{profile_id}:permissions"
-        cached_data = self.redis_client.get(key)
-        if cached_data:
-            return json.loads(cached_data)
-        return None
+        return self._get_cached_json(f"profile:{profile_id}:permissions", "profile_permissions")
 
     def set_profile_permissions(self, profile_id: int, permissions: dict):
         """Armazena as permissões do perfil no cache."""
-        key = f"profile:{profile_id}:permissions"
-        self.redis_client.setex(
-            key,
-            self.expiration_time,
-            json.dumps(permissions)
-        )
+        self._set_cached_json(f"profile:{profile_id}:permissions", permissions)
 
     def delete_profile_permissions(self, profile_id: int):
         """Remove as permissões do perfil do cache."""
-        key = f"profile:{profile_id}:permissions"
-        self.redis_client.delete(key)
+        self._delete_keys(f"profile:{profile_id}:permissions")
+
+    def delete_many_profile_permissions(self, profile_ids):
+        """Remove as permissões de vários perfis do cache em uma única chamada."""
+        keys = [f"profile:{profile_id}:permissions" for profile_id in profile_ids]
+        if keys:
+            self._delete_keys(*keys)
+
+    def get_identity(self, username: str):
+        """Obtém a identidade em cache do usuário."""
+        cached_data = self.execute("get", f"identity:{username}")
+        record_cache_lookup("identity", cached_data is not None)
+        if cached_data:
+            return json.loads(cached_data)
+        return None
+
+    def set_identity(self, username: str, data: dict):
+        """Armazena a identidade do usuário junto com a versão em que foi carregada."""
+        self.execute("setex", f"identity:{username}", self.expiration_time, json.dumps(data))
+
+    def get_identity_version(self, user_id: int) -> int:
+        """Obtém a versão atual dos dados de identidade do usuário."""
+        if user_id in self._pending_bumps:
+            # A versão no Redis ainda é a antiga: reaplica antes de confiar nela
+            self._replay_pending_invalidations()
+            if user_id in self._pending_bumps:
+                raise RedisUnavailable(f"versão pendente do usuário {user_id}")
+        return int(self.execute("get", f"user:{user_id}:version") or 0)
+
+    def bump_identity_versions(self, user_ids: Iterable[int]):
+        """
+        Incrementa a versão de vários usuários em um único round-trip.
+
+        Sem Redis, os usuários ficam pendentes e a versão é incrementada quando
+        ele volta; até lá get_identity lê do banco.
+        """
+        user_ids = set(user_ids)
+        try:
+            self._increment_versions(user_ids)
+        except RedisUnavailable:
+            REDIS_FALLBACKS.labels("identity_version").inc()
+            with self._pending_lock:
+                self._pending_bumps.update(user_ids)
+
+    def get_module_menu(self, permission_key: str):
+        """Obtém o menu de módulos em cache para um conjunto de permissões."""
+        cached_data = self.execute("hget", "modules:menu", permission_key)
+        record_cache_lookup("module_menu", cached_data is not None)
+        if cached_data:
+            return json.loads(cached_data)
+        return None
+
+    def set_module_menu(self, permission_key: str, modules: list):
+        """Armazena o menu de módulos de um conjunto de permissões."""
+        self.execute("hset", "modules:menu", permission_key, json.dumps(modules))
+        self.execute("expire", "modules:menu", self.expiration_time)
+
+    def clear_module_menus(self):
+        """Remove todos os menus de módulos do cache."""
+        self.execute("delete", "modules:menu")
+
+    def get_catalog_version(self, catalog: str) -> int:
+        """Obtém o contador de alterações de um catálogo (módulos, perfis, permissões...)."""
+        return self.get_catalog_versions(catalog)[catalog]
+
+    def get_catalog_versions(self, *catalogs: str) -> dict:
+        """Obtém os contadores de vários catálogos em uma única chamada."""
+        keys = [f"catalog:{catalog}:version" for catalog in catalogs]
+        values = self.execute("mget", *keys)
+        if None in values:
+            self._seed_catalog_versions(key for key, value in zip(keys, values) if value is None)
+            values = self.execute("mget", *keys)
+        return {catalog: int(value or 0) for catalog, value in zip(catalogs, values)}
+
+    def _seed_catalog_versions(self, keys: Iterable[str]):
+        """
+        Cria os contadores ausentes a partir do relógio (ms), sem sobrescrever os existentes.
+
+        Com o Redis novo ou esvaziado, um contador recomeçado em 0 repetiria
+        versões de ETags já entregues; começando do instante atual, as versões
+        novas são sempre maiores que as anteriores.
+        """
+        epoch = int(time.time() * 1000)
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.setnx(key, epoch)
+        with self.guarded("pipeline"):
+            pipeline.execute()
+
+    def bump_catalog_versions(self, *catalogs: str):
+        """Incrementa o contador de alterações dos catálogos informados."""
+        epoch = int(time.time() * 1000)
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for catalog in catalogs:
+            # Contador ausente (Redis esvaziado): recomeça do relógio, como em get_catalog_versions
+            pipeline.setnx(f"catalog:{catalog}:version", epoch)
+            pipeline.incr(f"catalog:{catalog}:version")
+        with self.guarded("pipeline"):
+            pipeline.execute()
+
+    def push_capped(self, key: str, value: str, max_length: int):
+        """Insere no início de uma lista mantendo apenas os max_length itens mais recentes."""
+        self.execute("lpush", key, value)
+        self.execute("ltrim", key, 0, max_length - 1)
+
+    def get_list(self, key: str) -> list:
+        """Retorna todos os itens de uma lista."""
+        return self.execute("lrange", key, 0, -1)
 
     def clear_all_permissions(self):
         """Remove todas as permissões do cache."""
-        for key in self.redis_client.keys("*:permissions"):
-            self.redis_client.delete(key)
+        for key in self.execute("keys", "*:permissions"):
+            self.execute("delete", key)
 
 # Instância global do serviço Redis
 redis_service = RedisService() 
\ No newline at end of file
@@ -0,0 +1,147 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from typing import Optional
+
+from app.backend.config.settings import settings
+from app.backend.services.metrics_service import record_cache_lookup
+from app.backend.services.redis_service import redis_service
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_CHANNEL = "auth:revocations"
+
+
+class BloomFilter:
+    """Filtro de Bloom em um bytearray; sem falsos negativos, com falsos positivos na taxa configurada."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationList:
+    """
+    Lista de tokens revogados (jti) consultada a cada requisição autenticada.
+
+    A revogação fica no Redis até a expiração do token. Cada worker mantém um
+    filtro de Bloom com os ids revogados, atualizado por pub/sub e reconstruído
+    periodicamente; a resposta comum ("não revogado") custa apenas uma consulta
+    em memória, e só os acertos do filtro são confirmados no Redis.
+    """
+
+    def __init__(self):
+        self._filter: Optional[BloomFilter] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _new_filter(self) -> BloomFilter:
+        return BloomFilter(settings.revocation.bloom_capacity, settings.revocation.bloom_error_rate)
+
+    def _rebuild(self):
+        bloom = self._new_filter()
+        count = 0
+        for jti in redis_service.iter_revoked_tokens():
+            bloom.add(jti)
+            count += 1
+        # Troca atômica: as requisições em curso continuam usando o filtro anterior
+        self._filter = bloom
+        logger.debug("Filtro de revogação reconstruído com %d tokens", count)
+
+    def start(self):
+        """Inicia a sincronização em segundo plano (uma por processo; chamar após o fork do worker)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="revocation-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(5)
+            self._thread = None
+
+    def _run(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                # Assina antes de reconstruir para não perder revogações feitas no intervalo
+                pubsub = redis_service.redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(REVOCATION_CHANNEL)
+                self._rebuild()
+                rebuilt_at = time.monotonic()
+                backoff = 1.0
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message" and self._filter is not None:
+                        self._filter.add(message["data"])
+                    if time.monotonic() - rebuilt_at >= settings.revocation.rebuild_seconds:
+                        self._rebuild()
+                        rebuilt_at = time.monotonic()
+            except Exception as e:
+                # O último filtro continua valendo até uma reconstrução bem-sucedida: as
+                # revogações que ele já conhece não podem ser descartadas justo com o Redis
+                # instável, e a reconstrução ao reconectar recupera as mensagens perdidas
+                logger.warning("Sincronização das revogações interrompida: %s", e)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti:
+            return False
+        # Consulta direta ao Redis apenas enquanto nenhum filtro foi construído (início do worker)
+        bloom = self._filter
+        if bloom is not None and jti not in bloom:
+            record_cache_lookup("revocation_filter", True)
+            return False
+        record_cache_lookup("revocation_filter", False)
+        try:
+            return redis_service.is_token_revoked(jti)
+        except Exception as e:
+            if bloom is None:
+                # Nenhum filtro ainda e Redis fora: não há como saber, o token é aceito
+                logger.warning("Não foi possível verificar a revogação do token: %s", e)
+                return False
+            # Acerto no filtro sem confirmação: trata como revogado
+            logger.warning("Não foi possível confirmar a revogação do token: %s", e)
+            return True
+
+    def revoke(self, jti: str, expires_at: Optional[float] = None):
+        """Revoga o token até expires_at (timestamp); sem ele, pelo tempo máximo de vida de um token."""
+        if expires_at is not None:
+            ttl = int(math.ceil(expires_at - time.time()))
+        else:
+            ttl = int(settings.auth.access_token_expire_minutes) * 60
+        if ttl <= 0:
+            return
+        redis_service.revoke_token(jti, ttl, REVOCATION_CHANNEL)
+        if self._filter is not None:
+            self._filter.add(jti)
+
+
+revocation_list = RevocationList()
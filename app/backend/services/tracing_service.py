@@ -0,0 +1,96 @@
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from app.backend.config.settings import settings
+
+# Spans finalizados são exportados como registros deste logger (ver config/logging_config.py)
+TRACE_LOGGER_NAME = "app.backend.tracing"
+trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "start", "status")
+
+    def __init__(self, trace_id: str, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.attributes = attributes
+        self.start = time.time()
+        self.status = "ok"
+
+    def set_error(self, error: BaseException):
+        self.status = "error"
+        self.attributes["error"] = repr(error)
+
+    def finish(self):
+        trace_logger.info("span %s", self.name, extra={"span": {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": round((time.time() - self.start) * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }})
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def new_request_id(incoming: Optional[str] = None) -> str:
+    """Usa o X-Request-ID recebido quando válido; caso contrário gera um novo."""
+    if incoming and len(incoming) <= 64 and incoming.replace("-", "").isalnum():
+        return incoming
+    return uuid.uuid4().hex
+
+
+def bind_request_id(request_id: str):
+    return _request_id.set(request_id)
+
+
+def unbind_request_id(token):
+    _request_id.reset(token)
+
+
+def start_span(name: str, **attributes) -> Optional[Span]:
+    """
+    Abre um span filho do span atual sem torná-lo o span corrente.
+
+    Usado quando início e fim ocorrem em callbacks distintos (eventos do SQLAlchemy).
+    Retorna None quando o tracing está desativado ou não há requisição em curso.
+    """
+    trace_id = _request_id.get()
+    if not settings.tracing.enabled or trace_id is None:
+        return None
+    return Span(trace_id, name, _current_span.get(), attributes)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Mede o bloco como um span da requisição atual; os spans abertos dentro dele viram filhos."""
+    current = start_span(name, **attributes)
+    if current is None:
+        yield None
+        return
+
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.set_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.finish()
@@ -0,0 +1,251 @@
+import codecs
+import csv
+import json
+import logging
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.backend.models.user import User
+from app.backend.schemas.user import UserCreate
+from app.backend.services.auth_service import get_password_hash
+from app.backend.services.identity_service import invalidate_identities
+from app.backend.services.redis_service import redis_service
+
+logger = logging.getLogger(__name__)
+
+# Linhas gravadas por INSERT multi-linha / transação
+IMPORT_BATCH_SIZE = 500
+# Limite de erros detalhados devolvidos no relatório
+MAX_REPORTED_ERRORS = 1000
+# Threads que geram os hashes bcrypt de cada lote (o bcrypt libera o GIL)
+PASSWORD_HASH_WORKERS = min(4, os.cpu_count() or 1)
+# Colunas atualizadas quando o username já existe
+UPSERT_COLUMNS = ("email", "full_name", "is_active", "is_ad_user")
+
+
+def _read_records(stream, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """Lê o arquivo linha a linha, devolvendo (número da linha, registro)."""
+    text = codecs.getreader("utf-8-sig")(stream)
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record
+    else:
+        for line_number, line in enumerate(text, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as e:
+                yield line_number, e
+
+
+def _upsert_statement(rows: List[Dict[str, Any]], dialect: str):
+    if dialect != "mysql":
+        # SQLite: o conflito é resolvido apenas pelo username; um e-mail de outra
+        # conta viola a restrição única e a linha é rejeitada
+        statement = sqlite.insert(User).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=[User.username],
+            set_={column: statement.excluded[column] for column in UPSERT_COLUMNS},
+        )
+
+    statement = mysql.insert(User).values(rows)
+
+    def same_user(column):
+        # ON DUPLICATE KEY também dispara pelo e-mail único: só atualiza quando
+        # a linha encontrada é do mesmo username, nunca a conta de outra pessoa
+        return func.if_(
+            User.username == statement.inserted.username,
+            statement.inserted[column],
+            User.__table__.c[column],
+        )
+
+    return statement.on_duplicate_key_update(**{column: same_user(column) for column in UPSERT_COLUMNS})
+
+
+class UserImport:
+    """Importação em lote de usuários com upserts multi-linha."""
+
+    def __init__(self, db: Session, role_id: int, hash_pool: Executor):
+        self.db = db
+        self.role_id = role_id
+        self.hash_pool = hash_pool
+        self.dialect = db.bind.dialect.name
+        self.processed = 0
+        self.imported = 0
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.usernames: List[str] = []
+
+    def add_error(self, row: int, error: str, username: Optional[str] = None):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "username": username, "error": error})
+
+    def flush(self, batch: List[Tuple[int, Dict[str, Any]]]):
+        """Grava um lote em uma única transação; em caso de conflito, isola as linhas inválidas."""
+        if not batch:
+            return
+        batch = self.reject_email_conflicts(batch)
+        if not batch:
+            return
+        self.hash_passwords(batch)
+        existing = self.existing_usernames(batch)
+        try:
+            self.db.execute(_upsert_statement([row for _, row in batch], self.dialect))
+            self.db.commit()
+            for _, row in batch:
+                self.count_written(row, existing)
+            return
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.warning("Lote de importação rejeitado, gravando linha a linha: %s", e)
+
+        for line_number, row in batch:
+            try:
+                self.db.execute(_upsert_statement([row], self.dialect))
+                self.db.commit()
+                self.count_written(row, existing)
+            except SQLAlchemyError as e:
+                self.db.rollback()
+                self.add_error(line_number, str(getattr(e, "orig", e)), row["username"])
+
+    def hash_passwords(self, batch: List[Tuple[int, Dict[str, Any]]]):
+        """Gera os hashes das senhas do lote em paralelo, fora do laço de leitura do arquivo."""
+        rows = [row for _, row in batch if "password" in row]
+        hashes = self.hash_pool.map(get_password_hash, [row.pop("password") for row in rows])
+        for row, hashed_password in zip(rows, hashes):
+            row["hashed_password"] = hashed_password
+
+    def existing_usernames(self, batch: List[Tuple[int, Dict[str, Any]]]) -> Set[str]:
+        """Usernames do lote que já existem, para separar criações de atualizações."""
+        usernames = [row["username"] for _, row in batch]
+        return {
+            username.lower()
+            for username in self.db.execute(select(User.username).where(User.username.in_(usernames))).scalars()
+        }
+
+    def count_written(self, row: Dict[str, Any], existing: Set[str]):
+        self.imported += 1
+        if row["username"].lower() in existing:
+            self.updated += 1
+        else:
+            self.created += 1
+        self.usernames.append(row["username"])
+
+    def reject_email_conflicts(self, batch: List[Tuple[int, Dict[str, Any]]]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Descarta, como erro, as linhas cujo e-mail já pertence a outro username."""
+        # A collation do MySQL compara sem diferenciar maiúsculas
+        owners = {
+            email.lower(): username
+            for email, username in self.db.execute(
+                select(User.email, User.username).where(User.email.in_([row["email"] for _, row in batch]))
+            )
+        }
+        accepted = []
+        for line_number, row in batch:
+            owner = owners.get(row["email"].lower())
+            if owner is not None and owner.lower() != row["username"].lower():
+                self.add_error(line_number, "E-mail já pertence a outro usuário", row["username"])
+            else:
+                accepted.append((line_number, row))
+        return accepted
+
+    def run(self, stream, fmt: str) -> Dict[str, Any]:
+        batch: List[Tuple[int, Dict[str, Any]]] = []
+        seen = set()
+        seen_emails = set()
+
+        for line_number, record in _read_records(stream, fmt):
+            self.processed += 1
+            if isinstance(record, Exception):
+                self.add_error(line_number, f"JSON inválido: {record}")
+                continue
+            if not isinstance(record, dict):
+                self.add_error(line_number, "Registro deve ser um objeto")
+                continue
+
+            # Campos vazios do CSV são tratados como ausentes
+            record = {key: value for key, value in record.items() if key and value not in ("", None)}
+            username = record.get("username")
+            try:
+                user = UserCreate(**record)
+            except ValidationError as e:
+                self.add_error(line_number, str(e), username)
+                continue
+
+            if user.username in seen:
+                self.add_error(line_number, "Nome de usuário duplicado no arquivo", user.username)
+                continue
+            seen.add(user.username)
+            email = user.email.lower()
+            if email in seen_emails:
+                self.add_error(line_number, "E-mail duplicado no arquivo", user.username)
+                continue
+            seen_emails.add(email)
+
+            row = {
+                "username": user.username,
+                "email": user.email,
+                "full_name": user.full_name,
+                "hashed_password": None,
+                "is_ad_user": user.is_ad_user,
+                "is_active": user.is_active,
+                "role_id": self.role_id,
+            }
+            # O hash é gerado por lote em hash_passwords
+            if user.password:
+                row["password"] = user.password
+            batch.append((line_number, row))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                self.flush(batch)
+                batch = []
+
+        self.flush(batch)
+        self.invalidate_cache()
+
+        return {
+            "processed": self.processed,
+            "imported": self.imported,
+            "created": self.created,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+    def invalidate_cache(self):
+        """Remove de uma só vez o cache de permissões e as identidades de todos os usuários gravados."""
+        user_ids = []
+        for start in range(0, len(self.usernames), IMPORT_BATCH_SIZE):
+            chunk = self.usernames[start:start + IMPORT_BATCH_SIZE]
+            user_ids.extend(self.db.execute(select(User.id).where(User.username.in_(chunk))).scalars())
+        redis_service.delete_many_user_permissions(user_ids)
+        invalidate_identities(user_ids)
+
+
+def import_users(db: Session, stream, fmt: str, role_id: int) -> Dict[str, Any]:
+    """
+    Importa usuários de um arquivo CSV ou NDJSON.
+
+    Args:
+        db: Sessão do banco de dados
+        stream: Arquivo binário com os registros
+        fmt: "csv" ou "ndjson"
+        role_id: Perfil atribuído aos usuários importados
+
+    Returns:
+        Dict: Relatório com totais e erros por linha
+    """
+    with ThreadPoolExecutor(PASSWORD_HASH_WORKERS, thread_name_prefix="user-import-hash") as hash_pool:
+        return UserImport(db, role_id, hash_pool).run(stream, fmt)
@@ -0,0 +1 @@
+# Este arquivo permite que o diretório seja tratado como um pacote Python
\ No newline at end of file
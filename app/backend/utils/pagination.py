@@ -0,0 +1,44 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+
+
+def encode_cursor(sort: str, value: Any, last_id: int) -> str:
+    """Gera um cursor opaco a partir da última linha retornada."""
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = json.dumps({"s": sort, "v": value, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Dict[str, Any]:
+    """
+    Decodifica um cursor gerado por encode_cursor.
+
+    Args:
+        cursor: Cursor opaco recebido do cliente
+        sort: Chave de ordenação da requisição atual
+
+    Returns:
+        Dict: Dicionário com o valor ("v") e o id ("id") da última linha
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value = data["v"]
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"])
+        elif value is not None and not isinstance(value, (str, int, float)):
+            raise TypeError("valor de cursor inesperado")
+        last_id = int(data["id"])
+        cursor_sort: Optional[str] = data.get("s")
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+    if cursor_sort != sort:
+        raise HTTPException(status_code=400, detail="Cursor não corresponde à ordenação solicitada")
+
+    return {"v": value, "id": last_id}
@@ -0,0 +1,93 @@
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from fastapi.responses import ORJSONResponse
+
+from app.backend.services.metrics_service import SERIALIZATION_LATENCY, timed
+
+
+def user_to_dict(user) -> Dict[str, Any]:
+    """Mesmo formato de schemas.user.User, sem passar pela validação do Pydantic."""
+    role = user.role
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "full_name": user.full_name,
+        "is_active": user.is_active,
+        "is_ad_user": user.is_ad_user,
+        "created_at": user.created_at,
+        "updated_at": user.updated_at,
+        "role": {"id": role.id, "name": role.name, "description": role.description} if role else None,
+    }
+
+
+def role_to_dict(role) -> Dict[str, Any]:
+    """Mesmo formato de schemas.user.Role."""
+    return {
+        "id": role.id,
+        "name": role.name,
+        "description": role.description,
+    }
+
+
+def permission_to_dict(permission) -> Dict[str, Any]:
+    """Mesmo formato de schemas.permission.PermissionResponse."""
+    return {
+        "id": permission.id,
+        "name": permission.name,
+        "description": permission.description,
+    }
+
+
+def profile_to_dict(profile) -> Dict[str, Any]:
+    """Mesmo formato de schemas.profile.ProfileResponse."""
+    return {
+        "id": profile.id,
+        "name": profile.name,
+        "description": profile.description,
+        "permissions": [permission_to_dict(permission) for permission in profile.permissions],
+    }
+
+
+def module_to_dict(module) -> Dict[str, Any]:
+    """Mesmo formato de schemas.user.Module."""
+    return {
+        "id": module.id,
+        "name": module.name,
+        "description": module.description,
+        "url": module.url,
+        "icon": module.icon,
+        "is_active": module.is_active,
+        "required_permission_id": module.required_permission_id,
+    }
+
+
+def audit_to_dict(entry) -> Dict[str, Any]:
+    """Mesmo formato de schemas.audit.AuditEntry."""
+    return {
+        "id": entry.id,
+        "created_at": entry.created_at,
+        "actor_id": entry.actor_id,
+        "actor": entry.actor,
+        "action": entry.action,
+        "target_type": entry.target_type,
+        "target_id": entry.target_id,
+        "changes": entry.changes,
+        "request_id": entry.request_id,
+    }
+
+
+def list_response(
+    items: Iterable[Any],
+    serializer: Callable[[Any], Dict[str, Any]],
+    endpoint: str,
+    headers: Optional[Dict[str, str]] = None
+) -> ORJSONResponse:
+    """
+    Serializa uma listagem de objetos ORM diretamente com orjson.
+
+    Os dados vêm do banco e já respeitam o schema declarado no response_model,
+    então a revalidação campo a campo do Pydantic é dispensada.
+    """
+    with timed(SERIALIZATION_LATENCY, endpoint):
+        return ORJSONResponse([serializer(item) for item in items], headers=headers)
@@ -0,0 +1,50 @@
+import os
+
+from app.backend.config.settings import settings
+
+
+def default_workers() -> int:
+    """
+    Quantidade de workers a partir das CPUs disponíveis para o processo (respeita cgroups/affinity).
+
+    SERVER_WORKERS fixa a quantidade; SERVER_WORKERS_PER_CPU ajusta o multiplicador
+    (os workers uvicorn são assíncronos, então 1 costuma bastar quando o trabalho é
+    dominado por CPU, como o bcrypt do login).
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    return max(1, cpus * settings.server.workers_per_cpu + 1)
+
+
+bind = f"{settings.server.host}:{settings.server.port}"
+# Cada worker tem o próprio pool do banco (DATABASE_POOL_SIZE + DATABASE_MAX_OVERFLOW conexões);
+# workers x esse total, somado entre as réplicas, deve caber no max_connections do MySQL
+workers = settings.server.workers or default_workers()
+# UvicornWorker usa uvloop e httptools quando instalados (uvicorn[standard])
+worker_class = "uvicorn.workers.UvicornWorker"
+keepalive = settings.server.keepalive
+backlog = settings.server.backlog
+graceful_timeout = settings.server.graceful_timeout
+max_requests = settings.server.max_requests
+max_requests_jitter = settings.server.max_requests_jitter
+
+# Importa a aplicação uma única vez no processo mestre antes do fork
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # Conexões abertas pelo mestre durante o preload não podem ser compartilhadas entre processos
+    from app.backend.config.database import engine
+    engine.dispose()
+
+
+def child_exit(server, worker):
+    # Descarta as métricas "ao vivo" (gauges) do worker encerrado
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,10 +1,41 @@
-import uvicorn
 import os
+import sys
+import tempfile
 
-if __name__ == "__main__":
+import uvicorn
+
+from app.backend.config.settings import settings
+
+APP = "app.backend.main:app"
+
+
+def run_dev():
+    """Modo de desenvolvimento: processo único com recarga automática."""
     uvicorn.run(
-        "app.backend.main:app",
-        host="0.0.0.0",
-        port=8000,
+        APP,
+        host=settings.server.host,
+        port=settings.server.port,
         reload=True
-    ) 
\ No newline at end of file
+    )
+
+
+def run_prod():
+    """Modo de produção: gunicorn com múltiplos workers uvicorn (ver gunicorn.conf.py)."""
+    config = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gunicorn.conf.py")
+    # Diretório compartilhado para agregar as métricas do Prometheus entre os workers
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="omnicorp-metrics-"))
+    # Substitui o processo atual para que o gunicorn receba os sinais diretamente
+    # (SIGHUP recarrega os workers de forma gradual, SIGTERM encerra graciosamente)
+    os.execvp("gunicorn", ["gunicorn", "-c", config, APP])
+
+
+if __name__ == "__main__":
+    if "--no-migrate" not in sys.argv[1:]:
+        # Migra e popula o banco uma única vez, antes de iniciar os workers
+        from app.backend.database import migrate
+        migrate.main()
+
+    if "--reload" in sys.argv[1:] or settings.server.reload:
+        run_dev()
+    else:
+        run_prod()
@@ -0,0 +1,127 @@
+"""
+Fixtures compartilhadas dos testes.
+
+A aplicação é importada sob demanda (pytest.importorskip), com um banco SQLite
+temporário, tokens HS256 e o Redis em memória de fake_redis; os eventos de
+startup (migrações, threads de sincronização) não são executados.
+"""
+import os
+import tempfile
+from datetime import timedelta
+
+import pytest
+
+from fake_redis import FakeRedis
+
+_TEST_DIR = tempfile.mkdtemp(prefix="omnicorp-tests-")
+# O TestClient executa os endpoints em outras threads
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TEST_DIR, 'test.db')}?check_same_thread=false"
+os.environ["ALGORITHM"] = "HS256"
+os.environ["SECRET_KEY"] = "chave-dos-testes"
+os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+# A trilha de auditoria é particionada (chave primária composta) e só existe no MySQL
+SQLITE_EXCLUDED_TABLES = {"audit_log"}
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    """Redis em memória, com os caches locais e o disjuntor zerados."""
+    pytest.importorskip("fastapi")
+    pytest.importorskip("app.backend.main")
+    from app.backend.services import identity_service, introspection_service
+    from app.backend.services.circuit_breaker import CircuitBreaker
+    from app.backend.services.redis_service import _LocalCache, redis_service
+    from app.backend.services.revocation_service import revocation_list
+
+    fake = FakeRedis()
+    monkeypatch.setattr(redis_service, "_redis_client", fake)
+    monkeypatch.setattr(redis_service, "_sliding_window", None)
+    monkeypatch.setattr(redis_service, "_local", _LocalCache())
+    monkeypatch.setattr(redis_service, "_pending_deletes", set())
+    monkeypatch.setattr(redis_service, "_pending_bumps", set())
+    monkeypatch.setattr(redis_service, "breaker", CircuitBreaker(
+        redis_service.breaker.name,
+        redis_service.breaker.failure_threshold,
+        redis_service.breaker.reset_seconds,
+        redis_service.breaker.on_state_change,
+    ))
+    monkeypatch.setattr(
+        identity_service, "_local_cache", identity_service._LocalIdentityCache(identity_service.LOCAL_CACHE_SIZE)
+    )
+    monkeypatch.setattr(
+        introspection_service, "_cache", introspection_service._IntrospectionCache(introspection_service._cache.max_size)
+    )
+    monkeypatch.setattr(revocation_list, "_filter", None)
+    return fake
+
+
+@pytest.fixture
+def db(redis):
+    """Sessão em um banco recriado a cada teste."""
+    from app.backend.config.database import SessionLocal, engine
+    from app.backend.database.base_class import Base
+
+    tables = [table for table in Base.metadata.sorted_tables if table.name not in SQLITE_EXCLUDED_TABLES]
+    Base.metadata.drop_all(engine, tables=tables)
+    Base.metadata.create_all(engine, tables=tables)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(db):
+    from fastapi.testclient import TestClient
+    from app.backend.main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def make_profile(db):
+    """Cria um perfil com as permissões informadas (criadas quando ainda não existem)."""
+    from app.backend.models.permission import Permission
+    from app.backend.models.profile import Profile
+
+    def factory(name, permissions=()):
+        profile = Profile(name=name, description=name, is_active=True, level=0)
+        for permission_name in permissions:
+            permission = db.query(Permission).filter(Permission.name == permission_name).first()
+            profile.permissions.append(permission or Permission(name=permission_name, description=permission_name))
+        db.add(profile)
+        db.commit()
+        return profile
+
+    return factory
+
+
+@pytest.fixture
+def make_user(db):
+    from app.backend.models.user import User
+
+    def factory(username, profiles=(), **fields):
+        fields.setdefault("email", f"{username}@omnicorp.com")
+        fields.setdefault("full_name", username.replace(".", " ").title())
+        fields.setdefault("is_active", True)
+        fields.setdefault("is_ad_user", False)
+        user = User(username=username, profiles=list(profiles), **fields)
+        db.add(user)
+        db.commit()
+        return user
+
+    return factory
+
+
+@pytest.fixture
+def auth_headers():
+    """Cabeçalho Authorization com um token válido para o usuário."""
+    from app.backend.services.auth_service import create_access_token
+
+    def factory(username):
+        token = create_access_token(data={"sub": username}, expires_delta=timedelta(minutes=5))
+        return {"Authorization": f"Bearer {token}"}
+
+    return factory
@@ -0,0 +1,230 @@
+"""
+Redis em memória para os testes.
+
+Implementa apenas os comandos usados por RedisService, com
+decode_responses=True (valores sempre str). O script de janela deslizante é
+emulado em Python com a mesma semântica de SLIDING_WINDOW_SCRIPT.
+"""
+import fnmatch
+import queue
+import time
+from datetime import timedelta
+
+
+def _seconds(value) -> float:
+    return value.total_seconds() if isinstance(value, timedelta) else float(value)
+
+
+class FakePubSub:
+    def __init__(self, server: "FakeRedis"):
+        self.server = server
+        self.messages: "queue.Queue[dict]" = queue.Queue()
+        self.channels = set()
+
+    def subscribe(self, *channels):
+        self.channels.update(channels)
+        self.server._subscribers.append(self)
+
+    def get_message(self, timeout: float = 0.0):
+        try:
+            return self.messages.get(timeout=timeout) if timeout else self.messages.get_nowait()
+        except queue.Empty:
+            return None
+
+    def close(self):
+        if self in self.server._subscribers:
+            self.server._subscribers.remove(self)
+
+
+class FakePipeline:
+    def __init__(self, server: "FakeRedis"):
+        self.server = server
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue_command(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue_command
+
+    def execute(self):
+        results = [getattr(self.server, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
+
+class FakeSlidingWindowScript:
+    """Mesma lógica de SLIDING_WINDOW_SCRIPT."""
+
+    def __init__(self, server: "FakeRedis"):
+        self.server = server
+
+    def __call__(self, keys, args):
+        now, member = int(args[0]), str(args[1])
+        windows = [
+            (key, int(args[2 + 3 * i]), int(args[3 + 3 * i]), str(args[4 + 3 * i]) == "1")
+            for i, key in enumerate(keys)
+        ]
+        wait = 0
+        for key, limit, window, _ in windows:
+            self.server.zremrangebyscore(key, "-inf", now - window)
+            entries = self.server._zsets.get(key, {})
+            if len(entries) >= limit:
+                wait = max(wait, min(entries.values()) + window - now)
+        if wait > 0:
+            return wait
+        for key, _, window, record in windows:
+            if record:
+                self.server.zadd(key, {member: now})
+                self.server.pexpire(key, window)
+        return 0
+
+
+class FakeRedis:
+    def __init__(self):
+        self._values = {}
+        self._hashes = {}
+        self._lists = {}
+        self._zsets = {}
+        self._expires = {}
+        self._subscribers = []
+        self.published = []
+
+    # Infraestrutura ---------------------------------------------------
+
+    def _expire_if_needed(self, key):
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._forget(key)
+
+    def _forget(self, key) -> bool:
+        existed = False
+        for store in (self._values, self._hashes, self._lists, self._zsets):
+            existed = store.pop(key, None) is not None or existed
+        self._expires.pop(key, None)
+        return existed
+
+    def _all_keys(self):
+        keys = set(self._values) | set(self._hashes) | set(self._lists) | set(self._zsets)
+        for key in list(keys):
+            self._expire_if_needed(key)
+        return set(self._values) | set(self._hashes) | set(self._lists) | set(self._zsets)
+
+    def flushall(self):
+        for store in (self._values, self._hashes, self._lists, self._zsets, self._expires):
+            store.clear()
+
+    # Strings ----------------------------------------------------------
+
+    def ping(self):
+        return True
+
+    def get(self, key):
+        self._expire_if_needed(key)
+        return self._values.get(key)
+
+    def set(self, key, value):
+        self._forget(key)
+        self._values[key] = str(value)
+        return True
+
+    def setex(self, key, seconds, value):
+        self.set(key, value)
+        self._expires[key] = time.monotonic() + _seconds(seconds)
+        return True
+
+    def setnx(self, key, value):
+        if self.exists(key):
+            return False
+        return self.set(key, value)
+
+    def mget(self, *keys):
+        return [self.get(key) for key in keys]
+
+    def incr(self, key):
+        value = int(self.get(key) or 0) + 1
+        self._values[key] = str(value)
+        return value
+
+    def delete(self, *keys):
+        return sum(1 for key in keys if self._forget(key))
+
+    def exists(self, *keys):
+        existing = self._all_keys()
+        return sum(1 for key in keys if key in existing)
+
+    def expire(self, key, seconds):
+        self._expires[key] = time.monotonic() + _seconds(seconds)
+        return True
+
+    def pexpire(self, key, milliseconds):
+        return self.expire(key, int(milliseconds) / 1000)
+
+    def keys(self, pattern="*"):
+        return [key for key in self._all_keys() if fnmatch.fnmatchcase(key, pattern)]
+
+    def scan_iter(self, match="*", count=None):
+        return iter(self.keys(match))
+
+    # Hashes e listas --------------------------------------------------
+
+    def hget(self, key, field):
+        self._expire_if_needed(key)
+        return self._hashes.get(key, {}).get(field)
+
+    def hset(self, key, field, value):
+        self._hashes.setdefault(key, {})[field] = str(value)
+        return 1
+
+    def lpush(self, key, *values):
+        items = self._lists.setdefault(key, [])
+        for value in values:
+            items.insert(0, str(value))
+        return len(items)
+
+    def ltrim(self, key, start, end):
+        items = self._lists.get(key, [])
+        self._lists[key] = items[start:None if end == -1 else end + 1]
+        return True
+
+    def lrange(self, key, start, end):
+        return list(self._lists.get(key, [])[start:None if end == -1 else end + 1])
+
+    # Conjuntos ordenados ----------------------------------------------
+
+    def zadd(self, key, mapping):
+        self._zsets.setdefault(key, {}).update({member: float(score) for member, score in mapping.items()})
+        return len(mapping)
+
+    def zremrangebyscore(self, key, minimum, maximum):
+        entries = self._zsets.get(key, {})
+        low = float("-inf") if minimum == "-inf" else float(minimum)
+        removed = [member for member, score in entries.items() if low <= score <= float(maximum)]
+        for member in removed:
+            del entries[member]
+        return len(removed)
+
+    def zrem(self, key, *members):
+        entries = self._zsets.get(key, {})
+        return sum(1 for member in members if entries.pop(member, None) is not None)
+
+    def zcard(self, key):
+        return len(self._zsets.get(key, {}))
+
+    # Pub/sub, pipelines e scripts ---------------------------------------
+
+    def publish(self, channel, message):
+        self.published.append((channel, str(message)))
+        for subscriber in list(self._subscribers):
+            if channel in subscriber.channels:
+                subscriber.messages.put({"type": "message", "channel": channel, "data": str(message)})
+        return len(self._subscribers)
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        return FakePubSub(self)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def register_script(self, script):
+        return FakeSlidingWindowScript(self)
@@ -0,0 +1,133 @@
+"""Gravação em lote em segundo plano (BatchWriter)."""
+import queue
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+from app.backend.services.batch_writer import BatchWriter
+from app.backend.services.metrics_service import BATCH_WRITER_DROPPED
+
+
+class Recorder:
+    """flush dos testes: guarda os lotes e avisa a cada gravação."""
+
+    def __init__(self, block: threading.Event = None):
+        self.batches = queue.Queue()
+        self.block = block
+
+    def __call__(self, batch):
+        if self.block is not None:
+            self.block.wait(5)
+        self.batches.put((time.monotonic(), list(batch)))
+
+    def next_batch(self, timeout=5.0):
+        return self.batches.get(timeout=timeout)
+
+
+def _dropped(name, reason):
+    return BATCH_WRITER_DROPPED.labels(name, reason)._value.get()
+
+
+@pytest.fixture
+def started():
+    writers = []
+
+    def start(writer):
+        writer.start()
+        writers.append(writer)
+        return writer
+
+    yield start
+    for writer in writers:
+        writer.stop()
+
+
+def test_flush_when_the_batch_is_full(started):
+    recorder = Recorder()
+    writer = started(BatchWriter("test-size", recorder, batch_size=3, flush_interval=60, max_pending=100))
+
+    for item in range(7):
+        assert writer.put(item)
+
+    assert recorder.next_batch()[1] == [0, 1, 2]
+    assert recorder.next_batch()[1] == [3, 4, 5]
+    # O último item aguarda o intervalo
+    with pytest.raises(queue.Empty):
+        recorder.next_batch(timeout=0.2)
+
+
+def test_flush_after_the_interval(started):
+    recorder = Recorder()
+    writer = started(BatchWriter("test-interval", recorder, batch_size=100, flush_interval=0.2, max_pending=100))
+
+    first = time.monotonic()
+    writer.put("a")
+    writer.put("b")
+
+    flushed_at, batch = recorder.next_batch()
+    assert batch == ["a", "b"]
+    # O prazo conta a partir do primeiro item pendente
+    assert 0.15 <= flushed_at - first < 2
+
+
+def test_stop_drains_pending_items():
+    recorder = Recorder()
+    writer = BatchWriter("test-drain", recorder, batch_size=2, flush_interval=60, max_pending=100)
+    writer.start()
+
+    for item in range(5):
+        writer.put(item)
+    writer.stop()
+
+    batches = []
+    while not recorder.batches.empty():
+        batches.append(recorder.next_batch()[1])
+    assert [item for batch in batches for item in batch] == list(range(5))
+    assert all(len(batch) <= 2 for batch in batches)
+    assert writer.pending == 0
+
+
+def test_put_drops_when_the_queue_is_full(started):
+    release = threading.Event()
+    recorder = Recorder(block=release)
+    writer = started(BatchWriter("test-full", recorder, batch_size=1, flush_interval=60, max_pending=2))
+    dropped = _dropped("test-full", "queue_full")
+
+    # O primeiro item ocupa a thread (flush bloqueado); os dois seguintes enchem a fila
+    writer.put("in-flight")
+    deadline = time.monotonic() + 5
+    while writer.pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writer.put("queued-1")
+    assert writer.put("queued-2")
+
+    assert not writer.put("dropped")
+    assert not writer.offer("offered")
+    assert not writer.put("waited", timeout=0.05)
+    # offer não conta como descarte
+    assert _dropped("test-full", "queue_full") == dropped + 2
+
+    release.set()
+    assert [recorder.next_batch()[1] for _ in range(3)] == [["in-flight"], ["queued-1"], ["queued-2"]]
+
+
+def test_failed_batch_is_retried(started):
+    attempts = []
+    done = threading.Event()
+
+    def flush(batch):
+        attempts.append(list(batch))
+        if len(attempts) < 3:
+            raise RuntimeError("banco indisponível")
+        done.set()
+
+    writer = started(BatchWriter(
+        "test-retry", flush, batch_size=1, flush_interval=60, max_pending=10, retries=2, retry_backoff=0.01
+    ))
+    writer.put("item")
+
+    assert done.wait(5)
+    assert attempts == [["item"]] * 3
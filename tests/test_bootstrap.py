@@ -0,0 +1,69 @@
+"""Dados iniciais do frontend (GET /api/auth/bootstrap)."""
+import pytest
+
+
+@pytest.fixture
+def statements():
+    """Comandos SQL executados enquanto o teste roda."""
+    from sqlalchemy import event
+    from app.backend.config.database import engine
+
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def member(db, make_profile, make_user):
+    from app.backend.models.user import Module, Permission, Role
+
+    role = Role(name="viewer", description="Visualizador")
+    permission = Permission(name="user:read", description="Visualizar usuários")
+    db.add_all([role, permission])
+    db.flush()
+    db.add_all([
+        Module(name="usuarios", url="/usuarios", icon="people", is_active=True, required_permission_id=permission.id),
+        Module(name="auditoria", url="/auditoria", icon="history", is_active=True),
+    ])
+    db.commit()
+    return make_user("analista", profiles=[make_profile("Analistas", ["user:read"])], role_id=role.id)
+
+
+def test_bootstrap_payload(client, member, auth_headers):
+    response = client.get("/api/auth/bootstrap", headers=auth_headers("analista"))
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["user"]["id"] == member.id
+    assert data["user"]["is_ad_user"] is False
+    assert data["user"]["role"] == {"id": member.role_id, "name": "viewer"}
+    assert data["permissions"] == ["user:read"]
+    assert [module["name"] for module in data["modules"]] == ["usuarios"]
+    assert set(data["catalog_versions"]) == {"modules", "roles", "profiles", "permissions"}
+
+
+def test_warm_bootstrap_runs_no_queries(client, member, auth_headers, statements):
+    headers = auth_headers("analista")
+    assert client.get("/api/auth/bootstrap", headers=headers).status_code == 200
+    cold = len(statements)
+    statements.clear()
+
+    response = client.get("/api/auth/bootstrap", headers=headers)
+
+    assert response.status_code == 200
+    # Identidade, permissões e menu saem dos caches aquecidos pela primeira chamada
+    assert statements == []
+    assert cold > 0
+
+
+def test_bootstrap_rejects_inactive_user(client, make_user, auth_headers):
+    make_user("desligado", is_active=False)
+
+    response = client.get("/api/auth/bootstrap", headers=auth_headers("desligado"))
+
+    assert response.status_code == 401
@@ -0,0 +1,67 @@
+"""GET condicional dos catálogos (catalog_etag) com o catálogo de papéis."""
+import time
+
+import pytest
+
+ROLES_URL = "/api/users/roles/"
+
+
+@pytest.fixture
+def reader(db, make_profile, make_user, auth_headers):
+    from app.backend.models.user import Role
+
+    db.add_all([Role(name="viewer", description="Visualizador"), Role(name="editor", description="Editor")])
+    db.commit()
+    make_user("leitor", profiles=[make_profile("Leitores", ["user:read"])])
+    return auth_headers("leitor")
+
+
+def _get(client, headers, etag=None):
+    return client.get(ROLES_URL, headers={**headers, **({"If-None-Match": etag} if etag else {})})
+
+
+def test_revalidation_transitions(client, redis, reader):
+    from app.backend.middleware.etag_middleware import bump_catalogs
+
+    first = _get(client, reader)
+    assert first.status_code == 200, first.text
+    assert [role["name"] for role in first.json()] == ["viewer", "editor"]
+    etag = first.headers["ETag"]
+
+    # Sem alterações: 304 sem corpo e com a mesma ETag
+    unchanged = _get(client, reader, etag)
+    assert unchanged.status_code == 304
+    assert unchanged.headers["ETag"] == etag
+    assert unchanged.content == b""
+
+    # Catálogo alterado: a ETag antiga deixa de conferir
+    bump_catalogs("roles")
+    changed = _get(client, reader, etag)
+    assert changed.status_code == 200
+    bumped_etag = changed.headers["ETag"]
+    assert bumped_etag != etag
+    assert _get(client, reader, bumped_etag).status_code == 304
+
+
+def test_flushed_redis_never_reuses_an_etag(client, redis, reader):
+    from app.backend.middleware.etag_middleware import bump_catalogs
+
+    first_etag = _get(client, reader).headers["ETag"]
+    bump_catalogs("roles")
+    bumped_etag = _get(client, reader).headers["ETag"]
+
+    # Redis esvaziado: o contador recomeça do relógio (ms), não de 0
+    time.sleep(0.01)
+    redis.flushall()
+    response = _get(client, reader, first_etag)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] not in (first_etag, bumped_etag)
+
+
+def test_not_modified_requires_authorization(client, make_profile, make_user, reader, auth_headers):
+    etag = _get(client, reader).headers["ETag"]
+    make_user("visitante", profiles=[make_profile("Visitantes", ["profile:read"])])
+
+    assert _get(client, auth_headers("visitante"), etag).status_code == 403
+    assert client.get(ROLES_URL, headers={"If-None-Match": etag}).status_code == 403
@@ -0,0 +1,45 @@
+"""Nível de log configurado por LOG_LEVEL (config/logging_config.py)."""
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from app.backend.config import logging_config
+from app.backend.config.settings import settings
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.mark.parametrize("name, level", [
+    ("debug", logging.DEBUG),
+    (" Warning ", logging.WARNING),
+    ("WARN", logging.WARNING),
+    ("critical", logging.CRITICAL),
+    ("verbose", logging.INFO),
+    ("15", logging.INFO),
+])
+def test_log_level_names(monkeypatch, name, level):
+    monkeypatch.setattr(settings.logging, "level", name)
+    assert logging_config._log_level() == level
+
+
+@pytest.mark.parametrize("debug, level", [(True, logging.DEBUG), (False, logging.INFO)])
+def test_default_level_follows_debug(monkeypatch, debug, level):
+    monkeypatch.setattr(settings.logging, "level", None)
+    monkeypatch.setattr(settings, "debug", debug)
+    assert logging_config._log_level() == level
+
+
+def test_unknown_level_does_not_break_the_import():
+    env = dict(os.environ, LOG_LEVEL="verbose", LOG_JSON="false")
+    result = subprocess.run(
+        [sys.executable, "-c", "import app.backend.main"],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "LOG_LEVEL desconhecido: verbose; usando INFO" in result.stdout
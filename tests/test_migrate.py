@@ -0,0 +1,55 @@
+"""Comando de migração (database/migrate.py)."""
+import pytest
+
+pytest.importorskip("alembic")
+
+
+@pytest.fixture
+def alembic_calls(monkeypatch):
+    from app.backend.database import migrate
+
+    calls = []
+    monkeypatch.setattr(migrate.command, "upgrade", lambda config, revision: calls.append(("upgrade", config, revision)))
+    monkeypatch.setattr(migrate.command, "stamp", lambda config, revision: calls.append(("stamp", config, revision)))
+    return calls
+
+
+def test_upgrade_runs_on_the_locked_connection(db, alembic_calls):
+    from app.backend.database.migrate import LEGACY_REVISION, migration_lock, upgrade_schema
+
+    with migration_lock() as connection:
+        upgrade_schema(connection)
+
+    # Banco com as tabelas e sem alembic_version: esquema legado
+    assert [(name, revision) for name, _, revision in alembic_calls] == [
+        ("stamp", LEGACY_REVISION), ("upgrade", "head"),
+    ]
+    assert all(config.attributes["connection"] is connection for _, config, _ in alembic_calls)
+
+
+def test_empty_database_is_created_on_the_locked_connection(db, alembic_calls):
+    from sqlalchemy import inspect
+    from app.backend.config.database import engine
+    from app.backend.database.base_class import Base
+    from app.backend.database.migrate import migration_lock, upgrade_schema
+    from conftest import SQLITE_EXCLUDED_TABLES
+
+    tables = [table for table in Base.metadata.sorted_tables if table.name not in SQLITE_EXCLUDED_TABLES]
+    Base.metadata.drop_all(engine, tables=tables)
+    create_all = Base.metadata.create_all
+    created_with = []
+
+    def create_tables(bind):
+        created_with.append(bind)
+        create_all(bind=bind, tables=tables)
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(Base.metadata, "create_all", create_tables)
+        with migration_lock() as connection:
+            upgrade_schema(connection)
+
+    assert created_with == [connection]
+    assert [(name, revision) for name, _, revision in alembic_calls] == [("stamp", "head")]
+    assert alembic_calls[0][1].attributes["connection"] is connection
+    assert "users" in inspect(engine).get_table_names()
+
@@ -0,0 +1,59 @@
+"""Cursores opacos da paginação por keyset (utils/pagination.py)."""
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi import HTTPException
+
+from app.backend.utils.pagination import decode_cursor, encode_cursor
+
+
+def _raw_cursor(payload) -> str:
+    data = json.dumps(payload).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+@pytest.mark.parametrize("value", [42, "maria.silva", None])
+def test_round_trip(value):
+    cursor = encode_cursor("username:asc", value, 7)
+    assert decode_cursor(cursor, "username:asc") == {"v": value, "id": 7}
+
+
+def test_round_trip_datetime():
+    created_at = datetime(2024, 3, 1, 12, 30, 15, 123456)
+    cursor = encode_cursor("created_at:desc", created_at, 9)
+    assert decode_cursor(cursor, "created_at:desc") == {"v": created_at, "id": 9}
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor("username:asc", "???>>>", 1)
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+
+
+def test_rejects_cursor_from_another_sort():
+    cursor = encode_cursor("username:asc", "ana", 1)
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, "username:desc")
+    assert error.value.status_code == 400
+    assert error.value.detail == "Cursor não corresponde à ordenação solicitada"
+
+
+@pytest.mark.parametrize("cursor", [
+    "nao-e-base64!",
+    base64.urlsafe_b64encode(b"{quebrado").decode("ascii"),
+    _raw_cursor(["id:asc", 1, 2]),
+    _raw_cursor({"s": "id:asc", "v": 1}),
+    _raw_cursor({"s": "id:asc", "v": 1, "id": "abc"}),
+    _raw_cursor({"s": "id:asc", "v": {"dt": "ontem"}, "id": 1}),
+    _raw_cursor({"s": "id:asc", "v": {"x": 1}, "id": 1}),
+    _raw_cursor({"s": "id:asc", "v": [1, 2], "id": 1}),
+])
+def test_rejects_tampered_cursor(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, "id:asc")
+    assert error.value.status_code == 400
+    assert error.value.detail == "Cursor inválido"
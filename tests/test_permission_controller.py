@@ -0,0 +1,41 @@
+"""Exclusão de permissões (DELETE /api/permissions/{id})."""
+
+
+def test_deleted_permission_is_revoked_immediately(client, redis, make_profile, make_user, auth_headers):
+    make_user("gestor", profiles=[make_profile("Gestores", ["permission:delete"])])
+    readers = make_profile("Leitores", ["profile:read"])
+    make_user("leitor", profiles=[readers])
+    permission_id = readers.permissions[0].id
+    reader = auth_headers("leitor")
+    # Grava no cache as permissões do perfil e do usuário
+    assert client.get("/api/profiles", headers=reader).status_code == 200
+    assert redis.exists(f"profile:{readers.id}:permissions")
+
+    response = client.delete(f"/api/permissions/{permission_id}", headers=auth_headers("gestor"))
+
+    assert response.status_code == 200, response.text
+    assert not redis.exists(f"profile:{readers.id}:permissions")
+    assert client.get("/api/profiles", headers=reader).status_code == 403
+
+
+def test_delete_bumps_permission_and_profile_catalogs(client, redis, make_profile, make_user, auth_headers):
+    from app.backend.services.redis_service import redis_service
+
+    profile = make_profile("Gestores", ["permission:delete", "audit:read"])
+    make_user("gestor", profiles=[profile])
+    permission_id = next(permission.id for permission in profile.permissions if permission.name == "audit:read")
+    before = redis_service.get_catalog_versions("permissions", "profiles", "modules")
+
+    response = client.delete(f"/api/permissions/{permission_id}", headers=auth_headers("gestor"))
+
+    assert response.status_code == 200, response.text
+    after = redis_service.get_catalog_versions("permissions", "profiles", "modules")
+    assert after == {**before, "permissions": before["permissions"] + 1, "profiles": before["profiles"] + 1}
+
+
+def test_delete_unknown_permission(client, make_profile, make_user, auth_headers):
+    make_user("gestor", profiles=[make_profile("Gestores", ["permission:delete"])])
+
+    response = client.delete("/api/permissions/999", headers=auth_headers("gestor"))
+
+    assert response.status_code == 404
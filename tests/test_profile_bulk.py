@@ -0,0 +1,153 @@
+"""Substituição (PUT) e alteração (PATCH) em lote dos membros e permissões de um perfil."""
+import pytest
+
+
+@pytest.fixture
+def setup(db, make_profile, make_user):
+    make_user("gestor", profiles=[make_profile("Gestores", ["permission:manage"])])
+    profile = make_profile("Analistas", ["user:read", "user:create"])
+    users = {name: make_user(name, profiles=[profile] if name in ("ana", "bruno") else []).id
+             for name in ("ana", "bruno", "carla", "davi")}
+    return profile.id, users
+
+
+@pytest.fixture
+def invalidated(monkeypatch):
+    """Usuários cujas permissões e identidades em cache foram invalidadas."""
+    from app.backend.controllers import profile_controller
+    from app.backend.services.redis_service import redis_service
+
+    calls = {"permissions": set(), "identities": set()}
+    monkeypatch.setattr(
+        redis_service, "delete_many_user_permissions", lambda ids: calls["permissions"].update(ids)
+    )
+    monkeypatch.setattr(profile_controller, "invalidate_identities", lambda ids: calls["identities"].update(ids))
+    return calls
+
+
+def _members(db, profile_id):
+    from sqlalchemy import select
+    from app.backend.models.user_profiles import user_profiles
+
+    db.expire_all()
+    return set(db.execute(select(user_profiles.c.user_id).where(user_profiles.c.profile_id == profile_id)).scalars())
+
+
+def _permission_names(db, profile_id):
+    from app.backend.models.profile import Profile
+
+    db.expire_all()
+    return {permission.name for permission in db.query(Profile).get(profile_id).permissions}
+
+
+def _permission_id(db, name):
+    from app.backend.models.permission import Permission
+
+    return db.query(Permission).filter(Permission.name == name).one().id
+
+
+def test_put_replaces_the_members(client, db, setup, auth_headers, invalidated):
+    profile_id, users = setup
+
+    response = client.put(
+        f"/api/profiles/{profile_id}/users", json={"ids": [users["bruno"], users["carla"]]},
+        headers=auth_headers("gestor"),
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"added": 1, "removed": 1}
+    assert _members(db, profile_id) == {users["bruno"], users["carla"]}
+    # Apenas quem entrou ou saiu do perfil perde o cache
+    assert invalidated["permissions"] == invalidated["identities"] == {users["ana"], users["carla"]}
+
+
+def test_patch_adds_and_removes_members(client, db, setup, auth_headers, invalidated):
+    profile_id, users = setup
+
+    response = client.patch(
+        f"/api/profiles/{profile_id}/users",
+        # bruno já é membro e davi não é: os dois são ignorados; carla em add e remove fica no perfil
+        json={"add": [users["bruno"], users["carla"]], "remove": [users["ana"], users["davi"], users["carla"]]},
+        headers=auth_headers("gestor"),
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"added": 1, "removed": 1}
+    assert _members(db, profile_id) == {users["bruno"], users["carla"]}
+    assert invalidated["permissions"] == invalidated["identities"] == {users["ana"], users["carla"]}
+
+
+def test_unchanged_set_invalidates_nothing(client, db, setup, auth_headers, invalidated):
+    profile_id, users = setup
+
+    response = client.put(
+        f"/api/profiles/{profile_id}/users", json={"ids": [users["ana"], users["bruno"]]},
+        headers=auth_headers("gestor"),
+    )
+
+    assert response.json() == {"added": 0, "removed": 0}
+    assert invalidated["permissions"] == invalidated["identities"] == set()
+
+
+@pytest.mark.parametrize("method, body", [
+    ("put", lambda users: {"ids": [users["ana"], 999]}),
+    ("patch", lambda users: {"add": [999], "remove": [users["ana"]]}),
+])
+def test_unknown_user_is_rejected_without_changes(client, db, setup, auth_headers, invalidated, method, body):
+    profile_id, users = setup
+
+    response = getattr(client, method)(
+        f"/api/profiles/{profile_id}/users", json=body(users), headers=auth_headers("gestor")
+    )
+
+    assert response.status_code == 404
+    assert "999" in response.json()["detail"]
+    assert _members(db, profile_id) == {users["ana"], users["bruno"]}
+    assert invalidated["permissions"] == set()
+
+
+def test_unknown_profile_is_rejected(client, setup, auth_headers):
+    response = client.put("/api/profiles/999/users", json={"ids": []}, headers=auth_headers("gestor"))
+
+    assert response.status_code == 404
+
+
+def test_put_replaces_the_permissions(client, db, setup, auth_headers):
+    profile_id, _ = setup
+    manage = _permission_id(db, "permission:manage")
+
+    response = client.put(
+        f"/api/profiles/{profile_id}/permissions", json={"ids": [_permission_id(db, "user:read"), manage]},
+        headers=auth_headers("gestor"),
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"added": 1, "removed": 1}
+    assert _permission_names(db, profile_id) == {"user:read", "permission:manage"}
+
+
+def test_patch_permissions_invalidates_the_members(client, db, setup, auth_headers, invalidated):
+    profile_id, users = setup
+
+    response = client.patch(
+        f"/api/profiles/{profile_id}/permissions", json={"remove": [_permission_id(db, "user:create")]},
+        headers=auth_headers("gestor"),
+    )
+
+    assert response.json() == {"added": 0, "removed": 1}
+    assert _permission_names(db, profile_id) == {"user:read"}
+    # A permissão muda para todos os membros do perfil, e só para eles
+    assert invalidated["permissions"] == invalidated["identities"] == {users["ana"], users["bruno"]}
+
+
+def test_unknown_permission_is_rejected_without_changes(client, db, setup, auth_headers):
+    profile_id, _ = setup
+
+    response = client.put(
+        f"/api/profiles/{profile_id}/permissions", json={"ids": [_permission_id(db, "user:read"), 999]},
+        headers=auth_headers("gestor"),
+    )
+
+    assert response.status_code == 404
+    assert "999" in response.json()["detail"]
+    assert _permission_names(db, profile_id) == {"user:read", "user:create"}
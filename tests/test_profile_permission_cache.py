@@ -0,0 +1,39 @@
+"""Concessão e revogação de permissões de um perfil refletidas de imediato nos membros."""
+import pytest
+
+
+@pytest.fixture
+def setup(db, make_profile, make_user):
+    from app.backend.models.permission import Permission
+
+    make_user("gestor", profiles=[make_profile("Gestores", ["permission:manage"])])
+    members = make_profile("Analistas", ["user:read"])
+    make_user("analista", profiles=[members])
+    permission = Permission(name="profile:read", description="Visualizar perfis")
+    db.add(permission)
+    db.commit()
+    return members.id, permission.id
+
+
+def test_granted_permission_applies_immediately(client, setup, auth_headers):
+    profile_id, permission_id = setup
+    analyst = auth_headers("analista")
+    # A primeira verificação grava no cache o conjunto atual do usuário
+    assert client.get("/api/profiles", headers=analyst).status_code == 403
+
+    response = client.post(f"/api/profiles/{profile_id}/permissions/{permission_id}", headers=auth_headers("gestor"))
+    assert response.status_code == 200, response.text
+
+    assert client.get("/api/profiles", headers=analyst).status_code == 200
+
+
+def test_revoked_permission_applies_immediately(client, setup, auth_headers):
+    profile_id, permission_id = setup
+    manager, analyst = auth_headers("gestor"), auth_headers("analista")
+    client.post(f"/api/profiles/{profile_id}/permissions/{permission_id}", headers=manager)
+    assert client.get("/api/profiles", headers=analyst).status_code == 200
+
+    response = client.delete(f"/api/profiles/{profile_id}/permissions/{permission_id}", headers=manager)
+    assert response.status_code == 200, response.text
+
+    assert client.get("/api/profiles", headers=analyst).status_code == 403
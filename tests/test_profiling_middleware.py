@@ -0,0 +1,50 @@
+"""Perfilamento sob demanda (ProfilingMiddleware)."""
+from datetime import timedelta
+
+import pytest
+
+
+def _profile_request(client, token):
+    return client.get("/api/health", headers={"X-Profile": "1", "Authorization": f"Bearer {token}"})
+
+
+@pytest.fixture
+def token_for():
+    from app.backend.services.auth_service import create_access_token
+
+    def factory(username, permissions=()):
+        data = {"sub": username, "permissions": list(permissions)}
+        return create_access_token(data=data, expires_delta=timedelta(minutes=5))
+
+    return factory
+
+
+def test_administrator_profile_enables_profiling(client, make_profile, make_user, token_for):
+    make_user("administrator", profiles=[make_profile("Administrador")])
+
+    response = _profile_request(client, token_for("administrator"))
+
+    assert response.status_code == 200
+    assert "x-profile-id" in response.headers
+
+
+def test_admin_claim_in_token_is_not_trusted(client, make_profile, make_user, token_for):
+    make_user("analista", profiles=[make_profile("Analistas", ["user:read"])])
+
+    response = _profile_request(client, token_for("analista", ["admin:all"]))
+
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+
+
+def test_inactive_administrator_is_not_profiled(client, make_profile, make_user, token_for):
+    make_user("administrator", profiles=[make_profile("Administrador")], is_active=False)
+
+    assert "x-profile-id" not in _profile_request(client, token_for("administrator")).headers
+
+
+def test_invalid_token_is_ignored(client, db):
+    response = _profile_request(client, "nao-e-um-jwt")
+
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
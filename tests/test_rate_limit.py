@@ -0,0 +1,112 @@
+"""Limites de login e de autenticações simultâneas (rate_limit_service)."""
+import asyncio
+from contextlib import AsyncExitStack
+
+import pytest
+
+
+@pytest.fixture
+def limiter_class(redis):
+    from app.backend.services.rate_limit_service import InFlightLimiter
+
+    return InFlightLimiter
+
+
+async def _hold(stack: AsyncExitStack, limiter):
+    await stack.enter_async_context(limiter.slot())
+
+
+def test_global_limit_is_shared_between_workers(redis, limiter_class):
+    from app.backend.services.rate_limit_service import DIRECTORY_SLOTS_KEY, DirectoryOverloaded
+
+    worker_a, worker_b = limiter_class(10, 2, 30), limiter_class(10, 2, 30)
+
+    async def scenario():
+        async with AsyncExitStack() as stack:
+            await _hold(stack, worker_a)
+            await _hold(stack, worker_b)
+            assert redis.zcard(DIRECTORY_SLOTS_KEY) == 2
+            with pytest.raises(DirectoryOverloaded):
+                await _hold(stack, worker_b)
+            assert worker_b.in_flight == 1
+        # Vagas liberadas ao terminar as autenticações
+        assert redis.zcard(DIRECTORY_SLOTS_KEY) == 0
+        async with worker_b.slot():
+            pass
+
+    asyncio.run(scenario())
+
+
+def test_worker_limit_rejects_without_redis_round_trip(redis, limiter_class, monkeypatch):
+    from app.backend.services.rate_limit_service import DirectoryOverloaded
+    from app.backend.services.redis_service import redis_service
+
+    limiter = limiter_class(1, 10, 30)
+
+    def unexpected(*args, **kwargs):
+        raise AssertionError("o limite do worker deve recusar antes do Redis")
+
+    async def scenario():
+        async with limiter.slot():
+            monkeypatch.setattr(redis_service, "hit_sliding_windows", unexpected)
+            with pytest.raises(DirectoryOverloaded):
+                async with limiter.slot():
+                    pass
+
+    asyncio.run(scenario())
+
+
+def test_slots_of_crashed_workers_expire(redis, limiter_class):
+    import time
+    from app.backend.services.rate_limit_service import DIRECTORY_SLOTS_KEY
+
+    stale_ms = int(time.time() * 1000) - 31_000
+    redis.zadd(DIRECTORY_SLOTS_KEY, {"worker-caiu-1": stale_ms, "worker-caiu-2": stale_ms})
+    limiter = limiter_class(10, 2, 30)
+
+    async def scenario():
+        async with limiter.slot():
+            assert redis.zcard(DIRECTORY_SLOTS_KEY) == 1
+
+    asyncio.run(scenario())
+
+
+def test_without_redis_only_the_worker_limit_applies(redis, limiter_class, monkeypatch):
+    from app.backend.services.rate_limit_service import DirectoryOverloaded
+    from app.backend.services.redis_service import RedisUnavailable, redis_service
+
+    def unavailable(*args, **kwargs):
+        raise RedisUnavailable("fora")
+
+    monkeypatch.setattr(redis_service, "hit_sliding_windows", unavailable)
+    monkeypatch.setattr(redis_service, "remove_from_sliding_window", unavailable)
+    limiter = limiter_class(2, 1, 30)
+
+    async def scenario():
+        async with AsyncExitStack() as stack:
+            await _hold(stack, limiter)
+            await _hold(stack, limiter)
+            with pytest.raises(DirectoryOverloaded):
+                await _hold(stack, limiter)
+        assert limiter.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_failed_logins_lock_the_username(client, monkeypatch):
+    from app.backend.config.settings import settings
+    from app.backend.controllers import auth_controller
+
+    monkeypatch.setattr(settings.rate_limit, "login_per_username", 2)
+    monkeypatch.setattr(
+        auth_controller, "authenticate_user",
+        lambda username, password: {"username": username, "authenticated": False, "error": "Senha incorreta"},
+    )
+
+    def login(username):
+        return client.post("/api/auth/token", data={"username": username, "password": "errada"})
+
+    assert [login("maria").status_code for _ in range(3)] == [401, 401, 429]
+    assert int(login("maria").headers["Retry-After"]) > 0
+    # A janela é por usuário: outra conta segue liberada
+    assert login("joao").status_code == 401
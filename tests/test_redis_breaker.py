@@ -0,0 +1,195 @@
+"""Disjuntor do Redis, cache local de fallback e reaplicação das invalidações pendentes."""
+import pytest
+
+from fake_redis import FakePipeline, FakeRedis
+
+redis_exceptions = pytest.importorskip("redis.exceptions")
+redis_service_module = pytest.importorskip("app.backend.services.redis_service")
+
+from app.backend.config.settings import settings
+from app.backend.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen
+from app.backend.services.redis_service import RedisService, RedisUnavailable, _LocalCache
+
+FAILURES = 3
+RESET_SECONDS = 10.0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class FailingRedis:
+    """FakeRedis que recusa a conexão enquanto down for verdadeiro."""
+
+    def __init__(self):
+        self.server = FakeRedis()
+        self.down = False
+        self.calls = 0
+
+    def __getattr__(self, name):
+        command = getattr(self.server, name)
+
+        def call(*args, **kwargs):
+            self.calls += 1
+            if self.down:
+                raise redis_exceptions.ConnectionError("Connection refused")
+            return command(*args, **kwargs)
+        return call
+
+    def pipeline(self, transaction=True):
+        # Os comandos da pipeline passam por __getattr__ ao executar
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def connection():
+    return FailingRedis()
+
+
+@pytest.fixture
+def service(clock, connection):
+    service = RedisService()
+    service._redis_client = connection
+    service.breaker = CircuitBreaker("redis", FAILURES, RESET_SECONDS, service._on_circuit_change, clock=clock)
+    service._local = _LocalCache(clock=clock)
+    return service
+
+
+def _open_circuit(service, connection):
+    connection.down = True
+    for _ in range(FAILURES):
+        with pytest.raises(RedisUnavailable):
+            service.execute("ping")
+    assert service.breaker.state == OPEN
+
+
+def test_breaker_transitions(clock):
+    transitions = []
+    breaker = CircuitBreaker(
+        "redis", FAILURES, RESET_SECONDS, lambda name, old, new: transitions.append((old, new)), clock=clock
+    )
+
+    for _ in range(FAILURES - 1):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()
+
+    clock.advance(RESET_SECONDS - 0.1)
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()
+
+    # Meio-aberto: apenas uma chamada de teste por vez; a falha reabre o circuito
+    clock.advance(0.1)
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.advance(RESET_SECONDS)
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+    assert transitions == [
+        (CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED),
+    ]
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker("redis", FAILURES, RESET_SECONDS, clock=clock)
+
+    for _ in range(FAILURES - 1):
+        breaker.record_failure()
+    breaker.record_success()
+    for _ in range(FAILURES - 1):
+        breaker.record_failure()
+
+    assert breaker.state == CLOSED
+
+
+def test_open_circuit_does_not_call_redis(service, connection, clock):
+    _open_circuit(service, connection)
+    calls = connection.calls
+
+    with pytest.raises(RedisUnavailable):
+        service.execute("ping")
+    assert connection.calls == calls
+
+    # Passado o intervalo, a chamada de teste chega ao Redis e fecha o circuito
+    connection.down = False
+    clock.advance(RESET_SECONDS)
+    assert service.execute("ping") is True
+    assert service.breaker.state == CLOSED
+
+
+def test_local_cache_serves_permissions_while_redis_is_down(service, connection, clock):
+    permissions = {"permissions": ["user:read"]}
+    service.set_user_permissions(7, permissions)
+
+    _open_circuit(service, connection)
+
+    assert service.get_user_permissions(7) == permissions
+    assert service.get_user_permissions(8) is None
+
+    # A cópia local vale por local_cache_seconds
+    clock.advance(settings.redis.local_cache_seconds)
+    assert service.get_user_permissions(7) is None
+
+
+def test_pending_invalidations_are_replayed_after_recovery(service, connection, clock):
+    server = connection.server
+    service.set_user_permissions(7, {"permissions": ["user:read"]})
+    server.set("user:7:version", 3)
+
+    _open_circuit(service, connection)
+    service.delete_user_permissions(7)
+    service.bump_identity_versions([7])
+
+    assert service._pending_deletes == {"user:7:permissions"}
+    assert service._pending_bumps == {7}
+    # A cópia local já foi descartada: nada de permissões antigas durante a queda
+    assert service.get_user_permissions(7) is None
+    # Versão antiga no Redis: a identidade não pode ser servida do cache
+    with pytest.raises(RedisUnavailable):
+        service.get_identity_version(7)
+
+    connection.down = False
+    clock.advance(RESET_SECONDS)
+
+    assert service.get_identity_version(7) == 4
+    assert server.get("user:7:permissions") is None
+    assert service._pending_deletes == set()
+    assert service._pending_bumps == set()
+    assert service.breaker.state == CLOSED
+
+
+def test_failed_replay_keeps_the_invalidations_pending(service, connection, clock):
+    _open_circuit(service, connection)
+    service.delete_user_permissions(7)
+    service.bump_identity_versions([7])
+
+    service._replay_pending_invalidations()
+
+    assert service._pending_deletes == {"user:7:permissions"}
+    assert service._pending_bumps == {7}
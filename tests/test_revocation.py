@@ -0,0 +1,97 @@
+"""Revogação de tokens: filtro de Bloom local e sincronização entre workers (revocation_service)."""
+import time
+import uuid
+
+import pytest
+
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_bloom_filter_has_no_false_negatives():
+    from app.backend.services.revocation_service import BloomFilter
+
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    added = [uuid.uuid4().hex for _ in range(1000)]
+    for jti in added:
+        bloom.add(jti)
+
+    assert all(jti in bloom for jti in added)
+    # Na capacidade configurada, os falsos positivos ficam perto da taxa de erro
+    others = [uuid.uuid4().hex for _ in range(5000)]
+    assert sum(jti in bloom for jti in others) / len(others) < 0.05
+
+
+def test_revoked_jti_is_rejected(redis):
+    from jose import JWTError
+    from app.backend.services.auth_service import create_access_token, decode_token
+    from app.backend.services.revocation_service import revocation_list
+
+    revocation_list._rebuild()
+    token = create_access_token(data={"sub": "maria.silva"})
+    payload = decode_token(token)
+
+    revocation_list.revoke(payload["jti"], payload["exp"])
+
+    assert redis.exists(f"revoked:{payload['jti']}")
+    with pytest.raises(JWTError):
+        decode_token(token)
+    # Os demais tokens seguem válidos
+    assert decode_token(create_access_token(data={"sub": "maria.silva"}))["sub"] == "maria.silva"
+
+
+def test_request_with_revoked_token_is_unauthorized(client):
+    from app.backend.services.auth_service import create_access_token, decode_token
+    from app.backend.services.revocation_service import revocation_list
+
+    token = create_access_token(data={"sub": "maria.silva"})
+    headers = {"Authorization": f"Bearer {token}"}
+    payload = decode_token(token)
+
+    revocation_list.revoke(payload["jti"], payload["exp"])
+
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+
+def test_remote_revocation_updates_the_local_filter(redis):
+    from app.backend.services.redis_service import redis_service
+    from app.backend.services.revocation_service import REVOCATION_CHANNEL, RevocationList
+
+    worker = RevocationList()
+    worker.start()
+    try:
+        assert _wait_until(lambda: worker._filter is not None and redis._subscribers)
+        jti = uuid.uuid4().hex
+        assert not worker.is_revoked(jti)
+
+        # Revogação feita por outro worker: chave no Redis e aviso no canal
+        redis_service.revoke_token(jti, 60, REVOCATION_CHANNEL)
+
+        assert _wait_until(lambda: jti in worker._filter)
+        assert worker.is_revoked(jti)
+    finally:
+        worker.stop()
+
+
+def test_filter_hit_is_treated_as_revoked_while_redis_is_down(redis, monkeypatch):
+    from app.backend.services.redis_service import redis_service
+    from app.backend.services.revocation_service import RevocationList
+
+    worker = RevocationList()
+    worker._rebuild()
+    jti = uuid.uuid4().hex
+    worker.revoke(jti, time.time() + 60)
+
+    def unavailable(jti):
+        raise ConnectionError("Redis fora")
+
+    monkeypatch.setattr(redis_service, "is_token_revoked", unavailable)
+
+    assert worker.is_revoked(jti)
+    assert not worker.is_revoked(uuid.uuid4().hex)
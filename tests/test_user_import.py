@@ -0,0 +1,63 @@
+"""Importação de usuários em lote (POST /api/users/import)."""
+import pytest
+
+CSV = (
+    "username,email,full_name,password,is_ad_user\n"
+    "maria,maria.nova@omnicorp.com,Maria Nova,,true\n"      # linha 2: atualiza
+    "joao,joao@omnicorp.com,Joao Lima,s3nha-local,false\n"  # linha 3: cria, com senha
+    "ana,email-invalido,Ana Costa,,true\n"                   # linha 4: e-mail inválido
+    "joao,joao2@omnicorp.com,Joao Duplicado,,true\n"         # linha 5: duplicado no arquivo
+    "pedro,carla@omnicorp.com,Pedro Alves,,true\n"           # linha 6: e-mail de outra conta
+    "bruno,bruno@omnicorp.com,Bruno Reis,,true\n"            # linha 7: cria
+)
+
+
+@pytest.fixture
+def importer(db, make_profile, make_user):
+    from app.backend.models.user import Role
+
+    db.add(Role(name="viewer", description="Visualizador"))
+    db.commit()
+    make_user("maria", email="maria@omnicorp.com", full_name="Maria Antiga")
+    make_user("carla")
+    return make_user("importador", profiles=[make_profile("Importadores", ["user:create"])])
+
+
+def test_imports_mixed_csv(client, db, importer, auth_headers):
+    from app.backend.models.user import User
+    from app.backend.services.auth_service import verify_password
+
+    response = client.post(
+        "/api/users/import",
+        files={"file": ("usuarios.csv", CSV.encode("utf-8"), "text/csv")},
+        headers=auth_headers("importador"),
+    )
+
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["processed"], result["imported"], result["failed"]) == (6, 3, 3)
+    assert (result["created"], result["updated"]) == (2, 1)
+    assert [(error["row"], error["username"]) for error in result["errors"]] == [
+        (4, "ana"), (5, "joao"), (6, "pedro"),
+    ]
+    assert result["errors"][1]["error"] == "Nome de usuário duplicado no arquivo"
+    assert result["errors"][2]["error"] == "E-mail já pertence a outro usuário"
+
+    users = {user.username: user for user in db.query(User).all()}
+    assert users["maria"].email == "maria.nova@omnicorp.com"
+    assert users["maria"].full_name == "Maria Nova"
+    assert verify_password("s3nha-local", users["joao"].hashed_password)
+    assert users["bruno"].hashed_password is None
+    assert "ana" not in users and "pedro" not in users
+
+
+def test_import_requires_user_create_permission(client, importer, make_profile, make_user, auth_headers):
+    make_user("leitor", profiles=[make_profile("Leitores", ["user:read"])])
+
+    response = client.post(
+        "/api/users/import",
+        files={"file": ("usuarios.csv", CSV.encode("utf-8"), "text/csv")},
+        headers=auth_headers("leitor"),
+    )
+
+    assert response.status_code == 403
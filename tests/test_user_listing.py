@@ -0,0 +1,59 @@
+"""Listagem de usuários paginada por cursor (GET /api/users/)."""
+import pytest
+
+
+@pytest.fixture
+def reader(make_profile, make_user):
+    return make_user("leitor", profiles=[make_profile("Leitores", ["user:read"])])
+
+
+def _collect_pages(client, headers, **params):
+    pages, cursor = [], None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = client.get("/api/users/", params=query, headers=headers)
+        assert response.status_code == 200, response.text
+        pages.append([user["username"] for user in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+
+
+def test_follows_next_cursor_until_last_page(client, make_user, reader, auth_headers):
+    for i in range(6):
+        make_user(f"usuario{i}")
+
+    pages = _collect_pages(client, auth_headers("leitor"), limit=3)
+
+    assert pages == [["leitor", "usuario0", "usuario1"], ["usuario2", "usuario3", "usuario4"], ["usuario5"]]
+
+
+def test_follows_next_cursor_descending_by_username(client, make_user, reader, auth_headers):
+    for name in ("carla", "ana", "bruno", "ana.maria"):
+        make_user(name)
+
+    pages = _collect_pages(client, auth_headers("leitor"), limit=2, sort="username", order="desc")
+
+    assert pages == [["leitor", "carla"], ["bruno", "ana.maria"], ["ana"]]
+
+
+def test_rejects_tampered_cursor(client, reader, auth_headers):
+    response = client.get("/api/users/", params={"cursor": "adulterado"}, headers=auth_headers("leitor"))
+    assert response.status_code == 400
+
+
+def test_requires_user_read_permission(client, make_profile, make_user, auth_headers):
+    make_user("visitante", profiles=[make_profile("Visitantes", ["profile:read"])])
+
+    response = client.get("/api/users/", headers=auth_headers("visitante"))
+
+    assert response.status_code == 403
+
+
+def test_administrator_profile_lists_users(client, make_profile, make_user, auth_headers):
+    make_user("administrator", profiles=[make_profile("Administrador")])
+
+    response = client.get("/api/users/", headers=auth_headers("administrator"))
+
+    assert response.status_code == 200
+    assert [user["username"] for user in response.json()] == ["administrator"]
@@ -0,0 +1,60 @@
+"""Busca de usuários (GET /api/users/search e user_repository.user_search_query)."""
+import pytest
+
+
+def _sql(query, dialect) -> str:
+    return str(query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+@pytest.fixture
+def mysql_dialect():
+    from sqlalchemy.dialects import mysql
+
+    return mysql.dialect()
+
+
+def test_short_term_uses_prefix_only(db, mysql_dialect):
+    from app.backend.repositories.user_repository import user_search_query
+
+    sql = _sql(user_search_query(db, "ma", fulltext=True), mysql_dialect)
+
+    assert "LIKE concat('ma', '%%')" in sql
+    assert "MATCH" not in sql
+
+
+def test_long_term_uses_boolean_fulltext(db, mysql_dialect):
+    from app.backend.repositories.user_repository import user_search_query
+
+    sql = _sql(user_search_query(db, "maria si", fulltext=True), mysql_dialect)
+
+    assert "LIKE concat('maria si', '%%')" in sql
+    # Palavras abaixo do tamanho mínimo do índice ficam de fora da expressão booleana
+    assert "AGAINST ('+maria*' IN BOOLEAN MODE)" in sql
+
+
+def test_fulltext_is_skipped_outside_mysql(db, mysql_dialect):
+    from app.backend.repositories.user_repository import user_search_query
+
+    assert "MATCH" not in _sql(user_search_query(db, "maria", fulltext=False), mysql_dialect)
+
+
+def test_search_ranks_exact_and_prefix_matches_first(client, make_profile, make_user, auth_headers):
+    make_user("leitor", profiles=[make_profile("Leitores", ["user:read"])])
+    make_user("mariana", email="mariana@omnicorp.com")
+    make_user("maria", email="maria@omnicorp.com")
+    make_user("ana", email="maria.ana@omnicorp.com")
+    make_user("joao", full_name="Maria Joao")
+    make_user("pedro")
+
+    response = client.get("/api/users/search", params={"q": "maria"}, headers=auth_headers("leitor"))
+
+    assert response.status_code == 200, response.text
+    assert [user["username"] for user in response.json()] == ["maria", "mariana", "ana", "joao"]
+
+
+def test_search_requires_user_read_permission(client, make_profile, make_user, auth_headers):
+    make_user("visitante", profiles=[make_profile("Visitantes", ["profile:read"])])
+
+    response = client.get("/api/users/search", params={"q": "ma"}, headers=auth_headers("visitante"))
+
+    assert response.status_code == 403